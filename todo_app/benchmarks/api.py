@@ -0,0 +1,195 @@
+"""
+Load-tests the local API server (src.utils.api_server) on one synthetic store.
+The server runs in its own process, as it would next to the desktop app;
+--clients keep-alive connections send a mix of page reads, gets, creates
+and updates while --listeners SSE clients time how long each create takes
+to be pushed to them.
+
+    cd todo_app
+    python -m benchmarks.api --size 10000 --clients 32 --requests 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+from benchmarks.generate import write_store
+from benchmarks.measure import summarize
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection (requests are sent one at a time)."""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.reader = self.writer = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+
+    async def request(self, method: str, path: str, body: Optional[dict] = None) -> Tuple[int, Optional[dict]]:
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1:{self.port}\r\n"
+                          f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        payload = await self.reader.readexactly(length) if length else b""
+        return status, json.loads(payload) if payload else None
+
+    def close(self):
+        self.writer.close()
+
+
+async def client(port: int, requests: int, write_ratio: float, seed: int, ids: List[str],
+                 samples: Dict[str, List[float]], sent: Dict[str, float], errors: List[int]):
+    rng = random.Random(seed)
+    connection = Connection(port)
+    await connection.open()
+    try:
+        for i in range(requests):
+            roll = rng.random()
+            if roll < write_ratio / 2:
+                op, title = "create", f"load {seed}-{i}"
+                sent[title] = time.perf_counter()
+                call = connection.request("POST", "/tasks", {"title": title, "priority": rng.randint(1, 3)})
+            elif roll < write_ratio:
+                op = "update"
+                call = connection.request("PATCH", f"/tasks/{rng.choice(ids)}", {"priority": rng.randint(1, 3)})
+            elif roll < write_ratio + (1 - write_ratio) / 2:
+                op = "list"
+                query = rng.choice(["", "status=pending", "status=completed&order_by=completed_at",
+                                    "order_by=priority", "priority=high"])
+                call = connection.request("GET", f"/tasks?limit=50&{query}")
+            else:
+                op = "get"
+                call = connection.request("GET", f"/tasks/{rng.choice(ids)}")
+            start = time.perf_counter()
+            status, payload = await call
+            samples.setdefault(op, []).append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+            if op == "list" and payload["next"] and rng.random() < 0.5:
+                # Follow the cursor once, like a scrolling dashboard
+                start = time.perf_counter()
+                await connection.request("GET", f"/tasks?limit=50&{query}&cursor={quote(payload['next'])}")
+                samples.setdefault("next_page", []).append(time.perf_counter() - start)
+    finally:
+        connection.close()
+
+
+async def listener(port: int, sent: Dict[str, float], latencies: List[float], ready: asyncio.Event):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET /events HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n\r\n".encode())
+    await writer.drain()
+    ready.set()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.startswith(b"data: "):
+                received = time.perf_counter()
+                for change in json.loads(line[6:]).get("changes", ()):
+                    task = change["task"]
+                    if change["action"] == "added" and task["title"] in sent:
+                        latencies.append(received - sent[task["title"]])
+    finally:
+        writer.close()
+
+
+def start_server(env: dict) -> Tuple[subprocess.Popen, int]:
+    process = subprocess.Popen([sys.executable, "-m", "src.utils.api_server", "0"], cwd=ROOT, env=env,
+                               stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()  # "API on http://127.0.0.1:PORT (N tasks)"
+    if not line:
+        raise SystemExit("The API server did not start")
+    return process, int(line.split(":")[2].split()[0])
+
+
+async def load(port: int, clients: int, requests: int, write_ratio: float, listeners: int) -> dict:
+    setup = Connection(port)
+    await setup.open()
+    _, page = await setup.request("GET", "/tasks?limit=1000")
+    setup.close()
+    ids = [task["id"] for task in page["tasks"]]
+
+    samples: Dict[str, List[float]] = {}
+    sent: Dict[str, float] = {}
+    errors: List[int] = []
+    latencies: List[float] = []
+    readies = [asyncio.Event() for _ in range(listeners)]
+    streams = [asyncio.create_task(listener(port, sent, latencies, ready)) for ready in readies]
+    for ready in readies:
+        await ready.wait()
+    await asyncio.sleep(0.1)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, requests, write_ratio, seed, ids, samples, sent, errors)
+                           for seed in range(clients)))
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.5)  # Let the last events arrive
+    for stream in streams:
+        stream.cancel()
+    await asyncio.gather(*streams, return_exceptions=True)
+
+    total = sum(len(values) for values in samples.values())
+    result = {op: summarize(values) for op, values in sorted(samples.items())}
+    result.update(requests_per_s=total / elapsed, errors=len(errors))
+    if latencies:
+        result["event_latency"] = summarize(latencies)
+    return result
+
+
+def run(size: int, backend: str, completed_ratio: float, clients: int, requests: int,
+        write_ratio: float, listeners: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_store(Path(tmp) / "tasks.json", size, completed_ratio)
+        env = dict(os.environ, TODO_DB_PATH=str(path), TODO_SQLITE_PATH=str(Path(tmp) / "tasks.db"),
+                   TODO_STORAGE_BACKEND="sqlite" if backend == "sqlite" else "json",
+                   TODO_STORAGE_MODE="wal" if backend == "wal" else "json")
+        start = time.perf_counter()
+        process, port = start_server(env)
+        result = {"suite": "api", "backend": backend, "size": size, "clients": clients,
+                  "listeners": listeners, "write_ratio": write_ratio,
+                  "server_start_ms": (time.perf_counter() - start) * 1000}
+        try:
+            result.update(asyncio.run(load(port, clients, requests, write_ratio, listeners)))
+        finally:
+            process.terminate()
+            process.wait()
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, required=True)
+    parser.add_argument("--backend", choices=["json", "wal", "sqlite"], default="wal")
+    parser.add_argument("--completed-ratio", type=float, default=0.3)
+    parser.add_argument("--clients", type=int, default=16, help="concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="share of creates and updates")
+    parser.add_argument("--listeners", type=int, default=4, help="SSE clients timing change events")
+    args = parser.parse_args()
+    print(json.dumps(run(args.size, args.backend, args.completed_ratio, args.clients, args.requests,
+                         args.write_ratio, args.listeners)))
+
+
+if __name__ == "__main__":
+    main()
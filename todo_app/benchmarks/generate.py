@@ -0,0 +1,45 @@
+import json
+import random
+import uuid
+from pathlib import Path
+from src.models.task import Priority, Status, Task
+
+WORDS = [
+    "revisar", "relatório", "reunião", "código", "cliente", "projeto", "média",
+    "prioridade", "enviar", "e-mail", "comprar", "pão", "ligar", "banco", "testar",
+    "deploy", "corrigir", "bug", "documentação", "planejar", "sprint", "concluídas",
+]
+
+
+def make_task(rng: random.Random, index: int, completed_ratio: float, start: int) -> Task:
+    """Builds one synthetic task with a varied description length."""
+    # Mostly short descriptions, some empty and a long tail of big ones
+    length = rng.choice([0, 0, 5, 10, 10, 20, 40, 80, 200])
+    task = Task(
+        id=str(uuid.UUID(int=rng.getrandbits(128))),
+        title=" ".join(rng.choices(WORDS, k=rng.randint(2, 6))),
+        description=" ".join(rng.choices(WORDS, k=length)) or None,
+        priority=rng.choice(list(Priority)),
+        created_at=start + index
+    )
+    if rng.random() < completed_ratio:
+        task.status = Status.COMPLETED
+        task.completed_at = task.created_at + rng.randint(60, 86400)
+    return task
+
+
+def generate_tasks(size: int, completed_ratio: float = 0.3, seed: int = 42):
+    """Yields `size` synthetic tasks (deterministic for a given seed)."""
+    rng = random.Random(seed)
+    start = 1_600_000_000
+    for index in range(size):
+        yield make_task(rng, index, completed_ratio, start)
+
+
+def write_store(path: Path, size: int, completed_ratio: float = 0.3, seed: int = 42) -> Path:
+    """Writes a tasks.json store in the format TaskDatabase reads."""
+    path = Path(path)
+    data = [task.to_dict() for task in generate_tasks(size, completed_ratio, seed)]
+    with path.open('w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
@@ -0,0 +1,38 @@
+import resource
+import sys
+import time
+from typing import Callable, Dict, List
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """p50/p99/mean/max of latency samples, in milliseconds."""
+    ordered = sorted(samples)
+    n = len(ordered)
+
+    def pick(q):
+        return ordered[min(n - 1, int(q * n))] * 1000
+
+    return {
+        "n": n,
+        "p50_ms": pick(0.50),
+        "p99_ms": pick(0.99),
+        "mean_ms": sum(ordered) / n * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def time_calls(fn: Callable[[int], object], repeat: int) -> Dict[str, float]:
+    """Calls fn(i) `repeat` times and summarizes the latencies."""
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process, in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
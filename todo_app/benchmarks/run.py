@@ -0,0 +1,77 @@
+"""
+Runs the benchmark suites and prints one JSON document.
+
+    cd todo_app
+    python -m benchmarks.run --sizes 1000 10000 100000 --output bench.json
+
+Every (suite, backend, size) case runs in its own process so peak RSS is
+per case. Compare two runs by diffing their "results" entries.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_case(module: str, args) -> dict:
+    command = [sys.executable, "-m", module] + [str(arg) for arg in args]
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"module": module, "args": [str(arg) for arg in args], "error": completed.stderr.strip()[-2000:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--backends", nargs="+", default=["json", "wal", "sqlite"])
+    parser.add_argument("--completed-ratio", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--ui", action="store_true", help="also time TodoApp.refresh_tasks (needs customtkinter)")
+    parser.add_argument("--api", action="store_true", help="also load-test the local API server")
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        for backend in args.backends:
+            results.append(run_case("benchmarks.storage", [
+                "--size", size, "--backend", backend,
+                "--completed-ratio", args.completed_ratio, "--repeat", args.repeat]))
+        if args.ui:
+            results.append(run_case("benchmarks.ui", [
+                "--size", size, "--completed-ratio", args.completed_ratio,
+                "--repeat", max(1, args.repeat // 4)]))
+        if args.api:
+            results.append(run_case("benchmarks.api", [
+                "--size", size, "--completed-ratio", args.completed_ratio]))
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": int(time.time()),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Times the TaskDatabase hot paths on one synthetic store.
+Run through benchmarks.run, which starts one process per case so that
+peak RSS belongs to that case only.
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from src.models.task import Status
+from src.utils.database import TaskDatabase
+from benchmarks.generate import write_store
+from benchmarks.measure import peak_rss_kb, time_calls
+
+
+def open_database(backend: str, path: Path):
+    if backend == "sqlite":
+        from src.utils.sqlite_database import SQLiteTaskDatabase
+        db = SQLiteTaskDatabase(path.with_suffix(".db"))
+        if db.is_empty():
+            db.import_json(path)
+        return db
+    return TaskDatabase(path, storage_mode=backend)
+
+
+def run(size: int, backend: str, completed_ratio: float, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_store(Path(tmp) / "tasks.json", size, completed_ratio)
+        result = {"suite": "storage", "backend": backend, "size": size,
+                  "completed_ratio": completed_ratio, "file_bytes": path.stat().st_size}
+        rng = random.Random(7)
+
+        # Cold open: construction includes load_tasks
+        start = time.perf_counter()
+        db = open_database(backend, path)
+        result["open_ms"] = (time.perf_counter() - start) * 1000
+        load_repeat = max(1, min(repeat, 2_000_000 // max(size, 1)))
+        result["load_tasks"] = time_calls(lambda i: db.load_tasks(), load_repeat)
+        result["save_tasks"] = time_calls(lambda i: db.save_tasks(), load_repeat)
+
+        result["add_task"] = time_calls(lambda i: db.add_task(f"bench {i}", "descrição"), repeat)
+        ids = [task.id for task in db.query(limit=repeat * 2)]
+        rng.shuffle(ids)
+
+        def update(i):
+            task = db.get_task(ids[i])
+            task.mark_completed()
+            db.update_task(task)
+
+        result["update_task"] = time_calls(update, repeat)
+        result["delete_task"] = time_calls(lambda i: db.delete_task(ids[repeat + i]), repeat)
+        for status in Status:
+            result[f"get_tasks_{status.name.lower()}"] = time_calls(lambda i: db.get_tasks(status), load_repeat)
+
+        # Mutations above only queue writes; this is what they cost on disk
+        start = time.perf_counter()
+        db.flush()
+        result["flush_ms"] = (time.perf_counter() - start) * 1000
+        db.close()
+        result["peak_rss_kb"] = peak_rss_kb()
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, required=True)
+    parser.add_argument("--backend", choices=["json", "wal", "sqlite"], default="json")
+    parser.add_argument("--completed-ratio", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.size, args.backend, args.completed_ratio, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
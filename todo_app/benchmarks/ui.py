@@ -0,0 +1,75 @@
+"""
+Times TodoApp.refresh_tasks on one synthetic store.
+Needs customtkinter and a display; without DISPLAY an Xvfb server is
+started for the duration of the run.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.generate import write_store
+from benchmarks.measure import peak_rss_kb, time_calls
+
+
+def start_virtual_display():
+    """Starts Xvfb when there is no display. Returns the process (or None)."""
+    if os.environ.get("DISPLAY"):
+        return None
+    if shutil.which("Xvfb") is None:
+        raise SystemExit("No DISPLAY and Xvfb is not installed")
+    display = ":99"
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x1024x24"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    time.sleep(0.5)
+    return process
+
+
+def run(size: int, completed_ratio: float, repeat: int) -> dict:
+    xvfb = start_virtual_display()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_store(Path(tmp) / "tasks.json", size, completed_ratio)
+            # Settings are read at import time
+            os.environ["TODO_DB_PATH"] = str(path)
+            from src.gui.main_window import TodoApp
+
+            start = time.perf_counter()
+            app = TodoApp()
+            app.update()
+            result = {"suite": "ui", "size": size, "completed_ratio": completed_ratio,
+                      "startup_ms": (time.perf_counter() - start) * 1000}
+
+            def refresh(i):
+                app.refresh_tasks()
+                app.update_idletasks()
+
+            def switch_filter(i):
+                app.filter_var.set(["Todas", "Pendentes", "Concluídas"][i % 3])
+                refresh(i)
+
+            result["refresh_tasks"] = time_calls(refresh, repeat)
+            result["filter_switch"] = time_calls(switch_filter, repeat)
+            app.on_close()
+            result["peak_rss_kb"] = peak_rss_kb()
+            return result
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, required=True)
+    parser.add_argument("--completed-ratio", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.size, args.completed_ratio, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+Headless command line interface: python -m src.cli COMMAND (or python src/cli.py).
+Works on the store selected in settings without importing any GUI module,
+so it starts fast and runs on machines without a display.
+
+Examples:
+    python -m src.cli import tickets.jsonl
+    python -m src.cli export - --status pending --format csv > pending.csv
+    python -m src.cli list --search relatório --order-by due_at --asc
+    python -m src.cli complete --search "sprint 12"
+    python -m src.cli update --status pending --priority low --set-priority medium
+    python -m src.cli list --project Trabalho --tag urgente
+    TODO_SYNC_URL=http://127.0.0.1:8765 python -m src.cli sync --every 60
+"""
+import argparse
+import dataclasses
+import sys
+import time
+import uuid
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+if __package__ in (None, ""):
+    # Run as a script: make the "src" package importable
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import settings
+from src.models.task import Priority, Status, Task
+from src.utils.ordering import SORT_KEYS
+from src.utils.projects import in_project, normalize_project, normalize_tags
+from src.utils.search import matches
+from src.utils.storage import open_database
+from src.utils.stream import FORMATS, format_for, iter_records, write_records
+
+PRIORITIES = {"low": Priority.LOW, "medium": Priority.MEDIUM, "high": Priority.HIGH}
+STATUSES = {"pending": Status.PENDING, "completed": Status.COMPLETED}
+
+
+def parse_time(text: str) -> int:
+    """Epoch seconds from an epoch number or a local ISO date/time."""
+    if text.isdigit():
+        return int(text)
+    try:
+        return int(datetime.fromisoformat(text).timestamp())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date: {text!r} (use epoch seconds or YYYY-MM-DD[THH:MM])")
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    """It splits an iterable into lists of at most size items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def select_tasks(db, args) -> Iterator[Task]:
+    """It yields the tasks matched by the filter options, in the requested order."""
+    status = STATUSES.get(args.status)
+    priority = PRIORITIES.get(args.priority)
+    project = normalize_project(args.project)
+    tag = next(iter(normalize_tags(args.tag)), None)
+    if args.ids:
+        tasks = (db.get_task(task_id, include_archived=args.archived) for task_id in args.ids)
+        tasks = (task for task in tasks if task is not None)
+    elif args.due_within is not None:
+        tasks = iter(db.due_soon(args.due_within * 3600))
+        if args.search:
+            tasks = (task for task in tasks if matches(task, args.search))
+    elif args.search:
+        found = db.search(args.search, status, include_archived=args.archived)
+        found.sort(key=SORT_KEYS[args.order_by], reverse=not args.asc)
+        tasks = iter(found)
+    else:
+        # Streams straight from the pre-sorted indexes
+        return islice(db.query(status, priority, order_by=args.order_by, descending=not args.asc,
+                               include_archived=args.archived, project=project, tag=tag), args.limit)
+    if status is not None:
+        tasks = (task for task in tasks if task.status == status)
+    if priority is not None:
+        tasks = (task for task in tasks if task.priority == priority)
+    if project is not None:
+        tasks = (task for task in tasks if in_project(task, project))
+    if tag is not None:
+        tasks = (task for task in tasks if tag in task.tags)
+    return islice(tasks, args.limit)
+
+
+def cmd_import(db, args) -> int:
+    """Streams tasks in, one transaction per batch. Existing IDs are replaced."""
+    fmt = args.format or format_for(args.file)
+    imported, errors = 0, 0
+    with _open(args.file, "r") as f:
+        records = iter_records(f, fmt)
+        for batch in chunked(records, args.batch_size):
+            tasks = []
+            for line_number, record in batch:
+                try:
+                    if not record.get("title"):
+                        raise ValueError("missing title")
+                    record.setdefault("id", None)
+                    record["id"] = record["id"] or str(uuid.uuid4())
+                    tasks.append(Task.from_dict(record))
+                except (AttributeError, TypeError, ValueError) as e:
+                    errors += 1
+                    print(f"{args.file}:{line_number}: skipped ({e})", file=sys.stderr)
+            db.add_many(tasks)
+            imported += len(tasks)
+    print(f"Imported {imported} task(s)" + (f", skipped {errors}" if errors else ""), file=sys.stderr)
+    return 1 if errors else 0
+
+
+def cmd_export(db, args) -> int:
+    fmt = args.format or format_for(args.file)
+    with _open(args.file, "w") as f:
+        count = write_records(f, (task.to_dict() for task in select_tasks(db, args)), fmt)
+    print(f"Exported {count} task(s)", file=sys.stderr)
+    return 0
+
+
+def cmd_list(db, args) -> int:
+    tasks = select_tasks(db, args)
+    if args.format in FORMATS:
+        write_records(sys.stdout, (task.to_dict() for task in tasks), args.format)
+        return 0
+    for task in tasks:
+        due = datetime.fromtimestamp(task.due_at).strftime("%Y-%m-%d %H:%M") if task.due_at else ""
+        labels = "".join(f"  #{tag}" for tag in task.tags)
+        project = f"  [{task.project}]" if task.project else ""
+        print(f"{task.id[:8]}  {'x' if task.is_completed else ' '}  "
+              f"{task.priority.name.lower():<6}  {due:<16}  {task.title}{project}{labels}")
+    return 0
+
+
+def cmd_add(db, args) -> int:
+    task = db.add_task(args.title, args.description, PRIORITIES[args.set_priority or "medium"],
+                       due_at=args.set_due, remind_at=args.set_remind,
+                       project=normalize_project(args.set_project), tags=normalize_tags(args.set_tags))
+    print(task.id)
+    return 0
+
+
+def cmd_complete(db, args) -> int:
+    return _batch(db, args, "Completed", db.complete_many)
+
+
+def cmd_delete(db, args) -> int:
+    return _batch(db, args, "Deleted", db.delete_many)
+
+
+def cmd_reopen(db, args) -> int:
+    def reopen(task_ids: List[str]) -> int:
+        tasks = []
+        for task_id in task_ids:
+            task = db.get_task(task_id, include_archived=args.archived)
+            if task is not None and task.is_completed:
+                task = dataclasses.replace(task)
+                task.mark_pending()
+                tasks.append(task)
+        return db.update_many(tasks)
+    return _batch(db, args, "Reopened", reopen)
+
+
+def cmd_update(db, args) -> int:
+    changes = {}
+    if args.set_priority:
+        changes["priority"] = PRIORITIES[args.set_priority]
+    if args.set_due is not None:
+        changes["due_at"] = args.set_due or None
+    if args.set_remind is not None:
+        changes["remind_at"] = args.set_remind or None
+    if args.set_project is not None:
+        changes["project"] = normalize_project(args.set_project)
+    if args.set_tags is not None:
+        changes["tags"] = normalize_tags(args.set_tags)
+    if args.set_title:
+        changes["title"] = args.set_title
+    if not changes:
+        print("Nothing to change: use --set-priority, --set-due, --set-remind, --set-project, --set-tags "
+              "or --set-title", file=sys.stderr)
+        return 2
+
+    def update(task_ids: List[str]) -> int:
+        tasks = (db.get_task(task_id, include_archived=args.archived) for task_id in task_ids)
+        return db.update_many(dataclasses.replace(task, **changes) for task in tasks if task is not None)
+    return _batch(db, args, "Updated", update)
+
+
+def cmd_sync(db, args) -> int:
+    """Syncs with TODO_SYNC_URL once, or every N seconds until interrupted."""
+    from src.utils.sync import SyncClient, SyncError
+    if not settings.SYNC_URL:
+        print("Sync is not configured: set TODO_SYNC_URL", file=sys.stderr)
+        return 2
+    client = SyncClient(db, settings.SYNC_URL, db.db_path.with_name(db.db_path.name + ".sync"),
+                        batch_size=settings.SYNC_BATCH)
+    while True:
+        try:
+            sent, received = client.sync()
+            print(f"Sent {sent}, received {received} change(s)", file=sys.stderr)
+        except SyncError as e:
+            print(e, file=sys.stderr)
+            if not args.every:
+                return 1
+        if not args.every:
+            return 0
+        try:
+            time.sleep(args.every)
+        except KeyboardInterrupt:
+            return 0
+
+
+def _batch(db, args, verb: str, apply) -> int:
+    """Runs a batch operation over the selected tasks, one transaction per batch."""
+    if not (args.ids or args.all or args.status or args.priority or args.search or args.project or args.tag
+            or args.due_within is not None):
+        print("Refusing to touch every task: pass a filter, IDs or --all", file=sys.stderr)
+        return 2
+    # IDs are collected first: query iterators must be consumed before mutating
+    task_ids = [task.id for task in select_tasks(db, args)]
+    count = sum(apply(batch) for batch in chunked(task_ids, args.batch_size))
+    print(f"{verb} {count} task(s)", file=sys.stderr)
+    return 0
+
+
+def _open(path: str, mode: str):
+    """The named file, or stdin/stdout for "-"."""
+    if path == "-":
+        stream = sys.stdin if mode == "r" else sys.stdout
+        return open(stream.fileno(), mode, encoding="utf-8", newline="", closefd=False)
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Headless access to the task store "
+                                     "(backend and paths come from the TODO_* environment settings).")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    targets = argparse.ArgumentParser(add_help=False)
+    targets.add_argument("ids", nargs="*", help="task IDs (instead of filters)")
+
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument("--status", choices=STATUSES)
+    filters.add_argument("--priority", choices=PRIORITIES)
+    filters.add_argument("--search", help="words in title or description")
+    filters.add_argument("--project", help="tasks of this project or its subprojects (e.g. Trabalho/Cliente A)")
+    filters.add_argument("--tag")
+    filters.add_argument("--due-within", type=float, metavar="HOURS", help="pending tasks due within HOURS (or overdue)")
+    filters.add_argument("--order-by", choices=SORT_KEYS, default="created_at")
+    filters.add_argument("--asc", action="store_true", help="ascending order (default: descending)")
+    filters.add_argument("--limit", type=int)
+    filters.add_argument("--archived", action="store_true", help="include archived completed tasks")
+
+    batch = argparse.ArgumentParser(add_help=False)
+    batch.add_argument("--batch-size", type=int, default=1000, help="tasks per transaction (default 1000)")
+
+    setters = argparse.ArgumentParser(add_help=False)
+    setters.add_argument("--set-priority", choices=PRIORITIES)
+    setters.add_argument("--set-due", type=parse_time, metavar="WHEN", help="due date (0 clears it)")
+    setters.add_argument("--set-remind", type=parse_time, metavar="WHEN", help="reminder time (0 clears it)")
+    setters.add_argument("--set-project", metavar="PATH", help='project path ("" clears it)')
+    setters.add_argument("--set-tags", metavar="TAGS", help='comma-separated tags, replacing the current ones ("" clears them)')
+
+    command = commands.add_parser("import", parents=[batch], help="stream tasks in from JSON Lines or CSV")
+    command.add_argument("file", help='input file, or "-" for stdin')
+    command.add_argument("--format", choices=FORMATS, help="default: from the file extension (jsonl)")
+    command.set_defaults(run=cmd_import)
+
+    command = commands.add_parser("export", parents=[filters], help="stream tasks out as JSON Lines or CSV")
+    command.add_argument("file", help='output file, or "-" for stdout')
+    command.add_argument("--format", choices=FORMATS, help="default: from the file extension (jsonl)")
+    command.set_defaults(run=cmd_export, ids=[])
+
+    command = commands.add_parser("list", parents=[targets, filters], help="print matching tasks")
+    command.add_argument("--format", choices=("table",) + FORMATS, default="table")
+    command.set_defaults(run=cmd_list)
+
+    command = commands.add_parser("add", parents=[setters], help="add one task and print its ID")
+    command.add_argument("title")
+    command.add_argument("--description")
+    command.set_defaults(run=cmd_add)
+
+    for name, run, help_text in (("complete", cmd_complete, "mark matching tasks completed"),
+                                 ("reopen", cmd_reopen, "mark matching tasks pending"),
+                                 ("delete", cmd_delete, "delete matching tasks")):
+        command = commands.add_parser(name, parents=[targets, filters, batch], help=help_text)
+        command.add_argument("--all", action="store_true", help="allow running without filters")
+        command.set_defaults(run=run)
+
+    command = commands.add_parser("update", parents=[targets, filters, batch, setters], help="change fields of matching tasks")
+    command.add_argument("--set-title")
+    command.add_argument("--all", action="store_true", help="allow running without filters")
+    command.set_defaults(run=cmd_update)
+
+    command = commands.add_parser("sync", help="exchange changes with the sync server (TODO_SYNC_URL)")
+    command.add_argument("--every", type=float, metavar="SECONDS", help="keep syncing at this interval")
+    command.set_defaults(run=cmd_sync)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    db = open_database()
+    try:
+        return args.run(db, args)
+    finally:
+        db.flush()
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+import os
+
+# Storage settings (can be overridden through environment variables)
+STORAGE_BACKEND  = os.environ.get("TODO_STORAGE_BACKEND", "json")  # Backends: "json", "sqlite"
+DB_PATH          = os.environ.get("TODO_DB_PATH", "tasks.json")
+SQLITE_PATH      = os.environ.get("TODO_SQLITE_PATH", "tasks.db")
+STORAGE_MODE     = os.environ.get("TODO_STORAGE_MODE", "json")  # Modos: "json", "wal" (json backend only)
+WAL_COMPACT_THRESHOLD = int(os.environ.get("TODO_WAL_COMPACT_THRESHOLD", "1000"))
+WRITE_DELAY      = float(os.environ.get("TODO_WRITE_DELAY", "0.25"))  # Seconds a burst of changes is coalesced
+WRITE_MAX_DELAY  = float(os.environ.get("TODO_WRITE_MAX_DELAY", "2.0"))  # Longest a change waits during a non-stop burst
+FAST_START       = os.environ.get("TODO_FAST_START", "1") == "1"  # Stream tasks in after the window shows
+SNAPSHOT_FORMAT  = os.environ.get("TODO_SNAPSHOT_FORMAT", "json")  # Formatos: "json", "binary" (json backend only)
+BINARY_DB_PATH   = os.environ.get("TODO_BINARY_DB_PATH", "tasks.tdb")
+WATCH_INTERVAL   = float(os.environ.get("TODO_WATCH_INTERVAL", "1.0"))  # Seconds between checks for other processes' changes (0 disables)
+ARCHIVE_AFTER_DAYS = float(os.environ.get("TODO_ARCHIVE_AFTER_DAYS", "30"))  # Completed tasks older than this move to the archive (0 disables; json backend only)
+DUE_SOON_HOURS   = float(os.environ.get("TODO_DUE_SOON_HOURS", "24"))  # Window of the "Vencendo" view (overdue tasks always show)
+HISTORY_LIMIT    = int(os.environ.get("TODO_HISTORY_LIMIT", "100"))  # Undo steps kept (in <store>.history) across restarts
+
+# Sync (see src.utils.sync; run the reference server with python -m src.utils.sync_server)
+SYNC_URL         = os.environ.get("TODO_SYNC_URL", "")  # e.g. "http://127.0.0.1:8765" (empty disables sync)
+SYNC_BATCH       = int(os.environ.get("TODO_SYNC_BATCH", "500"))  # Changes per request, each way
+
+# Local API (run it with python -m src.utils.api_server; loopback only)
+API_PORT         = int(os.environ.get("TODO_API_PORT", "8766"))
+
+# Diagnostics
+STARTUP_METRICS  = os.environ.get("TODO_STARTUP_METRICS", "0") == "1"  # Print time-to-first-paint/interactive
+PROFILE          = os.environ.get("TODO_PROFILE", "0") == "1"  # Record timing spans from startup (F12 toggles the overlay)
+TRACE_PATH       = os.environ.get("TODO_TRACE_PATH", "todo_trace.json")  # Trace-event export written by the overlay
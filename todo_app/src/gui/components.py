@@ -1,33 +1,55 @@
 import customtkinter as ctk
-from src.models.task import Task, Priority, Status
+import time
+from bisect import bisect_left
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+from src.models.task import Task, Priority, now
+from src.config import settings
 from src.gui.styles import AppTheme, ComponentStyles
+from src.utils.ordering import PagedTasks
+from src.utils.profiling import profiler
+from src.utils.projects import SEPARATOR, normalize_project, normalize_tags
 
 
 class TaskCard(ctk.CTkFrame):
     """
     Visually represents a single task.
-    Receives callbacks for completion, editing, and deletion.
+    Receives callbacks for completion, editing, deletion and
+    (optionally) selection; clicking the card body toggles selection.
+    Styling comes from the shared TaskCardTheme; cards are meant to be
+    recycled through a TaskCardPool and rebound with bind_task.
     """
-    def __init__(self, master, task: Task, on_complete, on_delete, on_edit, **kwargs):
-        super().__init__(master, **ComponentStyles.get_task_card(), **kwargs)
+    def __init__(self, master, task: Task, on_complete, on_delete, on_edit, on_select=None, **kwargs):
+        theme = ComponentStyles.get_task_card_theme()
+        super().__init__(master, **theme.card, **kwargs)
+        self.theme       = theme
         self.task        = task
         self.on_complete = on_complete
         self.on_delete   = on_delete
         self.on_edit     = on_edit
+        self.on_select   = on_select
+        self.selected    = False
+        # What the widgets currently show, so rebinding only reconfigures what changed
+        self._shown = {}
         self.create_widgets()
+        if profiler.enabled:
+            from src.gui.debug_overlay import widget_count
+            profiler.count("widgets.created", widget_count(self))
     
+    def destroy(self):
+        if profiler.enabled:
+            from src.gui.debug_overlay import widget_count
+            profiler.count("widgets.destroyed", widget_count(self))
+        super().destroy()
+    
+    @profiler.timed("TaskCard.create_widgets")
     def create_widgets(self):
+        theme = self.theme
         # Grid configuration: it expands column 1
         self.grid_columnconfigure(1, weight=1)
         
         # Conclusion checkbox
-        self.checkbox = ctk.CTkCheckBox(
-            self,
-            text="",
-            command=self.toggle_complete,
-            width=20, height=20,
-            checkbox_width=20, checkbox_height=20
-        )
+        self.checkbox = ctk.CTkCheckBox(self, command=self.toggle_complete, **theme.checkbox)
         self.checkbox.grid(row=0, column=0, padx=10, pady=10, sticky="n")
         
         # The content frame (title and description)
@@ -35,60 +57,124 @@ class TaskCard(ctk.CTkFrame):
         self.content_frame.grid(row=0, column=1, padx=10, pady=10, sticky="ew")
         self.content_frame.grid_columnconfigure(0, weight=1)
         
-        # Title
-        # Use getattr to support Task implementations that may use different attribute names (e.g. 'name')
+        # Title (text is filled in by bind_task)
         self.title_label = ctk.CTkLabel(
             self.content_frame,
-            text=getattr(self.task, "title", getattr(self.task, "name", "")),
-            font=("Segoe UI", 14, "bold"),
-            text_color=AppTheme.TEXT_PRIMARY,
+            text="",
+            font=theme.title_font,
+            text_color=theme.text_colors[False][0],
             anchor="w"
         )
         self.title_label.grid(row=0, column=0, sticky="w", pady=(0,5))
         
-        # Description (optional)
-        desc = getattr(self.task, "description", None)
-        if desc:
-            self.desc_label = ctk.CTkLabel(
-                self.content_frame,
-                text=desc,
-                font=("Segoe UI", 11),
-                text_color=AppTheme.TEXT_SECONDARY,
-                anchor="w"
-            )
-            self.desc_label.grid(row=1, column=0, sticky="w", pady=(0,5))
+        # Due date (hidden when the bound task has none)
+        self.due_label = ctk.CTkLabel(
+            self.content_frame,
+            text="",
+            font=theme.due_font,
+            anchor="e"
+        )
+        
+        # Project and tags (hidden when the bound task has none)
+        self.labels_label = ctk.CTkLabel(
+            self.content_frame,
+            text="",
+            font=theme.due_font,
+            text_color=theme.labels_color,
+            anchor="e"
+        )
+        
+        # Description (optional, hidden when the bound task has none)
+        self.desc_label = ctk.CTkLabel(
+            self.content_frame,
+            text="",
+            font=theme.desc_font,
+            text_color=theme.text_colors[False][1],
+            anchor="w"
+        )
         
         # Action frames (edit and delete)
         self.actions_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.actions_frame.grid(row=0, column=2, padx=10, pady=10)
         
         # Edit button
-        self.edit_button = ctk.CTkButton(
-            self.actions_frame,
-            text="✏️",
-            width=30, height=30,
-            font=("Segoe UI", 12),
-            command=lambda: self.on_edit(self.task)
-        )
+        self.edit_button = ctk.CTkButton(self.actions_frame, command=self._edit, **theme.edit_button)
         self.edit_button.pack(side="left", padx=2)
         
         # Delete button
-        self.delete_button = ctk.CTkButton(
-            self.actions_frame,
-            text="🗑️",
-            width=30, height=30,
-            command=lambda: self.on_delete(self.task),
-            **ComponentStyles.get_danger_button()
-        )
+        self.delete_button = ctk.CTkButton(self.actions_frame, command=self._delete, **theme.delete_button)
         self.delete_button.pack(side="left", padx=2)
         
+        if self.on_select is not None:
+            for widget in (self, self.content_frame, self.title_label, self.desc_label):
+                widget.bind("<Button-1>", self._on_click)
+        
+        self.bind_task(self.task)
+    
+    def bind_task(self, task: Task):
+        """
+        Rebinds the card to another task and refreshes its widgets.
+        Lets list views recycle cards instead of building new ones.
+        (Not named bind: that is Tk's event binding method.)
+        """
+        self.task = task
+        if self._shown.get("title") != task.title:
+            self._shown["title"] = task.title
+            self.title_label.configure(text=task.title)
+        if self._shown.get("description") != task.description:
+            self._shown["description"] = task.description
+            if task.description:
+                self.desc_label.configure(text=task.description)
+                self.desc_label.grid(row=1, column=0, sticky="w", pady=(0,5))
+            else:
+                self.desc_label.grid_remove()
+        self._show_due(task)
+        self._show_labels(task)
         self.update_appearance()
     
+    def _show_labels(self, task: Task):
+        labels = (task.project, task.tags)
+        if self._shown.get("labels") == labels:
+            return
+        self._shown["labels"] = labels
+        text = " ".join(([f"📁 {task.project}"] if task.project else []) + [f"#{tag}" for tag in task.tags])
+        if not text:
+            self.labels_label.grid_remove()
+            return
+        self.labels_label.configure(text=text)
+        self.labels_label.grid(row=1, column=1, sticky="e", padx=(10,0), pady=(0,5))
+    
+    def _show_due(self, task: Task):
+        if task.due_at is None or task.is_completed:
+            due = None
+        else:
+            left = task.due_at - now()
+            urgency = "overdue" if left <= 0 else "soon" if left <= settings.DUE_SOON_HOURS * 3600 else "later"
+            due = (task.due_at, urgency)
+        if self._shown.get("due") == due:
+            return
+        self._shown["due"] = due
+        if due is None:
+            self.due_label.grid_remove()
+            return
+        self.due_label.configure(text="⏰ " + time.strftime("%d/%m %H:%M", time.localtime(due[0])),
+                                 text_color=self.theme.due_colors[due[1]])
+        self.due_label.grid(row=0, column=1, sticky="e", padx=(10,0), pady=(0,5))
+    
+    def set_selected(self, selected: bool):
+        """Highlights the card border while its task is selected."""
+        if selected != self.selected:
+            self.selected = selected
+            self.configure(**self.theme.borders[selected])
+    
     def toggle_complete(self):
         """
         Toggles task status and updates the visuals.
         Callback in the controller ensures persistence.
         """
+        # The click already flipped the box: whatever the cache says is stale
+        # (also if the card is released and reused, or nothing changes)
+        self._shown.pop("completed", None)
         self.on_complete(self.task)
         self.update_appearance()
     
@@ -97,46 +183,348 @@ class TaskCard(ctk.CTkFrame):
         Adjusts colors and checkboxes according to status.
         Completed tasks appear dimmed.
         """
-        # Support multiple Task shapes:
-        # - Enum status attribute (Status.COMPLETED)
-        # - Boolean flags: is_completed or completed
-        status = getattr(self.task, "status", None)
-        is_completed_flag = getattr(self.task, "is_completed", None)
-        completed_prop = getattr(self.task, "completed", None)
-
-        if status is not None:
-            is_completed = (status == Status.COMPLETED)
-        elif isinstance(is_completed_flag, bool):
-            is_completed = is_completed_flag
-        else:
-            is_completed = bool(completed_prop)
-
-        if is_completed:
+        completed = self.task.is_completed
+        if self._shown.get("completed") == completed:
+            return
+        self._shown["completed"] = completed
+        if completed:
             self.checkbox.select()
-            self.title_label.configure(text_color=AppTheme.TEXT_MUTED)
-            if hasattr(self, 'desc_label'):
-                self.desc_label.configure(text_color=AppTheme.TEXT_MUTED)
         else:
             self.checkbox.deselect()
-            self.title_label.configure(text_color=AppTheme.TEXT_PRIMARY)
-            if hasattr(self, 'desc_label'):
-                self.desc_label.configure(text_color=AppTheme.TEXT_SECONDARY)
+        title_color, desc_color = self.theme.text_colors[completed]
+        self.title_label.configure(text_color=title_color)
+        self.desc_label.configure(text_color=desc_color)
+    
+    def _edit(self):
+        self.on_edit(self.task)
+    
+    def _delete(self):
+        self.on_delete(self.task)
+    
+    def _on_click(self, event):
+        self.on_select(self.task)
+
+
+class TaskCardPool:
+    """
+    Keeps released TaskCards for reuse instead of destroying them.
+    Tk widgets cannot change parents, so a pool serves one master widget.
+    The caller hides a card before releasing it; acquire() rebinds a
+    parked card and only builds a new one when none is left.
+    """
+    def __init__(self, master, on_complete, on_delete, on_edit, on_select=None):
+        self.master      = master
+        self.on_complete = on_complete
+        self.on_delete   = on_delete
+        self.on_edit     = on_edit
+        self.on_select   = on_select
+        self.free: List[TaskCard] = []
+    
+    def acquire(self, task: Task):
+        """
+        A card bound to task, and whether it is new (needs placing).
+        """
+        if self.free:
+            card = self.free.pop()
+            card.bind_task(task)
+            profiler.count("cards.reused")
+            return card, False
+        profiler.count("cards.created")
+        return TaskCard(self.master, task, self.on_complete, self.on_delete, self.on_edit,
+                        on_select=self.on_select), True
+    
+    def release(self, card: TaskCard):
+        """Parks a card (already hidden by the caller) for the next acquire."""
+        self.free.append(card)
+
+
+class VirtualTaskList(ctk.CTkFrame):
+    """
+    Scrollable task list that only builds TaskCards for the visible rows.
+    Cards are recycled and rebound to other tasks as the user scrolls,
+    so the widget count stays flat no matter how many tasks are listed.
+    Selected task IDs are kept here (not on the cards), so the selection
+    survives scrolling; on_selection_changed(count) follows it.
+    The items stay in the sort order given to set_items: their keys are kept
+    in an ascending list, so finding or placing a task is a binary search.
+    The items may be PagedTasks: rows are fetched as they scroll into view,
+    and the keys (like index_of and the moves) only cover the loaded rows.
+    """
+    ROW_HEIGHT = 80
+    BUFFER_ROWS = 3
+    
+    def __init__(self, master, on_complete, on_delete, on_edit, empty_text: str = "",
+                 on_selection_changed=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_complete = on_complete
+        self.on_delete   = on_delete
+        self.on_edit     = on_edit
+        self.on_selection_changed = on_selection_changed
+        self.items: PagedTasks = PagedTasks.of([])
+        self.sort_key: Callable[[Task], Tuple] = lambda task: (task.created_at, task.id)
+        self.descending = False
+        self._keys: List[Tuple] = []       # Sort keys of the items, always ascending
+        self._key_of: Dict[str, Tuple] = {}  # task id -> its key in _keys
+        self.selected: Set[str] = set()
+        self.bound = {}        # task id -> (TaskCard, canvas window id) for rows in view
+        self.windows = {}      # TaskCard -> its canvas window id (parked cards keep theirs)
+        self._width = 0
+        self.create_widgets(empty_text)
+        self.pool = TaskCardPool(self.canvas, on_complete, on_delete, on_edit, on_select=self.toggle_selection)
+    
+    def create_widgets(self, empty_text):
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        
+        self.canvas = ctk.CTkCanvas(self, bg=AppTheme.BG_SECONDARY, highlightthickness=0)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scroll)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        
+        self.empty_label = ctk.CTkLabel(
+            self,
+            text=empty_text,
+            font=AppTheme.font(14),
+            text_color=AppTheme.TEXT_MUTED
+        )
+        
+        self.canvas.bind("<Configure>", lambda event: self.render())
+        # Mouse wheel only while the pointer is over the list
+        self.canvas.bind("<Enter>", lambda event: self._bind_wheel(True))
+        self.canvas.bind("<Leave>", lambda event: self._bind_wheel(False))
+    
+    def set_items(self, items: Union[List[Task], PagedTasks], sort_key: Callable[[Task], Tuple],
+                  descending: bool = False, still_listed: Optional[Callable[[str], bool]] = None):
+        """
+        Replaces the listed tasks and redraws the visible rows.
+        The items must already be sorted by sort_key (reversed if descending);
+        later inserts and updates keep that order. A list is shown as is;
+        PagedTasks are only fetched as far as the user scrolls, and
+        still_listed(task_id) then tells whether a selected task that is
+        not loaded yet stays selected.
+        """
+        if not isinstance(items, PagedTasks):
+            items = PagedTasks.of(items)
+        items.on_loaded = self._index_page
+        self.items = items
+        self.sort_key = sort_key
+        self.descending = descending
+        self._key_of = {}
+        self._keys = []
+        self._index_page(items.loaded)
+        for task_id in list(self.bound):
+            self._release(task_id)
+        if self.selected:
+            # Only tasks still listed stay selected
+            listed = {task_id for task_id in self.selected if task_id in self._key_of}
+            if not items.complete and still_listed is not None:
+                listed |= {task_id for task_id in self.selected - listed if still_listed(task_id)}
+            self._set_selection(listed)
+        self._update_scrollregion()
+        self.render()
+    
+    def _index_page(self, page: List[Task]):
+        """Adds the keys of rows fetched after the loaded ones."""
+        keys = [self._key_of.setdefault(item.id, self.sort_key(item)) for item in page]
+        if self.descending:
+            keys.reverse()
+            self._keys[:0] = keys
+        else:
+            self._keys.extend(keys)
+    
+    def insert_item(self, item: Task):
+        """Inserts one item at its sorted position; only the card for that row is bound."""
+        self._put(item)
+        # A task moved from a row not loaded yet was already counted
+        self.items.recount()
+        self._update_scrollregion()
+        self.render()
+    
+    def remove_item(self, index: int):
+        """Removes one item; its card goes back to the free pool."""
+        item = self._take(index)
+        self._release(item.id)
+        if item.id in self.selected:
+            self._set_selection(self.selected - {item.id})
+        self._update_scrollregion()
+        self.render()
+    
+    def update_item(self, index: int, item: Task):
+        """
+        Replaces one item and refreshes its card if it is on screen.
+        A task whose sort key changed is moved to its new position.
+        """
+        moved = self.sort_key(item) != self._key_of[item.id]
+        if moved:
+            self._take(index)
+            self._put(item)
+        else:
+            self.items[index] = item
+        entry = self.bound.get(item.id)
+        if entry is not None:
+            entry[0].bind_task(item)
+        if moved:
+            self._update_scrollregion()
+            self.render()
+    
+    def _put(self, item: Task):
+        """
+        Inserts an item and its key where they keep the sort order.
+        A task that sorts after the last loaded row is left for a later fetch.
+        """
+        key = self.sort_key(item)
+        position = bisect_left(self._keys, key)
+        index = len(self._keys) - position if self.descending else position
+        if index == len(self.items.loaded) and not self.items.complete:
+            return
+        self._key_of[item.id] = key
+        self._keys.insert(position, key)
+        self.items.insert(index, item)
+    
+    def _take(self, index: int) -> Task:
+        """Removes the item at index (and its key); its card stays bound."""
+        item = self.items.pop(index)
+        del self._keys[bisect_left(self._keys, self._key_of.pop(item.id))]
+        return item
+    
+    def toggle_selection(self, task: Task):
+        """Adds a task to the selection, or removes it if already selected."""
+        self._set_selection(self.selected ^ {task.id})
+    
+    def select_all(self):
+        """Selects every listed task (not only the rows in view; the rest are fetched)."""
+        self._set_selection({item.id for item in self.items})
+    
+    def clear_selection(self):
+        self._set_selection(set())
+    
+    def _set_selection(self, selected: Set[str]):
+        """Replaces the selection and repaints only the cards in view."""
+        self.selected = selected
+        for task_id, (card, window) in self.bound.items():
+            card.set_selected(task_id in selected)
+        if self.on_selection_changed is not None:
+            self.on_selection_changed(len(selected))
+    
+    def index_of(self, task_id) -> int:
+        """Position of the loaded item with the given ID, or -1."""
+        key = self._key_of.get(task_id)
+        if key is None:
+            return -1
+        position = bisect_left(self._keys, key)
+        return len(self._keys) - 1 - position if self.descending else position
+    
+    def render(self):
+        """
+        Binds pooled cards to the rows inside the viewport (plus a buffer).
+        Rows that already have a card are only moved, never rebound, and the
+        pool only grows when the viewport needs more rows than ever before.
+        Rows not loaded yet are fetched first.
+        """
+        height = self.canvas.winfo_height()
+        width = max(self.canvas.winfo_width() - 20, 1)
+        top = self.canvas.canvasy(0)
+        first = max(0, int(top // self.ROW_HEIGHT) - self.BUFFER_ROWS)
+        total = len(self.items)
+        last = self.items.load(min(total, int((top + height) // self.ROW_HEIGHT) + 1 + self.BUFFER_ROWS))
+        if len(self.items) != total:
+            # The fetch came back short: the count had gone stale
+            self._update_scrollregion()
+        wanted = {self.items[index].id: index for index in range(first, last)}
+        
+        # Give back the cards that scrolled out of view
+        for task_id in [task_id for task_id in self.bound if task_id not in wanted]:
+            self._release(task_id)
+        
+        resized = width != self._width
+        self._width = width
+        for task_id, index in wanted.items():
+            entry = self.bound.get(task_id)
+            if entry is None:
+                entry = self._acquire(self.items[index], width)
+                self.bound[task_id] = entry
+            elif resized:
+                self.canvas.itemconfigure(entry[1], width=width)
+            self.canvas.coords(entry[1], 10, index * self.ROW_HEIGHT + 5)
+    
+    def _acquire(self, task: Task, width):
+        """Takes a card from the pool (or has it build one) and shows it."""
+        card, new = self.pool.acquire(task)
+        if new:
+            window = self.windows[card] = self.canvas.create_window(
+                0, 0, window=card, anchor="nw", width=width, height=self.ROW_HEIGHT - 10)
+        else:
+            window = self.windows[card]
+            self.canvas.itemconfigure(window, state="normal", width=width)
+        card.set_selected(task.id in self.selected)
+        return card, window
+    
+    def _release(self, task_id):
+        """Hides a bound card and gives it back to the pool."""
+        entry = self.bound.pop(task_id, None)
+        if entry is not None:
+            self.canvas.itemconfigure(entry[1], state="hidden")
+            self.pool.release(entry[0])
+    
+    def recount(self):
+        """Re-reads the row count after a change to a task that is not loaded."""
+        total = len(self.items)
+        self.items.recount()
+        if len(self.items) != total:
+            self._update_scrollregion()
+            self.render()
+    
+    def _update_scrollregion(self):
+        self.canvas.configure(scrollregion=(0, 0, 0, len(self.items) * self.ROW_HEIGHT))
+        if not self.items:
+            self.canvas.yview_moveto(0)
+            self.empty_label.place(relx=0.5, rely=0.3, anchor="center")
+        else:
+            self.empty_label.place_forget()
+    
+    def _on_scroll(self, *args):
+        self.canvas.yview(*args)
+        self.render()
+    
+    def _on_wheel(self, event):
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        else:
+            step = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(step, "units")
+        self.render()
+    
+    def _bind_wheel(self, active: bool):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            if active:
+                self.canvas.bind_all(sequence, self._on_wheel)
+            else:
+                self.canvas.unbind_all(sequence)
 
 
 class AddTaskDialog(ctk.CTkToplevel):
     """
     Modal window for adding a new task.
-    Receives the on_add_task(title, description, priority) callback.
+    Receives the on_add_task(title, description, priority, due_at, remind_at,
+    project, tags) callback; the project field starts with the given one.
     """
-    def __init__(self, parent, on_add_task):
+    # Reminder choices -> seconds before the due date
+    REMINDERS = {"Sem lembrete": None, "No prazo": 0, "15 min antes": 15 * 60,
+                 "1 hora antes": 60 * 60, "1 dia antes": 24 * 60 * 60}
+    DUE_FORMATS = ("%d/%m/%Y %H:%M", "%d/%m/%Y")
+    def __init__(self, parent, on_add_task, project=None):
         super().__init__(parent)
         self.parent = parent
         self.on_add_task = on_add_task
+        self.project = project
         self.setup_window()
         self.create_widgets()
     def setup_window(self):
         self.title("Nova Tarefa")
-        self.geometry("400x300")
+        self.geometry("400x520")
         # Use the provided parent reference to avoid type-checker complaints about self.master
         self.transient(self.parent)
         self.grab_set()
@@ -145,17 +533,17 @@ class AddTaskDialog(ctk.CTkToplevel):
         frame = ctk.CTkFrame(self)
         frame.pack(fill="both", expand=True, padx=20, pady=20)
         
-        ctk.CTkLabel(frame, text="Adicionar Nova Tarefa", font=("Segoe UI", 16, "bold")).pack(pady=(0,20))
+        ctk.CTkLabel(frame, text="Adicionar Nova Tarefa", font=AppTheme.font(16, "bold")).pack(pady=(0,20))
         
-        ctk.CTkLabel(frame, text="Título:", font=("Segoe UI", 12)).pack(anchor="w")
+        ctk.CTkLabel(frame, text="Título:", font=AppTheme.font(12)).pack(anchor="w")
         self.title_entry = ctk.CTkEntry(frame, placeholder_text="Digite o título...", height=35)
         self.title_entry.pack(fill="x", pady=(5,15))
         
-        ctk.CTkLabel(frame, text="Descrição:", font=("Segoe UI", 12)).pack(anchor="w")
+        ctk.CTkLabel(frame, text="Descrição:", font=AppTheme.font(12)).pack(anchor="w")
         self.desc_textbox = ctk.CTkTextbox(frame, height=80)
         self.desc_textbox.pack(fill="x", pady=(5,15))
         
-        ctk.CTkLabel(frame, text="Prioridade:", font=("Segoe UI", 12)).pack(anchor="w")
+        ctk.CTkLabel(frame, text="Prioridade:", font=AppTheme.font(12)).pack(anchor="w")
         self.priority_var = ctk.StringVar(value="Média")
         self.priority_combo = ctk.CTkComboBox(
             frame,
@@ -163,7 +551,31 @@ class AddTaskDialog(ctk.CTkToplevel):
             variable=self.priority_var,
             height=35
         )
-        self.priority_combo.pack(fill="x", pady=(5,20))
+        self.priority_combo.pack(fill="x", pady=(5,15))
+        
+        ctk.CTkLabel(frame, text="Prazo (opcional):", font=AppTheme.font(12)).pack(anchor="w")
+        due_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        due_frame.pack(fill="x", pady=(5,20))
+        self.due_entry = ctk.CTkEntry(due_frame, placeholder_text="dd/mm/aaaa hh:mm", height=35)
+        self.due_entry.pack(side="left", fill="x", expand=True)
+        self.remind_var = ctk.StringVar(value="Sem lembrete")
+        ctk.CTkComboBox(
+            due_frame,
+            values=list(self.REMINDERS),
+            variable=self.remind_var,
+            width=140,
+            height=35
+        ).pack(side="left", padx=(10,0))
+        
+        ctk.CTkLabel(frame, text="Projeto e tags (opcional):", font=AppTheme.font(12)).pack(anchor="w")
+        labels_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        labels_frame.pack(fill="x", pady=(5,20))
+        self.project_entry = ctk.CTkEntry(labels_frame, placeholder_text="Trabalho/Cliente A", height=35)
+        self.project_entry.pack(side="left", fill="x", expand=True)
+        if self.project:
+            self.project_entry.insert(0, self.project)
+        self.tags_entry = ctk.CTkEntry(labels_frame, placeholder_text="#urgente, casa", width=140, height=35)
+        self.tags_entry.pack(side="left", padx=(10,0))
         
         btn_frame = ctk.CTkFrame(frame, fg_color="transparent")
         btn_frame.pack(fill="x")
@@ -183,5 +595,123 @@ class AddTaskDialog(ctk.CTkToplevel):
         prio_map = {"Baixa": Priority.LOW, "Média": Priority.MEDIUM, "Alta": Priority.HIGH}
         priority = prio_map[self.priority_var.get()]
         
-        self.on_add_task(title, desc, priority)
+        due_at = self.parse_due(self.due_entry.get().strip())
+        if due_at is False:
+            self.due_entry.configure(border_color=AppTheme.DANGER_COLOR)
+            return  # Keep the dialog open until the date is fixed
+        before = self.REMINDERS[self.remind_var.get()]
+        remind_at = due_at - before if due_at is not None and before is not None else None
+        
+        project = normalize_project(self.project_entry.get())
+        tags = normalize_tags(self.tags_entry.get())
+        self.on_add_task(title, desc, priority, due_at, remind_at, project, tags)
         self.destroy()
+    
+    def parse_due(self, text):
+        """
+        Epoch seconds for a typed due date, None if empty, False if invalid.
+        A date without time means the end of that day.
+        """
+        if not text:
+            return None
+        for fmt in self.DUE_FORMATS:
+            try:
+                due = datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+            if fmt == "%d/%m/%Y":
+                due = due.replace(hour=23, minute=59)
+            return int(due.timestamp())
+        return False
+
+
+class ProjectSidebar(ctk.CTkScrollableFrame):
+    """
+    Lists projects (subprojects indented under their parent), priorities
+    and tags with their pending / completed counts; clicking a row calls
+    on_select(kind, value), kind being None (every task), "project",
+    "priority" or "tag".
+    Counts come from the database's incrementally maintained counters:
+    update_counts only reconfigures the rows whose text changed, and rows
+    are only rebuilt when a project or tag appears or disappears.
+    """
+    PRIORITY_LABELS = {Priority.HIGH: "Alta", Priority.MEDIUM: "Média", Priority.LOW: "Baixa"}
+    ALL = (None, None)
+    
+    def __init__(self, master, on_select, **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_select = on_select
+        self.selected = self.ALL
+        self.rows: Dict[Tuple, ctk.CTkButton] = {}
+        self._shown: Dict[Tuple, str] = {}
+        self._layout = None  # (projects, tags) the rows were built for
+    
+    def update_counts(self, project_counts, priority_counts, tag_counts):
+        """Shows fresh counts (see TaskDatabase.project_counts and friends)."""
+        projects = sorted((project for project in project_counts if project),
+                          key=lambda project: [part.casefold() for part in project.split(SEPARATOR)])
+        tags = sorted(tag_counts)
+        if (projects, tags) != self._layout:
+            self._build(projects, tags)
+        texts = {self.ALL: self._text("Todas", project_counts.get("", (0, 0)))}
+        for project in projects:
+            name = "   " * project.count(SEPARATOR) + project.rpartition(SEPARATOR)[2]
+            texts[("project", project)] = self._text(name, project_counts[project])
+        for priority, label in self.PRIORITY_LABELS.items():
+            texts[("priority", priority)] = self._text(label, priority_counts[priority])
+        for tag in tags:
+            texts[("tag", tag)] = self._text(f"#{tag}", tag_counts[tag])
+        for key, text in texts.items():
+            if self._shown.get(key) != text:
+                self._shown[key] = text
+                self.rows[key].configure(text=text)
+        if self.selected not in self.rows:
+            # The selected project or tag has no tasks left
+            self.select(*self.ALL)
+    
+    def select(self, kind, value):
+        """Highlights a row and reports it through on_select."""
+        previous, self.selected = self.selected, (kind, value)
+        for key in (previous, self.selected):
+            if key in self.rows:
+                self.rows[key].configure(fg_color=AppTheme.ACCENT_COLOR if key == self.selected else "transparent")
+        self.on_select(kind, value)
+    
+    def _build(self, projects, tags):
+        for widget in self.winfo_children():
+            widget.destroy()
+        self.rows, self._shown = {}, {}
+        self._layout = (projects, tags)
+        self._row(self.ALL)
+        self._header("Projetos")
+        for project in projects:
+            self._row(("project", project))
+        self._header("Prioridade")
+        for priority in self.PRIORITY_LABELS:
+            self._row(("priority", priority))
+        if tags:
+            self._header("Tags")
+            for tag in tags:
+                self._row(("tag", tag))
+    
+    def _header(self, text):
+        ctk.CTkLabel(self, text=text.upper(), font=AppTheme.font(10, "bold"),
+                     text_color=AppTheme.TEXT_MUTED, anchor="w").pack(fill="x", pady=(12,2))
+    
+    def _row(self, key):
+        self.rows[key] = button = ctk.CTkButton(
+            self,
+            text="",
+            anchor="w",
+            height=26,
+            font=AppTheme.font(12),
+            fg_color=AppTheme.ACCENT_COLOR if key == self.selected else "transparent",
+            hover_color=AppTheme.BG_SURFACE,
+            command=lambda: self.select(*key)
+        )
+        button.pack(fill="x")
+    
+    @staticmethod
+    def _text(name, counts):
+        pending, completed = counts
+        return f"{name}   {pending} / {completed}"
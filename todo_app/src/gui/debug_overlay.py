@@ -0,0 +1,114 @@
+import time
+import tkinter
+import customtkinter as ctk
+from src.utils.profiling import profiler
+from src.config import settings
+from src.gui.styles import AppTheme
+
+_original_call = tkinter.CallWrapper.__call__
+
+
+def _timed_call(self, *args):
+    """Every Tk callback (events, after(), commands) runs through CallWrapper."""
+    if not profiler.enabled:
+        return _original_call(self, *args)
+    with profiler.span("tk." + getattr(self.func, "__qualname__", "callback")):
+        return _original_call(self, *args)
+
+
+def instrument_event_loop(root, interval_ms: int = 100):
+    """
+    Times every Tk callback and measures event loop lag: a heartbeat
+    scheduled every interval_ms records how late it actually ran.
+    """
+    tkinter.CallWrapper.__call__ = _timed_call
+    expected = [time.perf_counter() + interval_ms / 1000]
+
+    def heartbeat():
+        now = time.perf_counter()
+        profiler.record("tk.event_loop_lag", max(0.0, now - expected[0]))
+        expected[0] = now + interval_ms / 1000
+        root.after(interval_ms, heartbeat)
+
+    root.after(interval_ms, heartbeat)
+
+
+def widget_count(widget) -> int:
+    """Number of Tk widgets in a widget's tree (itself included)."""
+    return 1 + sum(widget_count(child) for child in widget.winfo_children())
+
+
+class DebugOverlay(ctk.CTkFrame):
+    """
+    Floating panel over the main window with the profiler's aggregates:
+    span timings, event loop lag, widget and write counters.
+    Refreshes itself while visible; "Exportar trace" writes the
+    trace-event file (settings.TRACE_PATH).
+    """
+    REFRESH_MS = 500
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, fg_color=AppTheme.BG_PRIMARY, border_width=1,
+                         border_color=AppTheme.ACCENT_COLOR, **kwargs)
+        self.visible = False
+        self._job = None
+        self.create_widgets()
+
+    def create_widgets(self):
+        self.text_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=AppTheme.font(11, family="Consolas"),
+            text_color=AppTheme.TEXT_SECONDARY,
+            justify="left",
+            anchor="w"
+        )
+        self.text_label.pack(fill="both", padx=10, pady=(10,5))
+
+        buttons = ctk.CTkFrame(self, fg_color="transparent")
+        buttons.pack(fill="x", padx=10, pady=(0,10))
+        ctk.CTkButton(buttons, text="Exportar trace", command=self.export, width=120, height=26).pack(side="left")
+        ctk.CTkButton(buttons, text="Zerar", command=self.reset, width=70, height=26,
+                      fg_color=AppTheme.SECONDARY_COLOR).pack(side="left", padx=(10,0))
+
+    def toggle(self):
+        """Shows or hides the panel; profiling runs while it is shown."""
+        if self.visible:
+            self.visible = False
+            self.place_forget()
+            if self._job is not None:
+                self.after_cancel(self._job)
+                self._job = None
+            profiler.enabled = settings.PROFILE
+        else:
+            self.visible = True
+            profiler.enabled = True
+            self.place(relx=1.0, rely=1.0, x=-10, y=-10, anchor="se")
+            self.lift()
+            self.refresh()
+
+    def refresh(self):
+        stats = profiler.stats()
+        counters = profiler.counters()
+        lines = [f"{'span':<34}{'n':>6}{'mean ms':>9}{'max ms':>9}"]
+        for name, entry in sorted(stats.items(), key=lambda item: -item[1]["total_ms"])[:12]:
+            lines.append(f"{name[-34:]:<34}{entry['count']:>6}{entry['mean_ms']:>9.1f}{entry['max_ms']:>9.1f}")
+        saves = counters.get("saves", 0)
+        written = counters.get("bytes.written", 0)
+        lines.append("")
+        lines.append(f"widgets  created {counters.get('widgets.created', 0)}"
+                     f"  destroyed {counters.get('widgets.destroyed', 0)}"
+                     f"  live {widget_count(self.winfo_toplevel())}")
+        lines.append(f"cards    created {counters.get('cards.created', 0)}"
+                     f"  reused {counters.get('cards.reused', 0)}")
+        lines.append(f"writes   {saves}  bytes {written:,}"
+                     f"  per write {written // saves if saves else 0:,}")
+        self.text_label.configure(text="\n".join(lines))
+        self._job = self.after(self.REFRESH_MS, self.refresh)
+
+    def export(self):
+        path = profiler.export(settings.TRACE_PATH)
+        print(f"Trace written to {path}")
+
+    def reset(self):
+        profiler.reset()
@@ -1,8 +1,17 @@
 import customtkinter as ctk
-from typing import cast
-from src.models.task import Status, Task
-from src.utils.database import TaskDatabase
-from src.gui.components import TaskCard, AddTaskDialog
+import dataclasses
+import queue
+from src.models.task import Status, now
+from src.utils.events import BATCH, DELETED, RELOADED
+from src.utils.history import UndoHistory
+from src.utils.ordering import SORT_KEYS, PagedTasks
+from src.utils.projects import in_project
+from src.utils.search import matches
+from src.utils.scheduler import REMIND
+from src.utils.startup import startup_timer
+from src.utils.profiling import profiler
+from src.config import settings
+from src.gui.components import VirtualTaskList, AddTaskDialog, ProjectSidebar
 from src.gui.styles import AppTheme, ComponentStyles
 
 
@@ -15,10 +24,123 @@ class TodoApp(ctk.CTk):
         super().__init__()
         AppTheme.configure_appearance()
         
-        self.db = TaskDatabase()  # Initializes or loads tasks
+        self.db = None  # Opened by _load_data once the shell is on screen
+        self.history = None  # Undo/redo of the user's changes, opened with the database
+        self.status_label = None  # Built on first use by show_status
+        self.debug_overlay = None  # Built on first F12
+        self._deadline_job = None  # The one after() waiting for the next due date/reminder
+        self._deadline_at = None
+        self._counts_job = None  # Pending sidebar counts refresh (one per burst of changes)
+        self._errors = queue.Queue()  # Filled by the writer thread, drained by the Tk loop
+        self.group = ProjectSidebar.ALL  # Sidebar selection: (kind, value)
         self.setup_window()
         self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.bind("<F12>", lambda event: self.toggle_debug_overlay())
+        self.bind("<Control-z>", lambda event: self.undo())
+        self.bind("<Control-y>", lambda event: self.redo())
+        self.bind("<Control-Z>", lambda event: self.redo())
+        if settings.PROFILE:
+            from src.gui.debug_overlay import instrument_event_loop
+            instrument_event_loop(self)
+        startup_timer.mark("window")
+        # Idle callbacks run after Tk has mapped and drawn the pending widgets
+        self.after_idle(self._load_data)
+    
+    def _load_data(self):
+        """
+        Fast start, second phase: opens the database and lists the first
+        screen of tasks once the empty window has been painted.
+        """
+        startup_timer.mark("first_paint")
+        self.db = self.open_database()  # Initializes or loads tasks
+        history_path = self.db.db_path.with_name(self.db.db_path.name + ".history")
+        self.history = UndoHistory(self.db, history_path, settings.HISTORY_LIMIT)
         self.refresh_tasks()
+        # From now on the list is patched one task at a time
+        self.db.subscribe(self.on_task_changed)
+        # Writes happen on a background thread; errors are shown in the header
+        self.db.on_error = self.report_error
+        self.after(self.ERROR_POLL_MS, self._poll_errors)
+        if self.db.loading:
+            self.show_status("Carregando tarefas...", AppTheme.TEXT_MUTED)
+            self.after(0, self._poll_loading)
+        else:
+            self._startup_finished()
+    
+    def _startup_finished(self):
+        startup_timer.mark("interactive")
+        if settings.STARTUP_METRICS:
+            print(startup_timer.report())
+        if settings.WATCH_INTERVAL > 0:
+            self.after(int(settings.WATCH_INTERVAL * 1000), self._watch_store)
+        self._arm_deadline()
+        self._refresh_counts()
+        if settings.ARCHIVE_AFTER_DAYS > 0:
+            # Old completed tasks leave the working set (and every save)
+            self.after_idle(lambda: self.db.archive_completed(settings.ARCHIVE_AFTER_DAYS * 86400))
+    
+    # Longest single wait: re-checks after system sleep or clock changes
+    MAX_DEADLINE_WAIT_MS = 60 * 60 * 1000
+    
+    def _arm_deadline(self):
+        """
+        Keeps one after() callback pointed at the next due date or
+        reminder. Cheap enough to call after every change: it only peeks
+        at the scheduler and re-arms when the next deadline moved.
+        """
+        if self.db is None:
+            return
+        deadline = self.db.next_deadline()
+        if deadline == self._deadline_at and self._deadline_job is not None:
+            return
+        if self._deadline_job is not None:
+            self.after_cancel(self._deadline_job)
+            self._deadline_job = None
+        self._deadline_at = deadline
+        if deadline is not None:
+            delay = min(max(0, deadline - now()) * 1000, self.MAX_DEADLINE_WAIT_MS)
+            self._deadline_job = self.after(delay, self._deadlines_reached)
+    
+    def _deadlines_reached(self):
+        """
+        Announces the due dates and reminders that were reached.
+        A reminder fires once: it is cleared from its task afterwards.
+        """
+        self._deadline_job = None
+        reached = self.db.pop_due()
+        if reached:
+            reminders = [task for kind, task in reached if kind == REMIND]
+            overdue = [task for kind, task in reached if kind != REMIND]
+            if reminders:
+                text = f"🔔 {reminders[0].title}"
+            else:
+                text = f"⏰ Venceu: {overdue[0].title}"
+            if len(reached) > 1:
+                text += f" (+{len(reached) - 1})"
+            self.show_status(text, AppTheme.WARNING_COLOR)
+            self.bell()
+            if reminders:
+                self.db.update_many(dataclasses.replace(task, remind_at=None) for task in reminders)
+            if self.filter_var.get() == "Vencendo":
+                self.refresh_tasks()
+        self._arm_deadline()
+    
+    def _watch_store(self):
+        """
+        Picks up changes other windows or scripts made to the same store.
+        The database announces them (as one BATCH) through on_task_changed.
+        """
+        self.db.poll_changes()
+        self.after(int(settings.WATCH_INTERVAL * 1000), self._watch_store)
+    
+    def open_database(self):
+        """
+        Opens the storage backend selected in settings
+        (see src.utils.storage.open_database).
+        """
+        from src.utils.storage import open_database
+        return open_database(lazy=settings.FAST_START)
     
     def setup_window(self):
         """
@@ -26,28 +148,32 @@ class TodoApp(ctk.CTk):
         title, size, minimum, icon (optional).
         """
         self.title("Lista de Tarefas")
-        self.geometry("800x600")
-        self.minsize(600, 400)
+        self.geometry("1000x600")
+        self.minsize(800, 400)
     
     def create_widgets(self):
         """
-        Creates main containers: header, filters and task area.
+        Creates main containers: project sidebar, header, filters and task area.
         """
+        self.sidebar = ProjectSidebar(self, self.select_group, width=200)
+        self.sidebar.pack(side="left", fill="y", padx=(20,0), pady=20)
+        
         self.main_container = ctk.CTkFrame(self, corner_radius=0)
-        self.main_container.pack(fill="both", expand=True, padx=20, pady=20)
+        self.main_container.pack(side="left", fill="both", expand=True, padx=20, pady=20)
         
         self._create_header()
         self._create_filters()
+        self._create_bulk_actions()
         self._create_task_list()
     
     def _create_header(self):
-        header = ctk.CTkFrame(self.main_container, fg_color="transparent")
+        self.header = header = ctk.CTkFrame(self.main_container, fg_color="transparent")
         header.pack(fill="x", pady=(0,20))
         
         ctk.CTkLabel(
             header,
             text="📋 Minhas Tarefas",
-            font=("Segoe UI", 24, "bold"),
+            font=AppTheme.font(24, "bold"),
             text_color=AppTheme.TEXT_PRIMARY
         ).pack(side="left")
         
@@ -58,71 +184,289 @@ class TodoApp(ctk.CTk):
             **ComponentStyles.get_main_button()
         ).pack(side="right")
     
+    def show_status(self, text, color=AppTheme.DANGER_COLOR):
+        """
+        Shows a message next to the header button (load progress,
+        persistence errors). The label is only built the first time.
+        """
+        if self.status_label is None:
+            self.status_label = ctk.CTkLabel(
+                self.header,
+                text="",
+                font=AppTheme.font(11),
+                text_color=color
+            )
+            self.status_label.pack(side="right", padx=(0,15))
+        self.status_label.configure(text=text, text_color=color)
+    
     def _create_filters(self):
         filters = ctk.CTkFrame(self.main_container, fg_color="transparent")
         filters.pack(fill="x", pady=(0,15))
         
         self.filter_var = ctk.StringVar(value="Todas")
-        for label in ["Todas", "Pendentes", "Concluídas"]:
+        for label in ["Todas", "Pendentes", "Concluídas", "Vencendo"]:
             ctk.CTkRadioButton(
                 filters,
                 text=label,
                 variable=self.filter_var,
                 value=label,
                 command=self.refresh_tasks,
-                font=("Segoe UI", 12)
+                font=AppTheme.font(12)
             ).pack(side="left", padx=(0,15))
+        
+        # Priority and due dates are sort orders too
+        self.order_var = ctk.StringVar(value="Recentes")
+        ctk.CTkOptionMenu(
+            filters,
+            values=list(self.ORDERS),
+            variable=self.order_var,
+            command=lambda choice: self.refresh_tasks(),
+            width=120,
+            height=30
+        ).pack(side="right", padx=(10,0))
+        
+        # Search-as-you-type over titles and descriptions
+        self.search_var = ctk.StringVar(value="")
+        ctk.CTkEntry(
+            filters,
+            textvariable=self.search_var,
+            placeholder_text="🔍 Buscar tarefas...",
+            width=220,
+            height=30
+        ).pack(side="right")
+        self.search_var.trace_add("write", lambda *args: self.refresh_tasks())
     
-    def _create_task_list(self):
+    def _create_bulk_actions(self):
         """
-        Scrollable area that will display TaskCards or empty list message.
+        Actions on several tasks at once: the selected ones (click a card
+        to select it) or every completed task. Each is a single database call.
         """
-        self.scrollable_frame = ctk.CTkScrollableFrame(
-            self.main_container,
-            corner_radius=AppTheme.CORNER_RADIUS
+        actions = ctk.CTkFrame(self.main_container, fg_color="transparent")
+        actions.pack(fill="x", pady=(0,10))
+        
+        ctk.CTkButton(
+            actions,
+            text="Selecionar todas",
+            command=lambda: self.task_list.select_all(),
+            fg_color=AppTheme.SECONDARY_COLOR,
+            width=130, height=30
+        ).pack(side="left", padx=(0,10))
+        
+        self.complete_selected_button = ctk.CTkButton(
+            actions,
+            text="✔ Concluir",
+            command=self.complete_selected,
+            fg_color=AppTheme.SUCCESS_COLOR,
+            width=110, height=30,
+            state="disabled"
         )
-        self.scrollable_frame.pack(fill="both", expand=True)
+        self.complete_selected_button.pack(side="left", padx=(0,10))
         
-        self.empty_label = ctk.CTkLabel(
-            self.scrollable_frame,
-            text="🎉 Nenhuma tarefa encontrada!\nClique em 'Nova Tarefa'.",
-            font=("Segoe UI", 14),
+        self.delete_selected_button = ctk.CTkButton(
+            actions,
+            text="🗑️ Excluir",
+            command=self.delete_selected,
+            width=110,
+            state="disabled",
+            **{**ComponentStyles.get_danger_button(), "height": 30}
+        )
+        self.delete_selected_button.pack(side="left", padx=(0,10))
+        
+        self.selection_label = ctk.CTkLabel(
+            actions,
+            text="",
+            font=AppTheme.font(11),
             text_color=AppTheme.TEXT_MUTED
         )
+        self.selection_label.pack(side="left")
+        
+        ctk.CTkButton(
+            actions,
+            text="Limpar concluídas",
+            command=self.clear_completed,
+            fg_color=AppTheme.SECONDARY_COLOR,
+            width=140, height=30
+        ).pack(side="right")
+        
+        for text, command in (("↷", self.redo), ("↶", self.undo)):
+            ctk.CTkButton(
+                actions,
+                text=text,
+                command=command,
+                fg_color=AppTheme.SECONDARY_COLOR,
+                width=36, height=30
+            ).pack(side="right", padx=(0,10))
+    
+    def _create_task_list(self):
+        """
+        Virtualized scroll area that will display TaskCards or empty list message.
+        Only the rows in view get a TaskCard.
+        """
+        self.task_list = VirtualTaskList(
+            self.main_container,
+            self.complete_task,
+            self.delete_task,
+            self.edit_task,
+            empty_text="🎉 Nenhuma tarefa encontrada!\nClique em 'Nova Tarefa'.",
+            on_selection_changed=self.on_selection_changed,
+            corner_radius=AppTheme.CORNER_RADIUS
+        )
+        self.task_list.pack(fill="both", expand=True)
+    
+    ERROR_POLL_MS = 250
+    
+    def report_error(self, error):
+        """
+        Database error callback. Called from the writer thread, which must
+        not touch Tk (not even after(): on_close waits for that thread in
+        flush()), so the error is queued for _poll_errors.
+        """
+        self._errors.put(error)
+    
+    def _poll_errors(self):
+        """Shows the write errors queued by report_error."""
+        error = None
+        while True:
+            try:
+                error = self._errors.get_nowait()
+            except queue.Empty:
+                break
+        if error is not None:
+            self.show_status(f"⚠️ Erro ao salvar: {error}")
+        self.after(self.ERROR_POLL_MS, self._poll_errors)
+    
+    def _poll_loading(self):
+        """
+        Fast start: merges the tasks streamed in so far (the list follows
+        through RELOADED notifications) until the load is complete.
+        """
+        if self.db.poll_loading():
+            self.after(30, self._poll_loading)
+        else:
+            self.show_status("")
+            self._startup_finished()
+    
+    def toggle_debug_overlay(self):
+        """
+        F12: shows/hides the performance overlay (profiling is recorded
+        while it is shown, or always with TODO_PROFILE=1).
+        """
+        if self.debug_overlay is None:
+            from src.gui.debug_overlay import DebugOverlay, instrument_event_loop
+            if not settings.PROFILE:
+                instrument_event_loop(self)
+            self.debug_overlay = DebugOverlay(self)
+        self.debug_overlay.toggle()
+    
+    def on_close(self):
+        """Makes sure pending writes reach the disk before the window closes."""
+        if self.db is not None:
+            self.db.flush()
+            self.db.close()
+        if settings.PROFILE:
+            print(f"Trace written to {profiler.export(settings.TRACE_PATH)}")
+        self.destroy()
     
     def show_add_dialog(self):
-        """Displays the modal to add a new task."""
-        AddTaskDialog(self, self.add_task)
+        """Displays the modal to add a new task (in the selected project)."""
+        kind, value = self.group
+        AddTaskDialog(self, self.add_task, project=value if kind == "project" else None)
     
-    def add_task(self, title, description, priority):
-        """Callback: adds a task to the database and updates the list."""
-        self.db.add_task(title, description, priority)
-        self.refresh_tasks()
+    def add_task(self, title, description, priority, due_at=None, remind_at=None, project=None, tags=()):
+        """Callback: adds a task to the database (the list updates via on_task_changed)."""
+        if self.db is None:
+            return
+        task = self.db.add_task(title, description, priority, due_at=due_at, remind_at=remind_at,
+                                project=project, tags=tags)
+        self.history.record(f"Adicionar '{title}'", [(None, task)])
     
     def complete_task(self, task):
         """
         Callback: switches task status and saves it to the database.
-        Called by TaskCard.
+        Called by TaskCard. Only the changed task is persisted and redrawn.
         """
-        if task.status == Status.PENDING:
-            task.mark_completed()
+        stored = self.db.get_task(task.id, include_archived=True)
+        if stored is None:
+            return
+        # Stored tasks are replaced, never modified in place
+        updated = dataclasses.replace(stored)
+        if updated.status == Status.PENDING:
+            updated.mark_completed()
+            label = f"Concluir '{updated.title}'"
         else:
-            task.mark_pending()
-        self.db.save_tasks()
-        self.refresh_tasks()
+            updated.mark_pending()
+            label = f"Reabrir '{updated.title}'"
+        with self.history.step(label, [task.id]):
+            self.db.update_task(updated)
     
     def delete_task(self, task):
         """
         Callback: confirms deletion and removes from the database.
-        Uses simple input modal for confirmation.
+        Uses simple input modal for confirmation (Ctrl+Z brings it back).
         """
-        dialog = ctk.CTkInputDialog(
-            text=f"Excluir '{task.title}'?",
-            title="Confirmar Exclusão"
-        )
-        if dialog.get_input():  # User confirmed
-            self.db.delete_task(task.id)
-            self.refresh_tasks()
+        if self._confirm(f"Excluir '{task.title}'?"):  # User confirmed
+            with self.history.step(f"Excluir '{task.title}'", [task.id]):
+                self.db.delete_task(task.id)
+    
+    def on_selection_changed(self, count):
+        """Enables the bulk buttons while something is selected."""
+        state = "normal" if count else "disabled"
+        self.complete_selected_button.configure(state=state)
+        self.delete_selected_button.configure(state=state)
+        self.selection_label.configure(text=f"{count} selecionada(s)" if count else "")
+    
+    def complete_selected(self):
+        """Marks every selected task as completed with one database call."""
+        if self.db is None:
+            return
+        selected = list(self.task_list.selected)
+        self.task_list.clear_selection()
+        with self.history.step(f"Concluir {len(selected)} tarefa(s)", selected):
+            self.db.complete_many(selected)
+    
+    def delete_selected(self):
+        """Confirms and deletes every selected task with one database call."""
+        selected = list(self.task_list.selected)
+        if self.db is None or not selected:
+            return
+        if self._confirm(f"Excluir {len(selected)} tarefa(s) selecionada(s)?"):
+            self.task_list.clear_selection()
+            with self.history.step(f"Excluir {len(selected)} tarefa(s)", selected):
+                self.db.delete_many(selected)
+    
+    def clear_completed(self):
+        """Confirms and deletes every completed task with one database call."""
+        if self.db is None:
+            return
+        completed = [task.id for task in self.db.get_tasks(Status.COMPLETED, include_archived=True)]
+        if completed and self._confirm(f"Excluir {len(completed)} tarefa(s) concluída(s)?"):
+            with self.history.step(f"Excluir {len(completed)} tarefa(s) concluída(s)", completed):
+                self.db.delete_many(completed)
+    
+    def undo(self):
+        """Ctrl+Z: reverts the last change (a bulk one as a single batch)."""
+        if self.history is not None:
+            self._show_history_result("Desfeito", self.history.undo())
+    
+    def redo(self):
+        """Ctrl+Y / Ctrl+Shift+Z: re-applies the last undone change."""
+        if self.history is not None:
+            self._show_history_result("Refeito", self.history.redo())
+    
+    def _show_history_result(self, verb, result):
+        if result is None:
+            self.show_status("Nada para " + ("desfazer" if verb == "Desfeito" else "refazer"), AppTheme.TEXT_MUTED)
+            return
+        label, conflicts = result
+        if conflicts:
+            self.show_status(f"{verb}: {label} ({conflicts} alterada(s) depois, mantida(s))", AppTheme.WARNING_COLOR)
+        else:
+            self.show_status(f"{verb}: {label}", AppTheme.TEXT_MUTED)
+    
+    def _confirm(self, text):
+        """Simple input modal used as a confirmation prompt."""
+        dialog = ctk.CTkInputDialog(text=text, title="Confirmar Exclusão")
+        return bool(dialog.get_input())
     
     def edit_task(self, task):
         """
@@ -131,59 +475,136 @@ class TodoApp(ctk.CTk):
         """
         pass
     
+    def select_group(self, kind, value):
+        """Sidebar callback: shows one project (with subprojects), priority or tag."""
+        if (kind, value) != self.group:
+            self.group = (kind, value)
+            self.refresh_tasks()
+    
+    def _refresh_counts(self):
+        """Hands the database's live counts to the sidebar (no task is scanned)."""
+        self._counts_job = None
+        if self.db is not None:
+            self.sidebar.update_counts(self.db.project_counts(), self.db.priority_counts(), self.db.tag_counts())
+    
+    @profiler.timed("TodoApp.refresh_tasks")
     def refresh_tasks(self):
         """
 		Refreshes the displayed list:
-		- Clears existing widgets
-		- Filters by status (All/Pending/Completed)
-		- Displays TaskCard for each empty task or message
+		- Filters by status (All/Pending/Completed), the sidebar's project,
+		  priority or tag, and search text; sorted by the chosen order
+		- "Vencendo" lists pending tasks due soon (or overdue), earliest
+		  first, straight from the database's due date index
+		- Only the completed filter and searches read the archive
+		- Hands the sorted tasks to the virtualized list, which rebinds
+		  only the cards in view (or shows the empty message); a plain
+		  filter is handed over as pages the list fetches as it scrolls,
+		  sized by the database's count
+		Used on startup and on filter changes; single-task changes go
+		through on_task_changed instead.
         """
-        # Clean scroll area
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        
+        if self.db is None:
+            return  # Still showing the empty shell
         # Select tasks according to filter
-        fv = self.filter_var.get()
-        if fv == "Pendentes":
-            tasks = self.db.get_tasks(Status.PENDING)
-        elif fv == "Concluídas":
-            tasks = self.db.get_tasks(Status.COMPLETED)
+        query = self.search_var.get().strip()
+        status = self._filter_status()
+        order_by, descending = self._sort_order()
+        kind, value = self.group
+        if self._due_soon_view():
+            tasks = self.db.due_soon(settings.DUE_SOON_HOURS * 3600)
+            tasks = [task for task in tasks if self._in_group(task) and (not query or matches(task, query))]
+        elif query:
+            tasks = [task for task in self.db.search(query, status, include_archived=True) if self._in_group(task)]
+            tasks.sort(key=SORT_KEYS[order_by], reverse=descending)
         else:
-            tasks = self.db.get_tasks()
+            # Already sorted: the database keeps these orderings (and one per project and tag) pre-sorted
+            filters = dict(status=status, priority=value if kind == "priority" else None,
+                           include_archived=status == Status.COMPLETED,
+                           project=value if kind == "project" else None, tag=value if kind == "tag" else None)
+            db = self.db
+            tasks = PagedTasks(
+                lambda cursor, limit: db.query(order_by=order_by, descending=descending, cursor=cursor,
+                                               limit=limit, **filters),
+                lambda: db.count(**filters), order_by)
         
         # Exibe
-        if not tasks:
-            self.empty_label.pack(expand=True, pady=50)
+        self.task_list.set_items(tasks, SORT_KEYS[order_by], descending, still_listed=self._still_listed)
+    
+    def _still_listed(self, task_id):
+        task = self.db.get_task(task_id, include_archived=self._filter_status() == Status.COMPLETED)
+        return task is not None and self._matches_filter(task)
+    
+    def on_task_changed(self, action, task):
+        """
+        Database subscriber: applies one change to the list.
+        Inserts, removes or rebinds a single row instead of rebuilding.
+        For BATCH, task is the list of (action, task) changes.
+        """
+        self._arm_deadline()
+        if self._counts_job is None:
+            self._counts_job = self.after_idle(self._refresh_counts)
+        if action == BATCH and len(task) <= 50:
+            # Small batches (e.g. another window's edits) are patched row by row
+            for change in task:
+                self.on_task_changed(*change)
+            return
+        if action in (RELOADED, BATCH):
+            # Reloads and large batches are redrawn once
+            self.refresh_tasks()
+            return
+        index = self.task_list.index_of(task.id)
+        visible = action != DELETED and self._matches_filter(task)
+        if index >= 0 and not visible:
+            self.task_list.remove_item(index)
+        elif index >= 0:
+            self.task_list.update_item(index, task)
+        elif visible:
+            self.task_list.insert_item(task)
         else:
-            # Ensure each item is a Task-like object (some DB implementations may return dicts)
-            def _to_task(obj):
-                from src.models.task import Task
-                if isinstance(obj, dict):
-                    try:
-                        return Task(**obj)
-                    except Exception:
-                        # Fallback: lightweight wrapper that exposes expected attributes and methods
-                        class _TaskWrapper:
-                            def __init__(self, data):
-                                self.__dict__.update(data)
-
-                            def mark_completed(self):
-                                self.status = Status.COMPLETED
-
-                            def mark_pending(self):
-                                self.status = Status.PENDING
-                        return _TaskWrapper(obj)
-                return obj
-            task_objs = [cast(Task, _to_task(t)) for t in tasks]
-            for task in sorted(task_objs, key=lambda t: getattr(t, "created_at", 0), reverse=True):
-                TaskCard(
-                    self.scrollable_frame,
-                    task,
-                    self.complete_task,
-                    self.delete_task,
-                    self.edit_task
-                ).pack(fill="x", padx=10, pady=5)
-
+            # It may have left (or changed) a row that is not loaded yet
+            self.task_list.recount()
+    
+    def _filter_status(self):
+        fv = self.filter_var.get()
+        if fv in ("Pendentes", "Vencendo"):
+            return Status.PENDING
+        if fv == "Concluídas":
+            return Status.COMPLETED
+        return None
+    
+    def _matches_filter(self, task):
+        status = self._filter_status()
+        if status is not None and task.status != status:
+            return False
+        if not self._in_group(task):
+            return False
+        if self._due_soon_view() and (task.due_at is None or
+                                      task.due_at > now() + settings.DUE_SOON_HOURS * 3600):
+            return False
+        query = self.search_var.get().strip()
+        return not query or matches(task, query)
+    
+    def _in_group(self, task):
+        kind, value = self.group
+        if kind == "project":
+            return in_project(task, value)
+        if kind == "priority":
+            return task.priority == value
+        if kind == "tag":
+            return value in task.tags
+        return True
+    
+    def _due_soon_view(self):
+        return self.filter_var.get() == "Vencendo"
+    
+    # Sort menu choice -> (SORT_KEYS name, descending)
+    ORDERS = {"Recentes": ("created_at", True), "Prioridade": ("priority", True), "Prazo": ("due_at", False)}
+    
+    def _sort_order(self):
+        """The chosen order ("Vencendo" always lists the earliest due first)."""
+        if self._due_soon_view():
+            return "due_at", False
+        return self.ORDERS[self.order_var.get()]
 
 if __name__ == "__main__":
     app = TodoApp()
@@ -1,4 +1,5 @@
 import customtkinter as ctk
+from functools import lru_cache
 
 class AppTheme:
     """It defines global styles and themes for the application."""
@@ -22,39 +23,138 @@ class AppTheme:
     CORNER_RADIUS    = 8
     BORDER_WIDTH     = 1
     
+    FONT_FAMILY      = "Segoe UI"
+    # Color emoji fonts tried, in order, when rendering button icons
+    EMOJI_FONTS      = ("seguiemj.ttf", "NotoColorEmoji.ttf", "Apple Color Emoji.ttc")
+    _fonts           = {}
+    _icons           = {}
+    
     @classmethod
     def configure_appearance(cls):
         """Dark and light mode configuration"""
         ctk.set_appearance_mode("dark")  # Modos: "dark", "light"
         ctk.set_default_color_theme("dark-blue")  # Temas: "blue", "dark-blue", "green"
+    
+    @classmethod
+    def font(cls, size, weight="normal", family=None):
+        """
+        Shared CTkFont for a size/weight (and optionally family) combination.
+        Widgets reuse one named Tk font instead of each creating its own.
+        Needs a root window, so it is only called while building widgets.
+        """
+        key = (size, weight, family)
+        font = cls._fonts.get(key)
+        if font is None:
+            font = cls._fonts[key] = ctk.CTkFont(family=family or cls.FONT_FAMILY, size=size, weight=weight)
+        return font
+    
+    @classmethod
+    def icon(cls, emoji, size):
+        """
+        Shared CTkImage of an emoji, rendered once with a color emoji font.
+        Buttons showing it skip Tk's per-widget text layout and font fallback.
+        Returns None when Pillow or an emoji font is missing (use text then).
+        """
+        key = (emoji, size)
+        if key not in cls._icons:
+            cls._icons[key] = cls._render_icon(emoji, size)
+        return cls._icons[key]
+    
+    @classmethod
+    def _render_icon(cls, emoji, size):
+        try:
+            from PIL import Image, ImageDraw, ImageFont
+        except ImportError:
+            return None
+        for name in cls.EMOJI_FONTS:
+            try:
+                # Bitmap emoji fonts (Noto) only load at their native size
+                font = ImageFont.truetype(name, 109)
+            except OSError:
+                continue
+            image = Image.new("RGBA", (136, 128), (0, 0, 0, 0))
+            ImageDraw.Draw(image).text((68, 64), emoji, font=font, anchor="mm", embedded_color=True)
+            return ctk.CTkImage(light_image=image, dark_image=image, size=(size, size))
+        return None
   
 class ComponentStyles:
-    """Returns standardized styles for GUI components."""
+    """
+    Returns standardized styles for GUI components.
+    Each style dict is built once and shared; callers only unpack it.
+    """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_main_button():
         return {
             "corner_radius": AppTheme.CORNER_RADIUS,
             "height":        40,
-            "font":          ("Segoe UI", 12, "bold"),
+            "font":          AppTheme.font(12, "bold"),
             "fg_color":      AppTheme.ACCENT_COLOR,
             "hover_color":   "#106EBE"
         }
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_danger_button():
         return {
             "corner_radius": AppTheme.CORNER_RADIUS,
             "height":        35,
-            "font":          ("Segoe UI", 11),
+            "font":          AppTheme.font(11),
             "fg_color":      AppTheme.DANGER_COLOR,
             "hover_color":   "#B02A2E"
         }
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_task_card():
         return {
             "corner_radius": AppTheme.CORNER_RADIUS,
             "fg_color":      AppTheme.BG_SURFACE,
             "border_width":  AppTheme.BORDER_WIDTH,
             "border_color":  AppTheme.SECONDARY_COLOR
-        }
\ No newline at end of file
+        }
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_task_card_theme():
+        return TaskCardTheme()
+
+
+class TaskCardTheme:
+    """
+    Everything a TaskCard is styled with, computed once and shared by all
+    cards: widget options, fonts, emoji icons and the colors for each
+    state, so building or rebinding a card creates no style objects.
+    """
+    def __init__(self):
+        self.card = ComponentStyles.get_task_card()
+        self.checkbox = {"text": "", "width": 20, "height": 20, "checkbox_width": 20, "checkbox_height": 20}
+        self.title_font = AppTheme.font(14, "bold")
+        self.desc_font = AppTheme.font(11)
+        self.due_font = AppTheme.font(10)
+        self.labels_color = AppTheme.ACCENT_COLOR  # Project and tags line
+        self.edit_button = {"width": 30, "height": 30, "font": AppTheme.font(12),
+                            **self._icon_options("✏️")}
+        self.delete_button = {**ComponentStyles.get_danger_button(), "width": 30, "height": 30,
+                              **self._icon_options("🗑️")}
+        # (title color, description color) by is_completed
+        self.text_colors = {
+            False: (AppTheme.TEXT_PRIMARY, AppTheme.TEXT_SECONDARY),
+            True:  (AppTheme.TEXT_MUTED, AppTheme.TEXT_MUTED),
+        }
+        # Due date label color by urgency (see TaskCard.bind_task)
+        self.due_colors = {
+            "overdue": AppTheme.DANGER_COLOR,
+            "soon":    AppTheme.WARNING_COLOR,
+            "later":   AppTheme.TEXT_MUTED,
+        }
+        # Border options by selected
+        self.borders = {
+            False: {"border_color": AppTheme.SECONDARY_COLOR, "border_width": AppTheme.BORDER_WIDTH},
+            True:  {"border_color": AppTheme.ACCENT_COLOR, "border_width": 2},
+        }
+    
+    @staticmethod
+    def _icon_options(emoji):
+        image = AppTheme.icon(emoji, 16)
+        return {"text": emoji} if image is None else {"text": "", "image": image}
@@ -0,0 +1,23 @@
+"""
+Application entry point: python -m src.main (or python src/main.py).
+Imports are kept in startup order so the fast-start timer covers them.
+"""
+import sys
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script: make the "src" package importable
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.startup import startup_timer
+
+
+def main():
+    from src.gui.main_window import TodoApp
+    startup_timer.mark("imports")
+    app = TodoApp()
+    app.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,160 @@
+import time
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional
+from typing import Iterable, Optional, Tuple, Union
 
 class Priority(Enum):
     """Task priority levels."""
     LOW = 1
     MEDIUM = 2
     HIGH = 3
-    
+
 class Status(Enum):
     """Possible task statuses."""
     PENDING = "Pending"
     COMPLETED = "Completed"
-    
-@dataclass
+
+
+def now() -> int:
+    """Current time as epoch seconds (the timestamp format used by Task)."""
+    return int(time.time())
+
+
+def to_epoch(value: Union[int, float, str, datetime, None]) -> Optional[int]:
+    """Converts a stored timestamp to epoch seconds.
+
+    Accepts epoch numbers, datetimes and ISO strings (older tasks.json files
+    stored naive UTC ISO strings)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        if value.isdigit():
+            return int(value)
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def to_tags(value: Union[Iterable[str], str, None]) -> Tuple[str, ...]:
+    """Converts stored tags to a tuple.
+
+    Accepts lists and comma-separated strings (CSV cells). Formats that
+    store tags as JSON text decode it themselves first. Repeated names are
+    dropped (first one kept): stores index tags per task."""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(dict.fromkeys(value))
+
+
+def same_content(a: Optional[dict], b: Optional[dict]) -> bool:
+    """Whether two stored task dicts (None for a deleted task) hold the same data.
+
+    The version is ignored: every store stamps its own."""
+    if a is None or b is None:
+        return a is b
+    return {**a, "version": 0} == {**b, "version": 0}
+
+
+@dataclass(slots=True)
 class Task:
-    """It represents an individual task in the to=do list
-    
-    Attrbutes:
+    """It represents an individual task in the to-do list.
+
+    Attributes:
     	id: Unique identifier for the task.
      	title: Title of the task.
       	description: Detailed description of the task.
         priority: Priority level of the task.
         status: Current status of the task.(PENDING or COMPLETED)
-        created_at: Timestamp when the task was created.
-        completed_at: Timestamp when the task was completed (None if pending)."""
-        
-
-id: str
-title: str
-description: Optional[str] = None
-priority: Priority = Priority.MEDIUM
-status: Status = Status.PENDING
-created_at: Optional[datetime] = None
-completed_at: Optional[datetime] = None
-
-
-def __post_init__(self):
-    """Executed after __init__"""
-    if self.created_at is None:
-        self.created_at = datetime.now()
-        
-def mark_completed(self):
-    """Marks the task as completed and sets the completed_at timestamp."""
-    self.status = Status.COMPLETED
-    self.completed_at = datetime.now()
-    
-def mark_pending(self):
-    """Marks the task as pending and clears the completed_at timestamp."""
-    self.status = Status.PENDING
-    self.completed_at = None
\ No newline at end of file
+        created_at: Epoch seconds when the task was created.
+        completed_at: Epoch seconds when the task was completed (None if pending).
+        version: Bumped by the database on every stored change; lets
+            processes sharing a store detect concurrent edits.
+        due_at: Epoch seconds the task is due (None if it has no due date).
+        remind_at: Epoch seconds to remind the user (None for no reminder).
+        project: "/"-separated project path, e.g. "Trabalho/Cliente A" (None if none).
+        tags: Tag names (see src.utils.projects.normalize_tags)."""
+
+    id: str
+    title: str
+    description: Optional[str] = None
+    priority: Priority = Priority.MEDIUM
+    status: Status = Status.PENDING
+    created_at: int = 0
+    completed_at: Optional[int] = None
+    version: int = 0
+    due_at: Optional[int] = None
+    remind_at: Optional[int] = None
+    project: Optional[str] = None
+    tags: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        """Executed after __init__"""
+        if not self.created_at:
+            self.created_at = now()
+
+    @property
+    def is_completed(self) -> bool:
+        return self.status is Status.COMPLETED
+
+    def is_overdue(self, at: Optional[int] = None) -> bool:
+        """Whether the task is pending past its due date."""
+        return self.status is Status.PENDING and self.due_at is not None and self.due_at <= (at or now())
+
+    def mark_completed(self):
+        """Marks the task as completed and sets the completed_at timestamp."""
+        self.status = Status.COMPLETED
+        self.completed_at = now()
+
+    def mark_pending(self):
+        """Marks the task as pending and clears the completed_at timestamp."""
+        self.status = Status.PENDING
+        self.completed_at = None
+
+    def to_dict(self) -> dict:
+        """Converts the task to a JSON serializable dict."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "priority": self.priority.value,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+            "version": self.version,
+            "due_at": self.due_at,
+            "remind_at": self.remind_at,
+            "project": self.project,
+            "tags": list(self.tags)
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Task":
+        """Builds a task from a stored dict, tolerating older formats."""
+        try:
+            priority = Priority(int(data.get("priority")))
+        except (TypeError, ValueError):
+            priority = Priority.MEDIUM
+        try:
+            status = Status(data.get("status"))
+        except ValueError:
+            status = Status.PENDING
+        return cls(
+            id=data["id"],
+            title=data.get("title") or "",
+            description=data.get("description"),
+            priority=priority,
+            status=status,
+            created_at=to_epoch(data.get("created_at")) or 0,
+            completed_at=to_epoch(data.get("completed_at")),
+            version=int(data.get("version") or 0),
+            due_at=to_epoch(data.get("due_at")),
+            remind_at=to_epoch(data.get("remind_at")),
+            project=data.get("project") or None,
+            tags=to_tags(data.get("tags"))
+        )
@@ -0,0 +1,721 @@
+import asyncio
+import ipaddress
+import json
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from http import HTTPStatus
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+if __package__ in (None, ""):
+    # Run as a script: make the "src" package importable
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from src.config import settings
+from src.models.task import Priority, Status, Task, to_epoch
+from src.utils.events import BATCH, DELETED, RELOADED
+from src.utils.ordering import SORT_KEYS, SortedIndex, cursor_for, decode_cursor
+from src.utils.projects import ProjectIndex, in_project, normalize_project, normalize_tags
+
+# Endpoints (JSON bodies; errors are {"error": message}):
+#
+#   GET    /tasks?status=&priority=&project=&tag=&order_by=&descending=&limit=&cursor=
+#              -> {"tasks": [...], "next": cursor | null, "version": N}
+#   POST   /tasks                 {"title": ..., ...}        -> 201 task
+#   GET    /tasks/<id>                                       -> task
+#   PATCH  /tasks/<id>            {"priority": 3, "version": 7, ...}  -> task
+#                                 (409 with the stored task if "version" is not the stored one)
+#   DELETE /tasks/<id>                                       -> 204
+#   POST   /batch                 {"operations": [{"op": "create", "task": {...}},
+#                                                 {"op": "update", "id": ..., "task": {...}},
+#                                                 {"op": "delete", "id": ...}]}
+#              -> {"results": [...]}, all or nothing
+#   GET    /events                Server-Sent Events: "change" events with
+#                                 {"version": N, "changes": [{"action", "id", "task"}]},
+#                                 "reload" when clients should list again
+#   GET    /status                -> {"tasks": N, "version": N, "listeners": N, "queued_writes": N}
+#
+# "version" counts the changes the server has seen; it is also the SSE
+# event ID, so a client reconnecting with Last-Event-ID gets what it missed.
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BODY = 8 * 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 15.0   # Seconds an idle connection is kept open
+HEARTBEAT = 15.0            # Seconds between SSE comments on a quiet stream
+REPLAY_EVENTS = 1000        # Events kept for reconnecting SSE clients
+LISTENER_BACKLOG = 1000     # Events queued for a slow SSE client before it is dropped
+WRITE_BATCH = 256           # Queued writes committed together
+
+LOOPBACK_HOSTS = {"127.0.0.1", "localhost", "::1"}
+FIELDS = {"title", "description", "priority", "status", "due_at", "remind_at", "project", "tags"}
+PRIORITIES = {"low": Priority.LOW, "medium": Priority.MEDIUM, "high": Priority.HIGH}
+
+
+class ApiError(Exception):
+    """A request the API refuses, with the HTTP status to answer."""
+
+    def __init__(self, status: int, message: str, task: Optional[dict] = None):
+        super().__init__(message)
+        self.status = status
+        self.task = task  # Stored task, sent back with conflicts
+
+
+@dataclass(slots=True)
+class _Request:
+    method: str
+    path: str
+    query: Dict[str, List[str]]
+    headers: Dict[str, str]
+    body: bytes
+    keep_alive: bool
+
+    def param(self, name: str) -> Optional[str]:
+        values = self.query.get(name)
+        return values[-1] if values else None
+
+    def json(self) -> dict:
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError as e:
+            raise ApiError(400, f"invalid JSON: {e}")
+        if not isinstance(data, dict):
+            raise ApiError(400, "expected a JSON object")
+        return data
+
+
+class _Listener:
+    """An SSE client: events queued for it, dropped if it falls too far behind."""
+    __slots__ = ("queue", "overflowed")
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(LISTENER_BACKLOG)
+        self.overflowed = False
+
+
+class ApiServer:
+    """It serves the task store over a loopback HTTP/JSON API (asyncio, stdlib only).
+
+    Writes: handlers validate a request and queue it for a single writer
+    task, which commits whatever is queued (up to WRITE_BATCH requests) in
+    one transaction: one save and one change notification per burst, and
+    writes never interleave. A /batch request gets a transaction of its
+    own, rolled back if any of its operations fails. The store is only
+    touched from one thread (the SQLite connection is bound to it), so the
+    event loop never waits on a lock or a save.
+
+    Reads: the server keeps its own read model (private task copies with
+    the SortedIndex/ProjectIndex orderings the store uses), fed by the
+    store's change notifications. Only the event loop changes it, between
+    requests, and a response is computed without yielding, so each one
+    sees a single consistent version and reads never wait for the writer.
+    A write's response is sent after its changes reached the read model,
+    so a client reads its own writes. Task JSON is encoded once per change
+    and reused by every page and event that includes it.
+
+    Changes are pushed to /events listeners as they reach the read model.
+    Connections are kept alive between requests (HTTP/1.1).
+
+    The server is meant to run next to the desktop app on the same store
+    (python -m src.utils.api_server): both share the files, and each picks
+    up the other's writes through poll_changes (every WATCH_INTERVAL).
+
+    Usage:
+        server = ApiServer(open_database, port=0)
+        await server.start()
+        await server.serve_forever()
+
+    Attributes:
+        port: Port being listened on (useful with port=0).
+        version: Number of changes the read model has applied."""
+
+    def __init__(self, open_store: Callable, host: str = "127.0.0.1", port: int = 8766,
+                 watch_interval: float = 1.0):
+        """It prepares a server (nothing is opened until start()).
+
+        Args:
+            open_store: Called on the store thread to open a TaskDatabase or SQLiteTaskDatabase.
+            host: Loopback address to listen on.
+            port: Port to listen on (0 picks a free one).
+            watch_interval: Seconds between checks for other processes' changes (0 disables)."""
+        if host != "localhost" and not ipaddress.ip_address(host).is_loopback:
+            raise ValueError(f"The API only listens on loopback addresses, not {host}")
+        self.open_store = open_store
+        self.host = host
+        self.port = port
+        self.watch_interval = watch_interval
+        self.version = 0
+        self.db = None
+        self._tasks: Dict[str, Task] = {}
+        self._encoded: Dict[str, bytes] = {}  # Task JSON, encoded on first use after each change
+        self._orderings = {order_by: SortedIndex(order_by) for order_by in SORT_KEYS}
+        self._projects = ProjectIndex()
+        self._listeners: List[_Listener] = []
+        self._recent: deque = deque(maxlen=REPLAY_EVENTS)  # (version, encoded event)
+        self._writes: Optional[asyncio.Queue] = None
+        self._store_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-store")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._background: List[asyncio.Task] = []
+        self._connections: Set[asyncio.Task] = set()
+
+    async def start(self):
+        """It opens the store, loads the read model and starts listening."""
+        self._loop = asyncio.get_running_loop()
+        self._writes = asyncio.Queue()
+        tasks = await self._in_store(self._open)
+        self._rebuild(tasks)
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._background.append(asyncio.create_task(self._write_loop()))
+        if self.watch_interval > 0:
+            self._background.append(asyncio.create_task(self._watch_loop()))
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """It stops listening, ends event streams and closes the store."""
+        if self._server is not None:
+            self._server.close()
+        for task in self._background:
+            task.cancel()
+        for connection in self._connections:
+            connection.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self.db is not None:
+            await self._in_store(self.db.close)
+        self._store_thread.shutdown(wait=True)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    # Store thread
+
+    def _open(self) -> List[Task]:
+        self.db = self.open_store()
+        self.db.subscribe(self._on_store_change)
+        return self._copy_all()
+
+    def _copy_all(self) -> List[Task]:
+        return [replace(task) for task in self.db.query()]
+
+    def _on_store_change(self, action: str, task):
+        """Store subscriber (store thread): hands private copies to the event loop."""
+        if action == BATCH:
+            changes = [(change, replace(item)) for change, item in task]
+        elif action == RELOADED:
+            changes = self._copy_all()
+        else:
+            changes = [(action, replace(task))]
+        self._loop.call_soon_threadsafe(self._apply, action, changes)
+
+    def _commit(self, operations: List[Tuple[Callable, bool]]) -> list:
+        """It runs queued writes in arrival order; each gets its result or its ApiError.
+
+        Single-task writes check before changing anything, so consecutive
+        ones share a transaction. An atomic write (a batch) gets its own,
+        rolled back if it fails partway."""
+        results = []
+        shared: List[Callable] = []
+
+        def run_shared():
+            if shared:
+                with self.db.transaction():
+                    for operation in shared:
+                        try:
+                            results.append(operation())
+                        except ApiError as e:
+                            results.append(e)
+                shared.clear()
+
+        for operation, atomic in operations:
+            if not atomic:
+                shared.append(operation)
+                continue
+            run_shared()
+            try:
+                with self.db.transaction():
+                    results.append(operation())
+            except ApiError as e:
+                results.append(e)
+        run_shared()
+        return results
+
+    # Event loop: read model
+
+    async def _in_store(self, function: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._store_thread, function, *args)
+
+    def _rebuild(self, tasks: List[Task]):
+        self._tasks = {task.id: task for task in tasks}
+        self._encoded.clear()
+        for ordering in self._orderings.values():
+            ordering.rebuild(tasks)
+        self._projects.rebuild(tasks)
+
+    def _apply(self, action: str, changes):
+        """It applies a store notification to the read model and pushes it to listeners."""
+        self.version += 1
+        if action == RELOADED:
+            self._rebuild(changes)
+            self._publish("reload", {"version": self.version})
+            return
+        # Only the last change of each task matters for the read model
+        latest: Dict[str, Tuple[str, Task]] = {}
+        for change, task in changes:
+            latest[task.id] = (change, task)
+        removed = [task_id for task_id, (change, _) in latest.items() if change == DELETED]
+        stored = [task for change, task in latest.values() if change != DELETED]
+        for task_id in latest:
+            self._encoded.pop(task_id, None)
+        for task_id in removed:
+            self._tasks.pop(task_id, None)
+        self._tasks.update((task.id, task) for task in stored)
+        self._index(stored, removed)
+        parts = []
+        for change, task in changes:
+            body = self._json(task.id) if change != DELETED else b"null"
+            parts.append(b'{"action":"%s","id":%s,"task":%s}' % (change.encode(), _dumps(task.id), body))
+        self._publish("change", b'{"version":%d,"changes":[%s]}' % (self.version, b",".join(parts)))
+
+    def _index(self, stored: List[Task], removed: List[str]):
+        if len(stored) + len(removed) > 16:
+            # Bulk paths: one pass/sort per list instead of one bisect per task
+            for ordering in self._orderings.values():
+                ordering.remove_many(removed)
+                ordering.add_many(stored)
+            self._projects.remove_many(removed)
+            self._projects.add_many(stored)
+            return
+        for index in list(self._orderings.values()) + [self._projects]:
+            for task_id in removed:
+                index.remove(task_id)
+            for task in stored:
+                index.add(task)
+
+    def _json(self, task_id: str) -> bytes:
+        encoded = self._encoded.get(task_id)
+        if encoded is None:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return b"null"
+            encoded = self._encoded[task_id] = _dumps(task.to_dict())
+        return encoded
+
+    def _publish(self, event: str, data):
+        if isinstance(data, dict):
+            data = _dumps(data)
+        message = b"id: %d\nevent: %s\ndata: %s\n\n" % (self.version, event.encode(), data)
+        self._recent.append((self.version, message))
+        for listener in self._listeners:
+            if listener.overflowed:
+                continue
+            try:
+                listener.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Dropped: it reconnects with Last-Event-ID and catches up from there
+                listener.overflowed = True
+
+    # Event loop: background tasks
+
+    async def _write_loop(self):
+        """The single writer: commits queued writes in batches, in arrival order."""
+        while True:
+            batch = [await self._writes.get()]
+            while len(batch) < WRITE_BATCH and not self._writes.empty():
+                batch.append(self._writes.get_nowait())
+            try:
+                results = await self._in_store(self._commit, [(operation, atomic) for operation, atomic, _ in batch])
+            except Exception as e:
+                results = [ApiError(500, f"write failed: {e}")] * len(batch)
+            # The commit's notifications were queued on the loop before its result,
+            # so the read model already has these writes: clients read their own
+            for (_, _, future), result in zip(batch, results):
+                if future.done():
+                    continue  # The client went away
+                if isinstance(result, ApiError):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def _watch_loop(self):
+        """Picks up changes other processes (the desktop app, the CLI) made to the store."""
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                await self._in_store(self.db.poll_changes)
+            except Exception as e:
+                print(f"Error reading external changes: {e}")
+
+    async def _write(self, operation: Callable, atomic: bool = False):
+        """Queues a write for the writer task and waits for its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((operation, atomic, future))
+        return await future
+
+    # Event loop: HTTP
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except ApiError as e:
+                    await _respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                if request.path == "/events" and request.method == "GET" and self._allowed(request):
+                    await self._stream_events(request, writer)
+                    break
+                status, payload = await self._dispatch(request)
+                await _respond(writer, status, payload, request.keep_alive)
+                if not request.keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            pass  # Server closing
+        finally:
+            self._connections.discard(connection)
+            writer.close()
+
+    @staticmethod
+    def _allowed(request: _Request) -> bool:
+        # Browsers send the page's host: refuse DNS-rebound requests
+        host = request.headers.get("host", "").rpartition(":")[0] or request.headers.get("host", "")
+        return host.strip("[]") in LOOPBACK_HOSTS
+
+    async def _dispatch(self, request: _Request) -> Tuple[int, object]:
+        if not self._allowed(request):
+            return 403, {"error": "only loopback hosts are accepted"}
+        parts = request.path.strip("/").split("/")
+        try:
+            if parts == ["tasks"]:
+                if request.method == "GET":
+                    return 200, self._list(request)
+                if request.method == "POST":
+                    fields = _fields(request.json(), create=True)
+                    return 201, await self._write(lambda: self._create(fields))
+            elif len(parts) == 2 and parts[0] == "tasks":
+                task_id = unquote(parts[1])
+                if request.method == "GET":
+                    if task_id not in self._tasks:
+                        raise ApiError(404, f"task {task_id} not found")
+                    return 200, self._json(task_id)
+                if request.method == "PATCH":
+                    data = request.json()
+                    version = _version(data)
+                    fields = _fields(data, create=False)
+                    return 200, await self._write(lambda: self._update(task_id, fields, version))
+                if request.method == "DELETE":
+                    await self._write(lambda: self._delete(task_id))
+                    return 204, None
+            elif parts == ["batch"]:
+                if request.method == "POST":
+                    return 200, {"results": await self._write(self._batch(request.json()), atomic=True)}
+            elif parts == ["status"]:
+                if request.method == "GET":
+                    return 200, {"tasks": len(self._tasks), "version": self.version,
+                                 "listeners": len(self._listeners), "queued_writes": self._writes.qsize()}
+            else:
+                return 404, {"error": "not found"}
+            return 405, {"error": f"{request.method} is not allowed on {request.path}"}
+        except ApiError as e:
+            payload = {"error": str(e)}
+            if e.task is not None:
+                payload["task"] = e.task
+            return e.status, payload
+
+    def _list(self, request: _Request) -> bytes:
+        """A page of the read model, in one of the SORT_KEYS orders."""
+        status = _parse(request.param("status"), _status, "status")
+        priority = _parse(request.param("priority"), _priority, "priority")
+        project = normalize_project(request.param("project"))
+        tags = normalize_tags([request.param("tag") or ""])
+        tag = tags[0] if tags else None
+        order_by = request.param("order_by") or "created_at"
+        if order_by not in SORT_KEYS:
+            raise ApiError(400, f"order_by must be one of {', '.join(SORT_KEYS)}")
+        descending = (request.param("descending") or "true").lower() not in ("0", "false", "no")
+        limit = _parse(request.param("limit"), int, "limit") or PAGE_SIZE
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        cursor = request.param("cursor")
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise ApiError(400, "invalid cursor")
+
+        grouped = project is not None or tag is not None
+        if grouped and order_by == "created_at":
+            ids = self._projects.ids(project, tag, status, descending, after)
+            tasks = (self._tasks[task_id] for task_id in ids)
+        else:
+            tasks = (self._tasks[task_id] for task_id in self._orderings[order_by].ids(status, descending, after))
+            if grouped:
+                tasks = (task for task in tasks
+                         if (project is None or in_project(task, project)) and (tag is None or tag in task.tags))
+        if priority is not None:
+            tasks = (task for task in tasks if task.priority == priority)
+        page = list(islice(tasks, limit + 1))
+        more = len(page) > limit
+        page = page[:limit]
+        next_cursor = _dumps(cursor_for(page[-1], order_by)) if more else b"null"
+        return b'{"tasks":[%s],"next":%s,"version":%d}' % (
+            b",".join(self._json(task.id) for task in page), next_cursor, self.version)
+
+    async def _stream_events(self, request: _Request, writer: asyncio.StreamWriter):
+        """Streams change events until the client disconnects (or falls too far behind)."""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Connection: keep-alive\r\n\r\nretry: 1000\n\n")
+        last_seen = request.headers.get("last-event-id")
+        if last_seen is not None and last_seen.isdigit() and int(last_seen) < self.version:
+            missed = [message for version, message in self._recent if version > int(last_seen)]
+            if self._recent and self._recent[0][0] <= int(last_seen) + 1:
+                writer.write(b"".join(missed))
+            else:
+                # Older than the replay window: the client has to list again
+                writer.write(b"id: %d\nevent: reload\ndata: %s\n\n" % (self.version, _dumps({"version": self.version})))
+        await writer.drain()
+        listener = _Listener()
+        self._listeners.append(listener)
+        try:
+            while not listener.overflowed:
+                try:
+                    message = await asyncio.wait_for(listener.queue.get(), HEARTBEAT)
+                except asyncio.TimeoutError:
+                    message = b": ping\n\n"
+                if message is None:
+                    break
+                writer.write(message)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._listeners.remove(listener)
+
+    # Writes (run on the store thread, inside the writer's transaction)
+
+    def _create(self, fields: dict) -> dict:
+        return self.db.add_task(
+            fields["title"], fields.get("description"), fields.get("priority", Priority.MEDIUM),
+            due_at=fields.get("due_at"), remind_at=fields.get("remind_at"),
+            project=fields.get("project"), tags=fields.get("tags", ())
+        ).to_dict()
+
+    def _check(self, task_id: str, version: Optional[int]) -> Task:
+        current = self.db.get_task(task_id)
+        if current is None:
+            raise ApiError(404, f"task {task_id} not found")
+        if version is not None and version != current.version:
+            raise ApiError(409, f"task {task_id} changed since version {version}", current.to_dict())
+        return current
+
+    def _update(self, task_id: str, fields: dict, version: Optional[int]) -> dict:
+        task = self._updated(self._check(task_id, version), fields)
+        self.db.update_task(task)
+        return self.db.get_task(task_id).to_dict()
+
+    @staticmethod
+    def _updated(current: Task, fields: dict) -> Task:
+        status = fields.get("status")
+        task = replace(current, **{name: value for name, value in fields.items() if name != "status"})
+        if status is Status.COMPLETED and not task.is_completed:
+            task.mark_completed()
+        elif status is Status.PENDING and task.is_completed:
+            task.mark_pending()
+        return task
+
+    def _delete(self, task_id: str):
+        self._check(task_id, None)
+        self.db.delete_task(task_id)
+
+    def _batch(self, data: dict) -> Callable:
+        """It validates a batch request and returns the write that applies it (all or nothing)."""
+        operations = data.get("operations")
+        if not isinstance(operations, list) or not operations:
+            raise ApiError(400, '"operations" must be a non-empty list')
+        parsed, targeted = [], set()
+        for index, operation in enumerate(operations):
+            if not isinstance(operation, dict):
+                raise ApiError(400, f"operation {index}: expected an object")
+            kind = operation.get("op")
+            try:
+                if kind == "create":
+                    parsed.append((kind, None, _fields(operation.get("task") or {}, create=True), None))
+                elif kind in ("update", "delete"):
+                    if not isinstance(operation.get("id"), str):
+                        raise ApiError(400, '"id" is required')
+                    if operation["id"] in targeted:
+                        raise ApiError(400, f"task {operation['id']} is already changed by this batch")
+                    targeted.add(operation["id"])
+                    task = operation.get("task") or {}
+                    fields = _fields(task, create=False) if kind == "update" else None
+                    parsed.append((kind, operation["id"], fields, _version(task)))
+                else:
+                    raise ApiError(400, '"op" must be "create", "update" or "delete"')
+            except ApiError as e:
+                raise ApiError(e.status, f"operation {index}: {e}", e.task)
+
+        def apply() -> list:
+            # Check everything first; anything failing later rolls the batch back (see _commit)
+            for kind, task_id, _, version in parsed:
+                if kind != "create":
+                    self._check(task_id, version)
+            results = []
+            for kind, task_id, fields, version in parsed:
+                if kind == "create":
+                    results.append(self._create(fields))
+                elif kind == "update":
+                    results.append(self._update(task_id, fields, None))
+                else:
+                    self._delete(task_id)
+                    results.append({"id": task_id, "deleted": True})
+            return results
+        return apply
+
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _parse(text: Optional[str], convert: Callable, name: str):
+    if text is None or text == "":
+        return None
+    try:
+        return convert(text)
+    except (ValueError, KeyError):
+        raise ApiError(400, f"invalid {name}: {text}")
+
+
+def _status(value) -> Status:
+    if isinstance(value, Status):
+        return value
+    return Status(str(value).capitalize())
+
+
+def _priority(value) -> Priority:
+    if isinstance(value, str) and value.lower() in PRIORITIES:
+        return PRIORITIES[value.lower()]
+    return Priority(int(value))
+
+
+def _version(data: dict) -> Optional[int]:
+    version = data.get("version")
+    if version is not None and not isinstance(version, int):
+        raise ApiError(400, '"version" must be an integer')
+    return version
+
+
+def _fields(data: dict, create: bool) -> dict:
+    """It validates task fields from a request body (the keys of Task.to_dict())."""
+    if not isinstance(data, dict):
+        raise ApiError(400, "a task must be a JSON object")
+    unknown = set(data) - FIELDS - {"id", "version", "created_at", "completed_at"}
+    if unknown:
+        raise ApiError(400, f"unknown fields: {', '.join(sorted(unknown))}")
+    fields = {}
+    for name in FIELDS & set(data):
+        value = data[name]
+        try:
+            if name == "title":
+                if not isinstance(value, str) or not value.strip():
+                    raise ValueError("must be a non-empty string")
+                value = value.strip()
+            elif name == "description":
+                if value is not None and not isinstance(value, str):
+                    raise ValueError("must be a string")
+                value = value or None
+            elif name == "priority":
+                value = _priority(value)
+            elif name == "status":
+                value = _status(value)
+            elif name in ("due_at", "remind_at"):
+                value = to_epoch(value)
+            elif name == "project":
+                value = normalize_project(value)
+            elif name == "tags":
+                value = normalize_tags(value)
+        except (ValueError, TypeError, KeyError) as e:
+            raise ApiError(400, f"invalid {name}: {e}")
+        fields[name] = value
+    if create and "title" not in fields:
+        raise ApiError(400, '"title" is required')
+    if create and "status" in fields:
+        raise ApiError(400, "new tasks are pending; complete them with PATCH")
+    return fields
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[_Request]:
+    """It reads one request; None when the client closed the connection."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise ApiError(400, "malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+        if len(headers) > 100:
+            raise ApiError(431, "too many headers")
+    if "transfer-encoding" in headers:
+        raise ApiError(411, "send a Content-Length")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise ApiError(400, "invalid Content-Length")
+    if length < 0:
+        raise ApiError(400, "invalid Content-Length")
+    if length > MAX_BODY:
+        raise ApiError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    url = urlsplit(target)
+    return _Request(method.upper(), url.path, parse_qs(url.query), headers, body, keep_alive)
+
+
+async def _respond(writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool):
+    if payload is None:
+        body = b""
+    elif isinstance(payload, bytes):
+        body = payload
+    else:
+        body = _dumps(payload)
+    head = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}", f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if body:
+        head.append("Content-Type: application/json; charset=utf-8")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+async def _main(port: int):
+    from src.utils.storage import open_database
+    server = ApiServer(open_database, port=port, watch_interval=settings.WATCH_INTERVAL)
+    await server.start()
+    print(f"API on http://127.0.0.1:{server.port} ({len(server)} tasks)", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    # python -m src.utils.api_server [PORT]  (store from the TODO_* settings)
+    try:
+        asyncio.run(_main(int(sys.argv[1]) if len(sys.argv) > 1 else settings.API_PORT))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,245 @@
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from src.models.task import Task
+from src.utils.ordering import SortedIndex
+from src.utils.search import SearchIndex
+
+MAGIC = b"TDBA1\n"
+_FRAME = struct.Struct("<II")   # compressed length, crc32 of the compressed bytes
+
+
+class TaskArchive:
+    """It keeps old completed tasks in a compressed, append-only file.
+
+    The file is the magic bytes followed by frames; each frame is one
+    append (a zlib-compressed block of JSON lines, either {"op": "put",
+    "task": ...} or {"op": "delete", "id": ...}). The last record for an
+    ID wins. A frame whose length or checksum does not match is treated
+    as torn: it and everything after it are dropped, like the WAL does.
+
+    Nothing is read until a view needs archived tasks (load()); appends
+    never read the file. Once loaded, appends made by other processes are
+    picked up by reading only the frames past the last known size.
+
+    Until then, get() answers from a sidecar file of "+id" and "-id" lines
+    (path + ".ids"), so looking up a task that was never archived does not
+    decompress the archive. "+id" lines are written before the frame and
+    "-id" lines after it: a crash can only leave an ID listed that the
+    archive lacks, which costs a load, never a missed task. Appends must
+    not run concurrently (TaskDatabase holds its file lock); the first one
+    writes the sidecar from the archive if it is missing.
+
+    Attributes:
+        path: Path to the archive file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._tasks: Optional[Dict[str, Task]] = None
+        self._offset = 0     # Bytes of the file already applied to _tasks
+        self._end = 0        # End of the last complete frame seen by an append (0: unknown)
+        self._orderings: Dict[str, SortedIndex] = {}
+        self._search: Optional[SearchIndex] = None
+        self._ids_path = self.path.with_name(self.path.name + ".ids")
+        self._ids: Set[str] = set()
+        self._ids_offset = 0  # Bytes of the sidecar already applied to _ids
+
+    @property
+    def loaded(self) -> bool:
+        return self._tasks is not None
+
+    def load(self) -> Dict[str, Task]:
+        """It reads the archive (the first time) or the frames appended since.
+
+        Returns:
+            The archived tasks by ID."""
+        if self._tasks is None:
+            self._tasks, self._offset = {}, 0
+        size = self._size()
+        if size < self._offset:
+            # Rewritten by someone else: start over
+            self._tasks, self._offset = {}, 0
+            self._orderings, self._search = {}, None
+        if size != self._offset:
+            for record in self._read(self._offset):
+                self._apply(record)
+        return self._tasks
+
+    def get(self, task_id: str) -> Optional[Task]:
+        """The archived task with this ID; the archive is only loaded if it may hold it."""
+        if self._tasks is None and not self._may_contain(task_id):
+            return None
+        return self.load().get(task_id)
+
+    def put_many(self, tasks: List[Task]):
+        """It appends tasks to the archive (one compressed frame, fsynced)."""
+        self._append([{"op": "put", "task": task.to_dict()} for task in tasks])
+
+    def delete_many(self, task_ids: Iterable[str]):
+        """It appends deletion records for archived tasks."""
+        self._append([{"op": "delete", "id": task_id} for task_id in task_ids])
+
+    def ordering(self, order_by: str) -> SortedIndex:
+        """Archived task IDs pre-sorted by one of SORT_KEYS (built on first use)."""
+        tasks = self.load()
+        ordering = self._orderings.get(order_by)
+        if ordering is None:
+            ordering = self._orderings[order_by] = SortedIndex(order_by)
+            ordering.rebuild(tasks.values())
+        return ordering
+
+    def search(self, query: str) -> Set[str]:
+        """IDs of archived tasks matching the query (index built on first use)."""
+        tasks = self.load()
+        if self._search is None:
+            self._search = SearchIndex()
+            for task in tasks.values():
+                self._search.add(task)
+        return self._search.search(query)
+
+    def _apply(self, record: dict):
+        if record.get("op") == "put":
+            task = Task.from_dict(record["task"])
+            self._tasks[task.id] = task
+            for ordering in self._orderings.values():
+                ordering.add(task)
+            if self._search is not None:
+                self._search.add(task)
+        elif record.get("op") == "delete":
+            task_id = record.get("id")
+            if self._tasks.pop(task_id, None) is not None:
+                for ordering in self._orderings.values():
+                    ordering.remove(task_id)
+                if self._search is not None:
+                    self._search.remove(task_id)
+
+    def _may_contain(self, task_id: str) -> bool:
+        """Whether the ID is listed in the sidecar (True if there is none to tell)."""
+        try:
+            size = self._ids_path.stat().st_size
+        except FileNotFoundError:
+            # No sidecar: an archive written before it existed, or no archive
+            return self._size() >= len(MAGIC)
+        if size < self._ids_offset:
+            # Rewritten by someone else: start over
+            self._ids, self._ids_offset = set(), 0
+        if size > self._ids_offset:
+            with open(self._ids_path, "rb") as f:
+                f.seek(self._ids_offset)
+                data = f.read(size - self._ids_offset)
+            # A line still being written is picked up next time
+            data = data[:data.rfind(b"\n") + 1]
+            for line in data.decode("utf-8").split("\n"):
+                if line.startswith("+"):
+                    self._ids.add(line[1:])
+                elif line.startswith("-"):
+                    self._ids.discard(line[1:])
+            self._ids_offset += len(data)
+        return task_id in self._ids
+
+    def _write_ids(self, sign: str, task_ids: List[str]):
+        if task_ids:
+            with open(self._ids_path, "ab") as f:
+                f.write("".join(f"{sign}{task_id}\n" for task_id in task_ids).encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _ensure_ids(self):
+        """It writes the sidecar of an archive that has none (loading it once)."""
+        if self._ids_path.exists() or self._size() < len(MAGIC):
+            return
+        loaded = self._tasks is not None
+        task_ids = list(self.load())
+        if not loaded:
+            # Only the IDs were needed: do not keep the archive in memory
+            self._tasks, self._offset = None, 0
+            self._orderings, self._search = {}, None
+        self._write_ids("+", task_ids)
+
+    def _append(self, records: List[dict]):
+        if not records:
+            return
+        self._ensure_ids()
+        self._write_ids("+", [record["task"]["id"] for record in records if record["op"] == "put"])
+        lines = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records)
+        payload = zlib.compress(lines.encode("utf-8"), 6)
+        end = self._valid_end()
+        with open(self.path, "r+b" if end else "wb") as f:
+            if not end:
+                f.write(MAGIC)
+            else:
+                # Cut a torn frame off before appending after it
+                f.truncate(end)
+                f.seek(end)
+            f.write(_FRAME.pack(len(payload), zlib.crc32(payload)) + payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self._end = (end or len(MAGIC)) + _FRAME.size + len(payload)
+        self._write_ids("-", [record["id"] for record in records if record["op"] == "delete"])
+        if self._tasks is not None:
+            if self._offset == end:
+                # Nothing else was appended since we last read: apply in memory
+                for record in records:
+                    self._apply(record)
+                self._offset = self._size()
+            else:
+                self.load()
+
+    def _valid_end(self) -> int:
+        """Offset right after the last intact frame (0 if there is no archive yet).
+
+        Frames are checked like _read() checks them (length and checksum),
+        so an append never lands after a frame that loads would stop at.
+        The walk starts from the end of our last append, so only frames
+        appended since (by other processes) are read."""
+        size = self._size()
+        if size < len(MAGIC):
+            return 0
+        with open(self.path, "rb") as f:
+            if 0 < self._end <= size:
+                end = self._end
+            else:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"{self.path} is not a task archive")
+                end = len(MAGIC)
+            f.seek(end)
+            while end + _FRAME.size <= size:
+                length, crc = _FRAME.unpack(f.read(_FRAME.size))
+                if end + _FRAME.size + length > size or zlib.crc32(f.read(length)) != crc:
+                    break
+                end += _FRAME.size + length
+        return end
+
+    def _read(self, offset: int) -> Iterator[dict]:
+        with open(self.path, "rb") as f:
+            if offset == 0:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"{self.path} is not a task archive")
+                offset = len(MAGIC)
+            f.seek(offset)
+            while True:
+                header = f.read(_FRAME.size)
+                if len(header) < _FRAME.size:
+                    break
+                length, crc = _FRAME.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    print(f"Ignoring torn archive frame at offset {offset} in {self.path}")
+                    break
+                # Only "\n" ends a record: splitlines() would also split on
+                # U+2028 and friends, which json.dumps leaves unescaped
+                for line in zlib.decompress(payload).decode("utf-8").split("\n"):
+                    if line:
+                        yield json.loads(line)
+                offset += _FRAME.size + length
+        self._offset = offset
+
+    def _size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
@@ -0,0 +1,246 @@
+import json
+import mmap
+import os
+import re
+import struct
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+from src.models.task import Priority, Status, Task
+
+MAGIC = b"TDBS"
+VERSION = 5
+
+# magic, version, reserved, count, then the byte offsets of the sections
+# (version 1 files have no task version column: six sections instead of seven;
+# version 2 files have no due/reminder columns, version 3 no projects/tags;
+# version 4 files join tags with commas, version 5 stores them as a JSON array)
+_PREFIX = struct.Struct("<4sHH")
+_HEADERS = {1: struct.Struct("<4sHHI6Q"), 2: struct.Struct("<4sHHI7Q"), 3: struct.Struct("<4sHHI9Q"),
+            4: struct.Struct("<4sHHI11Q"), 5: struct.Struct("<4sHHI11Q")}
+_HEADER_SIZES = {1: 64, 2: 72, 3: 88, 4: 104, 5: 104}
+_STRING_REF = struct.Struct("<II")   # offset into the heap, length in bytes
+_NONE = 0xFFFFFFFF                    # length marking a missing description or project
+_NO_TIME = -1                         # completed_at of pending tasks, missing due/reminder times
+
+_STATUS_CODES = {Status.PENDING: 0, Status.COMPLETED: 1}
+_STATUS_BY_CODE = {code: status for status, code in _STATUS_CODES.items()}
+
+
+class BinarySnapshot:
+    """It reads a columnar task snapshot through mmap.
+
+    Layout (little-endian, every section 8-byte aligned):
+        header      magic "TDBS", version, task count, section offsets
+        status      1 byte per task (0 pending, 1 completed)
+        priority    1 byte per task (Priority value)
+        created_at  int64 epoch seconds per task
+        completed   int64 epoch seconds per task (-1 when pending)
+        strings     3 x (uint32 offset, uint32 length) per task: id, title, description
+        heap        UTF-8 string bytes
+        versions    uint32 task version per task (since format version 2)
+        due         int64 epoch seconds per task (-1 when none; since version 3)
+        remind      int64 epoch seconds per task (-1 when none; since version 3)
+        labels      2 x (uint32 offset, uint32 length) per task into the label
+                    heap: project, tags (since version 4; tags are a JSON
+                    array since version 5, comma-separated before)
+        label heap  UTF-8 string bytes
+
+    Only the pages actually read are touched: filtering by status or
+    priority reads one byte column, and task(i) decodes a single record.
+    Older files are still read (missing columns read as 0 or None)."""
+
+    def __init__(self, path: Path):
+        """It maps the file and validates its header.
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version."""
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = None, None
+        if len(self._mm) >= _PREFIX.size:
+            magic, version, _ = _PREFIX.unpack_from(self._mm, 0)
+        if magic != MAGIC or version not in _HEADERS or len(self._mm) < _HEADER_SIZES[version]:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a task snapshot of a supported version")
+        _, _, _, count, *offsets = _HEADERS[version].unpack_from(self._mm, 0)
+        self.count = count
+        self.version = version
+        self._status, self._priority, self._created, self._completed, self._strings, self._heap = offsets[:6]
+        self._versions = offsets[6] if version >= 2 else None
+        self._due, self._remind = offsets[7:9] if version >= 3 else (None, None)
+        self._labels, self._label_heap = offsets[9:11] if version >= 4 else (None, None)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mm.close()
+
+    def status_of(self, index: int) -> Status:
+        return _STATUS_BY_CODE[self._mm[self._status + index]]
+
+    def task(self, index: int) -> Task:
+        """It decodes the task stored at the given position."""
+        mm = self._mm
+        strings = [self._string(self._strings, self._heap, index * 3 + field) for field in range(3)]
+        project = tags = None
+        if self._labels is not None:
+            project = self._string(self._labels, self._label_heap, index * 2)
+            tags = self._string(self._labels, self._label_heap, index * 2 + 1)
+        completed_at = struct.unpack_from("<q", mm, self._completed + index * 8)[0]
+        version = struct.unpack_from("<I", mm, self._versions + index * 4)[0] if self._versions is not None else 0
+        due_at = remind_at = _NO_TIME
+        if self._due is not None:
+            due_at = struct.unpack_from("<q", mm, self._due + index * 8)[0]
+            remind_at = struct.unpack_from("<q", mm, self._remind + index * 8)[0]
+        return Task(
+            id=strings[0],
+            title=strings[1],
+            description=strings[2],
+            priority=Priority(mm[self._priority + index]),
+            status=_STATUS_BY_CODE[mm[self._status + index]],
+            created_at=struct.unpack_from("<q", mm, self._created + index * 8)[0],
+            completed_at=None if completed_at == _NO_TIME else completed_at,
+            version=version,
+            due_at=None if due_at == _NO_TIME else due_at,
+            remind_at=None if remind_at == _NO_TIME else remind_at,
+            project=project,
+            tags=self._tags(tags)
+        )
+
+    def _tags(self, text: Optional[str]) -> tuple:
+        if not text:
+            return ()
+        return tuple(json.loads(text)) if self.version >= 5 else tuple(text.split(","))
+
+    def _string(self, refs: int, heap: int, slot: int) -> Optional[str]:
+        offset, length = _STRING_REF.unpack_from(self._mm, refs + slot * _STRING_REF.size)
+        if length == _NONE:
+            return None
+        start = heap + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def __iter__(self) -> Iterator[Task]:
+        for index in range(self.count):
+            yield self.task(index)
+
+    def select(self, status: Optional[Status] = None, priority: Optional[Priority] = None) -> List[int]:
+        """It returns the positions of tasks matching the filters.
+
+        Reads only the status and/or priority byte columns."""
+        if status is None and priority is None:
+            return list(range(self.count))
+        if status is not None:
+            indices = self._scan(self._status, _STATUS_CODES[status])
+            if priority is None:
+                return indices
+            code, base = priority.value, self._priority
+            return [index for index in indices if self._mm[base + index] == code]
+        return self._scan(self._priority, priority.value)
+
+    def _scan(self, offset: int, code: int) -> List[int]:
+        column = self._mm[offset:offset + self.count]
+        return [match.start() for match in re.finditer(re.escape(bytes([code])), column)]
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def write_binary(path: Path, tasks: Sequence[Task]):
+    """It writes tasks as a binary snapshot (temp file + fsync + rename)."""
+    path = Path(path)
+    count = len(tasks)
+    heap, refs = bytearray(), bytearray()
+    label_heap, label_refs = bytearray(), bytearray()
+    for task in tasks:
+        _pack_strings(refs, heap, (task.id, task.title, task.description))
+        tags = json.dumps(list(task.tags), ensure_ascii=False) if task.tags else None
+        _pack_strings(label_refs, label_heap, (task.project, tags))
+
+    status_at = _HEADER_SIZES[VERSION]
+    priority_at = status_at + _align(count)
+    created_at = priority_at + _align(count)
+    completed_at = created_at + count * 8
+    strings_at = completed_at + count * 8
+    heap_at = strings_at + len(refs)
+    versions_at = heap_at + _align(len(heap))
+    due_at = versions_at + _align(count * 4)
+    remind_at = due_at + count * 8
+    labels_at = remind_at + count * 8
+    label_heap_at = labels_at + len(label_refs)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADERS[VERSION].pack(MAGIC, VERSION, 0, count, status_at, priority_at, created_at,
+                                       completed_at, strings_at, heap_at, versions_at, due_at,
+                                       remind_at, labels_at, label_heap_at).ljust(_HEADER_SIZES[VERSION], b"\0"))
+        f.write(bytes(_STATUS_CODES[task.status] for task in tasks).ljust(_align(count), b"\0"))
+        f.write(bytes(task.priority.value for task in tasks).ljust(_align(count), b"\0"))
+        f.write(struct.pack(f"<{count}q", *(task.created_at for task in tasks)))
+        f.write(struct.pack(f"<{count}q", *(_NO_TIME if task.completed_at is None else task.completed_at
+                                             for task in tasks)))
+        f.write(refs)
+        f.write(bytes(heap).ljust(_align(len(heap)), b"\0"))
+        f.write(struct.pack(f"<{count}I", *(task.version for task in tasks)).ljust(_align(count * 4), b"\0"))
+        f.write(struct.pack(f"<{count}q", *(_NO_TIME if task.due_at is None else task.due_at for task in tasks)))
+        f.write(struct.pack(f"<{count}q", *(_NO_TIME if task.remind_at is None else task.remind_at
+                                             for task in tasks)))
+        f.write(label_refs)
+        f.write(label_heap)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _pack_strings(refs: bytearray, heap: bytearray, values):
+    for value in values:
+        if value is None:
+            refs += _STRING_REF.pack(0, _NONE)
+        else:
+            data = value.encode("utf-8")
+            refs += _STRING_REF.pack(len(heap), len(data))
+            heap += data
+
+
+def is_binary_snapshot(path: Path) -> bool:
+    """Checks the magic bytes of a file."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def json_to_binary(json_path: Path, binary_path: Path) -> int:
+    """Converts a tasks.json file to a binary snapshot. Returns the task count."""
+    from src.utils.stream import iter_json_array
+    tasks = [Task.from_dict(task_dict) for task_dict in iter_json_array(Path(json_path))]
+    write_binary(binary_path, tasks)
+    return len(tasks)
+
+
+def binary_to_json(binary_path: Path, json_path: Path) -> int:
+    """Converts a binary snapshot back to tasks.json. Returns the task count."""
+    with BinarySnapshot(binary_path) as snapshot:
+        data = [task.to_dict() for task in snapshot]
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return len(data)
+
+
+if __name__ == "__main__":
+    # python -m src.utils.binary_snapshot to-binary tasks.json tasks.tdb
+    # python -m src.utils.binary_snapshot to-json tasks.tdb tasks.json
+    import sys
+    if len(sys.argv) != 4 or sys.argv[1] not in ("to-binary", "to-json"):
+        sys.exit("usage: python -m src.utils.binary_snapshot (to-binary|to-json) SOURCE TARGET")
+    convert = json_to_binary if sys.argv[1] == "to-binary" else binary_to_json
+    print(f"Converted {convert(sys.argv[2], sys.argv[3])} tasks into {sys.argv[3]}")
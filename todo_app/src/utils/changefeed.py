@@ -0,0 +1,93 @@
+import os
+import uuid
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+
+class ChangeFeed:
+    """It records which tasks changed, in commit order, for sync.
+
+    An append-only text file: a "#<generation>" header line, then one task
+    ID per line for every stored change or deletion. Positions are
+    "<generation>:<byte offset>" strings, so the IDs changed since a
+    position are read without looking at the rest of the store. trim()
+    empties the file under a new generation once a reader has caught up;
+    positions from an older generation then read from the start.
+
+    IDs are appended before the change itself is written: after a crash
+    the feed may name a task whose change was lost (a harmless resend),
+    never the reverse.
+
+    Not thread-safe: TaskDatabase uses it with its I/O and file locks held.
+
+    Attributes:
+        path: Path to the feed file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def append(self, task_ids: Iterable[str]):
+        """It appends changed task IDs (flushed and fsynced)."""
+        lines = "".join(task_id + "\n" for task_id in task_ids)
+        if not lines:
+            return
+        if self._header() is None:
+            self._reset()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read(self, position: Optional[str]) -> Tuple[List[str], str]:
+        """It returns the IDs appended since a position (oldest first, no duplicates) and the new position.
+
+        A None position reads nothing and returns the current end."""
+        header = self._header() or self._reset()
+        generation, start = header
+        if position is None:
+            return [], f"{generation}:{self.path.stat().st_size}"
+        position_generation, _, offset = position.partition(":")
+        offset = int(offset) if position_generation == generation and offset.isdigit() else start
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        # A line still being written has no newline yet: leave it for next time
+        complete = data[:data.rfind(b"\n") + 1]
+        task_ids = list(dict.fromkeys(complete.decode("utf-8").splitlines()))
+        return task_ids, f"{generation}:{offset + len(complete)}"
+
+    def trim(self, position: str) -> str:
+        """It empties the feed if nothing was appended after position.
+
+        Returns:
+            The position equivalent to the given one after trimming."""
+        header = self._header()
+        if header is None:
+            return position
+        generation, _ = header
+        if position == f"{generation}:{self.path.stat().st_size}":
+            generation, start = self._reset()
+            return f"{generation}:{start}"
+        return position
+
+    def _header(self) -> Optional[Tuple[str, int]]:
+        """(generation, offset of the first ID), or None if there is no feed yet."""
+        try:
+            with open(self.path, "rb") as f:
+                line = f.readline()
+        except FileNotFoundError:
+            return None
+        if not line.startswith(b"#") or not line.endswith(b"\n"):
+            return None
+        return line[1:-1].decode("ascii"), len(line)
+
+    def _reset(self) -> Tuple[str, int]:
+        generation = uuid.uuid4().hex
+        header = f"#{generation}\n"
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(header)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        return generation, len(header)
@@ -1,65 +1,363 @@
+import atexit
+import heapq
 import json
+import os
+import queue
+import threading
 import uuid
+from contextlib import contextmanager
+from dataclasses import replace
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
-from datetime import datetime
-from src.models.task import Priority, Status
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.models.task import Priority, Status, Task, now
+from src.utils.archive import TaskArchive
+from src.utils.changefeed import ChangeFeed
+from src.utils.scheduler import DeadlineScheduler
+from src.utils.ordering import SORT_KEYS, SortedIndex, decode_cursor
+from src.utils.projects import ProjectIndex, in_project
+from src.utils.search import SearchIndex
+from src.utils.stream import iter_json_array
+from src.utils.binary_snapshot import BinarySnapshot, write_binary
+from src.utils.events import ChangeNotifier, ADDED, UPDATED, DELETED, RELOADED, BATCH
+from src.utils.filelock import FileLock
+from src.utils.profiling import profiler
+from src.utils.wal import WriteAheadLog
+from src.utils.writer import BackgroundWriter
 
-class TaskDatabase:
+
+class _Transaction:
+    """Changes made inside TaskDatabase.transaction(), kept until it ends."""
+    __slots__ = ("records", "changes", "before", "dirty", "silent", "archived")
+
+    def __init__(self, dirty: Dict[str, Optional[int]]):
+        self.records: List[dict] = []                    # Log records, written as one
+        self.changes: List[Tuple[str, Task]] = []        # (action, task) for the BATCH notification
+        self.before: Dict[str, Optional[Task]] = {}      # First-seen state of each touched ID, for rollback
+        self.dirty = dict(dirty)                         # Unsaved-change bookkeeping to restore on rollback
+        self.silent = False                              # Skip the BATCH notification (the caller sends its own)
+        self.archived: Dict[str, Task] = {}              # Archived tasks to delete from the archive on commit
+
+
+def _expand(records: Iterable[dict]) -> Iterator[dict]:
+    """It flattens the "batch" records written by transactions."""
+    for record in records:
+        if record.get("op") == "batch":
+            yield from record.get("records", ())
+        else:
+            yield record
+
+
+def _record_id(record: dict) -> Optional[str]:
+    return record["task"]["id"] if record.get("op") == "put" else record.get("id")
+
+
+class TaskDatabase(ChangeNotifier):
     """It manages task storage and retrieval using a JSON file.
     
+    In "json" storage mode the whole file is rewritten. In "wal" mode
+    mutations are appended to a write-ahead log next to the JSON file
+    (tasks.json.wal), replayed on load and compacted into the JSON snapshot
+    once the log grows past compact_threshold records.
+
+    Either way, persistence runs on a background writer thread: a burst of
+    mutations is coalesced into one write after write_delay seconds (at
+    most write_max_delay after its first change, however long it lasts). Call
+    flush() (or close()) to make sure everything is on disk.
+
+    Tasks are indexed by ID and bucketed by status and priority, so lookups,
+    mutations and filtered reads never scan the whole store. Titles and
+    descriptions get an inverted index (built on the first search, then kept
+    up to date) for accent-insensitive search-as-you-type. IDs are also kept
+    pre-sorted by every key in SORT_KEYS, so query() pages come back without
+    sorting the store. Views can subscribe() to be told about each change
+    (see src.utils.events).
+
+    The *_many methods and transaction() group many changes into one write
+    (one log record in "wal" mode) and one BATCH notification.
+
+    Several processes can share the same files. Every write takes an
+    advisory lock (tasks.json.lock) and first merges what other processes
+    wrote since this one last read the store. The merge goes task by task:
+    each stored change bumps the task's version, and a local change is
+    dropped in favour of the other process's one if that task's version on
+    disk moved on in the meantime. poll_changes() applies external changes
+    to an open store (a stat tells when there are any; in "wal" mode only
+    the new log records are read).
+
+    The snapshot is JSON by default; snapshot_format="binary" uses the
+    mmap-able columnar format from src.utils.binary_snapshot instead.
+
+    Completed tasks older than a given age can be moved to a compressed,
+    append-only archive (archive_completed(), see src.utils.archive), so
+    the working set and every save only cover active tasks. Reads leave
+    the archive alone unless asked for it with include_archived=True; it
+    is loaded on the first such read. Changing an archived task brings it
+    back into the store.
+
+    With lazy=True the snapshot is streamed in on a background thread in
+    batches that double in size (the first one fills a screen); the owner
+    merges them with poll_loading(). Writes wait until loading is complete.
+
     Attributes:
     	db_path: Path to the JSON file storing tasks.
-     	tasks: In-memory list of tasks."""
+     	tasks: In-memory list of tasks (in insertion order).
+        storage_mode: Either "json" or "wal".
+        on_error: Called with the exception when a background write fails
+            (defaults to printing it)."""
       
-    def __init__(self, db_path: str = "tasks.json"):
+    def __init__(self, db_path: str = "tasks.json", storage_mode: str = "json", compact_threshold: int = 1000,
+                 write_delay: float = 0.25, lazy: bool = False, snapshot_format: str = "json",
+                 archive_path: Optional[str] = None, change_feed: bool = False, write_max_delay: float = 2.0):
         """It starts the database and loads existing tasks from the JSON file.
         
         Args:
-			db_path: Path to the JSON file storing tasks."""
+			db_path: Path to the JSON file storing tasks.
+            storage_mode: "json" to rewrite the file on every change, "wal" to append to a log.
+            compact_threshold: Number of log records that triggers a compaction.
+            write_delay: Seconds without new changes before a burst is written.
+            lazy: Stream tasks in on a background thread instead of loading them here.
+            snapshot_format: "json" or "binary" (file format of db_path).
+            archive_path: Archive of old completed tasks (defaults to db_path + ".archive").
+            change_feed: Record changed task IDs in db_path + ".changes" for sync
+                (see changes_since).
+            write_max_delay: Longest time a change waits to be written during a
+                continuous stream of changes."""
+        if storage_mode not in ("json", "wal"):
+            raise ValueError(f"Unknown storage mode: {storage_mode}")
+        if snapshot_format not in ("json", "binary"):
+            raise ValueError(f"Unknown snapshot format: {snapshot_format}")
    
         self.db_path = Path(db_path)
-        self.tasks = []
-        self.load_tasks()
+        self.storage_mode = storage_mode
+        self.snapshot_format = snapshot_format
+        self.compact_threshold = compact_threshold
+        # Ordered id -> task index plus per-status and per-priority buckets
+        self._by_id: Dict[str, Task] = {}
+        self._by_status: Dict[Status, Dict[str, Task]] = {}
+        self._by_priority: Dict[Priority, Dict[str, Task]] = {}
+        self._search: Optional[SearchIndex] = None
+        self._orderings = {order_by: SortedIndex(order_by) for order_by in SORT_KEYS}
+        self._projects = ProjectIndex()
+        self._deadlines = DeadlineScheduler()
+        self._bulk = False
+        self._txn: Optional[_Transaction] = None
+        # Multi-process bookkeeping: IDs changed here but not written yet
+        # (-> their version on disk when first changed, None if new), what
+        # the snapshot and log looked like when we last read or wrote them,
+        # and external changes waiting for poll_changes() to announce them
+        self._file_lock = FileLock(self.db_path.with_name(self.db_path.name + ".lock"))
+        self._dirty: Dict[str, Optional[int]] = {}
+        self._disk_state: Optional[Tuple] = None
+        self._wal_offset = 0
+        self._external: List[Tuple[str, Task]] = []
+        self._archive = TaskArchive(archive_path or self.db_path.with_name(self.db_path.name + ".archive"))
+        # Archived tasks brought back into the store; their archive entries
+        # are deleted once the store holding them is on disk
+        self._archive_pending: List[str] = []
+        self._feed = ChangeFeed(self.db_path.with_name(self.db_path.name + ".changes")) if change_feed else None
+        self._wal = None
+        if storage_mode == "wal":
+            self._wal = WriteAheadLog(self.db_path.with_name(self.db_path.name + ".wal"))
+        self.on_error: Optional[Callable[[Exception], None]] = None
+        # _lock guards the indexes and pending log records against the writer
+        # thread; _io_lock serializes file writes.
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
+        self._pending_records: List[dict] = []
+        self._write_failed = False
+        self._loader: Optional[threading.Thread] = None
+        self._load_queue: queue.Queue = queue.Queue()
+        self._loaded = threading.Event()
+        self._loaded.set()
+        self._writer = BackgroundWriter(self._persist, delay=write_delay, on_error=self._report_error,
+                                        max_delay=write_max_delay)
+        atexit.register(self.close)
+        if lazy:
+            self.start_loading()
+        else:
+            self.load_tasks()
         
+    @profiler.timed("TaskDatabase.load_tasks")
     def load_tasks(self):
-        """It loads tasks from the JSON file into memory if it exists."""
-        if self.db_path.exists():
+        """It loads tasks from the JSON file into memory if it exists.
+
+        In "wal" mode the log records are replayed on top of the snapshot."""
+        self.flush()
+        with self._io_lock, self._file_lock:
+            state = self._snapshot_state()
+            if self.db_path.exists():
+                try:
+                    self._rebuild_indexes(self._read_snapshot())
+                except (json.JSONDecodeError, KeyError, ValueError) as e:
+                    self._set_aside(e)
+                    state = self._disk_state
+                    self._rebuild_indexes([])
+            if self._wal is not None:
+                self._replay_log()
+            self._dirty = {}
+            self._disk_state = state
+            self._wal_offset = self._wal.size() if self._wal is not None else 0
+        self._notify(RELOADED)
+
+    def start_loading(self, first_batch: int = 500):
+        """It starts streaming the snapshot in on a background thread.
+
+        Args:
+            first_batch: Size of the first batch; each next batch is twice as big."""
+        self.flush()
+        self._rebuild_indexes([])
+        self._dirty = {}
+        self._loaded.clear()
+
+        def load():
+            batch, size = [], first_batch
+            # The log is small (bounded by compaction), so read it first and
+            # apply it to snapshot tasks as they stream by
+            overrides: Dict[str, Optional[Task]] = {}
+            with self._io_lock, self._file_lock:
+                # If another process rewrites the snapshot while it streams
+                # in, the next sync sees a newer state and compares everything
+                self._disk_state = self._snapshot_state()
+                if self._wal is not None:
+                    for record in _expand(self._wal.replay()):
+                        if record.get("op") == "put":
+                            task = Task.from_dict(record["task"])
+                            overrides[task.id] = task
+                        elif record.get("op") == "delete":
+                            overrides[record.get("id")] = None
+                    self._wal_offset = self._wal.size()
+            try:
+                if self.db_path.exists():
+                    for task in self._read_snapshot(newest_first=True):
+                        if task.id in overrides:
+                            task = overrides.pop(task.id)
+                            if task is None:
+                                continue
+                        batch.append(task)
+                        if len(batch) >= size:
+                            self._load_queue.put(batch)
+                            batch, size = [], size * 2
+            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                with self._io_lock, self._file_lock:
+                    self._set_aside(e)
+            # Tasks that only exist in the log
+            batch.extend(task for task in overrides.values() if task is not None)
+            self._load_queue.put(batch)
+            self._load_queue.put(None)  # Snapshot fully read
+
+        self._loader = threading.Thread(target=load, name="task-loader", daemon=True)
+        self._loader.start()
+
+    @property
+    def loading(self) -> bool:
+        """True while a lazy load is still in progress."""
+        return self._loader is not None
+
+    def poll_loading(self) -> bool:
+        """It merges the batches read so far and notifies subscribers.
+
+        Call it from the thread that owns the views (e.g. with Tk's after()).
+
+        Returns:
+            True while there is more to load."""
+        return self._drain(block=False)
+
+    def poll_changes(self) -> bool:
+        """It picks up changes other processes made to the store.
+
+        A stat of the snapshot (and log) tells whether anything changed. If
+        so, only the changed tasks are merged and subscribers get a single
+        BATCH notification with them. Call it periodically from the thread
+        that owns the views (e.g. with Tk's after()); changes merged by the
+        writer thread before its own writes are announced here too.
+
+        Returns:
+            True if external changes were applied."""
+        if self.loading:
+            return False
+        wal_moved = self._wal is not None and self._wal.size() != self._wal_offset
+        if wal_moved or self._snapshot_state() != self._disk_state:
             try:
-                with open(self.db_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.tasks = [self._dict_to_task(task_dict) for task_dict in data]
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"Error loading tasks: {e}")
-                self.tasks = []
+                with self._io_lock, self._file_lock:
+                    self._sync()
+            except (OSError, json.JSONDecodeError, KeyError, ValueError) as e:
+                print(f"Error reading external changes: {e}")
+        with self._lock:
+            changes, self._external = self._external, []
+        if changes:
+            self._notify(BATCH, changes)
+        return bool(changes)
+
+    def finish_loading(self):
+        """It waits for a lazy load to finish and merges everything."""
+        self._drain(block=True)
+
+    @property
+    def tasks(self) -> List[Task]:
+        """All tasks in insertion order."""
+        return list(self._by_id.values())
                 
+    @profiler.timed("TaskDatabase.save_tasks")
     def save_tasks(self):
-        """It saves all the tasks to the JSON file."""
+        """It saves all the tasks to the JSON file right away.
+
+        In "wal" mode this writes a fresh snapshot and discards the log."""
         try:
-            data = [self._task_to_dict(task) for task in self.tasks]
-            # Use Path.open to write text; use lowercase 'w' for write mode
-            with self.db_path.open('w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self.flush()
+            if self._wal is not None:
+                self._compact()
+                return
+            with self._io_lock, self._file_lock:
+                self._sync()
+                self._write_locked()
         except Exception as e:
-            print(f"Error saving tasks: {e}")
-    def add_task(self, title: str, description: Optional[str] = None, priority: Priority = Priority.MEDIUM) -> dict:
+            self._report_error(e)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """It writes pending changes now and waits until they are on disk.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            True if every change made before the call was written."""
+        if self.loading:
+            self.finish_loading()
+        if self._write_failed:
+            # Retry the write that failed last time
+            self._writer.schedule()
+        return self._writer.flush(timeout) and not self._write_failed
+
+    def close(self):
+        """It flushes pending changes and stops the writer thread."""
+        atexit.unregister(self.close)
+        if self.loading:
+            self.finish_loading()
+        self._writer.close()
+        if self._wal is not None:
+            self._wal.close()
+
+    def add_task(self, title: str, description: Optional[str] = None, priority: Priority = Priority.MEDIUM,
+                 due_at: Optional[int] = None, remind_at: Optional[int] = None,
+                 project: Optional[str] = None, tags: Tuple[str, ...] = ()) -> Task:
         """It creates a new task and adds it to the database.
         
         Args:
             title: Title of the task.
             description: Detailed description of the task.
-            priority: Priority level of the task."""
-        task = {
-            "id": str(uuid.uuid4()),
-            "title": title,
-            "description": description,
-            "priority": priority.value if isinstance(priority, Priority) else str(priority),
-            "status": Status.PENDING.value,
-            "created_at": datetime.utcnow().isoformat(),
-            "completed_at": None
-        }
-        self.tasks.append(task)
-        self.save_tasks()
+            priority: Priority level of the task.
+            due_at: Epoch seconds the task is due.
+            remind_at: Epoch seconds to remind the user.
+            project: Project path (see src.utils.projects.normalize_project).
+            tags: Tag names."""
+        task = Task(id=str(uuid.uuid4()), title=title, description=description, priority=priority,
+                    due_at=due_at, remind_at=remind_at, project=project, tags=tags)
+        with self._lock:
+            self._put(task, ADDED)
+            batched = self._txn is not None
+        if not batched:
+            self._notify(ADDED, task)
         return task
     
     def delete_task(self, task_id: str) -> bool:
@@ -70,50 +368,870 @@ class TaskDatabase:
             
         Returns:
             True if the task was found and deleted, False otherwise."""
-        for i, task in enumerate(self.tasks):
-            if task.get("id") == task_id:
-                del self.tasks[i]
-                self.save_tasks()
+        with self._lock:
+            task = self._remove(task_id)
+            batched = self._txn is not None
+            if task is None and batched:
+                # The archive append takes the I/O locks, which rank above
+                # _lock: it is made when the transaction commits
+                task = self._archive.get(task_id)
+                if task is None:
+                    return False
+                self._txn.archived[task_id] = task
                 return True
-        return False
+        if task is None:
+            task = self._archive.get(task_id)
+            if task is None:
+                return False
+            with self._io_lock, self._file_lock:
+                self._archive.delete_many([task_id])
+        elif not batched:
+            self._drop_deleted_restores()
+        if not batched:
+            self._notify(DELETED, task)
+        return True
 
-    def update_task(self, task: dict):
+    def update_task(self, task: Task):
         """It updates an existing task in the database.
 
+        An archived task is brought back into the store.
+
         Args:
-            task: The task dict with updated information.
+            task: The task with updated information (it replaces the stored one).
         """
-        for i, existing_task in enumerate(self.tasks):
-            if existing_task.get("id") == task.get("id"):
-                self.tasks[i] = task
-                self.save_tasks()
+        with self._lock:
+            if task.id not in self._by_id:
+                if self._archive.get(task.id) is None:
+                    return
+                self._archive_pending.append(task.id)
+            self._put(task, UPDATED)
+            batched = self._txn is not None
+        if not batched:
+            self._notify(UPDATED, task)
+
+    @contextmanager
+    def transaction(self):
+        """It groups the mutations made inside the block into one commit.
+
+        The changes are written together (as a single log record in "wal"
+        mode, so a crash keeps all of them or none) and subscribers get one
+        BATCH notification when the block ends. If the block raises, every
+        change is rolled back and nothing is written. Other threads wait
+        until the block ends; nested blocks join the outer one.
+
+        Usage:
+            with db.transaction():
+                db.add_task("A")
+                db.delete_task(old_id)"""
+        with self._transaction():
+            yield self
+
+    @contextmanager
+    def _transaction(self, io_locked: bool = False):
+        """transaction(), for callers that may already hold _io_lock and _file_lock.
+
+        Args:
+            io_locked: The caller holds both I/O locks, so the archive
+                writes made when the block ends must not take them again."""
+        with self._lock:
+            if self._txn is not None:
+                yield self
                 return
+            txn = self._txn = _Transaction(self._dirty)
+            try:
+                yield self
+            except BaseException:
+                self._rollback(txn)
+                raise
+            finally:
+                self._txn = None
+            if txn.records:
+                self._commit(txn.records[0] if len(txn.records) == 1 else {"op": "batch", "records": txn.records})
+        if txn.archived:
+            with self._io_locks(io_locked):
+                self._archive.delete_many(txn.archived)
+            txn.changes.extend((DELETED, task) for task in txn.archived.values())
+        self._drop_deleted_restores(io_locked)
+        if txn.changes and not txn.silent:
+            self._notify(BATCH, txn.changes)
+
+    def add_many(self, tasks: Iterable[Task]) -> List[Task]:
+        """It adds a batch of tasks in one transaction.
+
+        Tasks keep their IDs (so exported tasks can be imported again); a
+        task whose ID already exists replaces the stored one.
+
+        Args:
+            tasks: Tasks to add.
+
+        Returns:
+            The added tasks."""
+        tasks = list(tasks)
+        with self.transaction():
+            self._bulk = True
+            try:
+                for task in tasks:
+                    self._put(task, UPDATED if task.id in self._by_id else ADDED)
+            finally:
+                self._bulk = False
+            for ordering in self._orderings.values():
+                ordering.add_many(tasks)
+            self._projects.add_many(tasks)
+            self._deadlines.schedule_many(tasks)
+        return tasks
+
+    def delete_many(self, task_ids: Iterable[str]) -> int:
+        """It deletes a batch of tasks in one transaction.
+
+        Archived tasks are deleted from the archive too (when the
+        outermost transaction commits).
+
+        Args:
+            task_ids: IDs of the tasks to delete (unknown IDs are ignored).
+
+        Returns:
+            Number of tasks deleted."""
+        deleted, missing = [], []
+        with self.transaction():
+            self._bulk = True
+            try:
+                for task_id in task_ids:
+                    if self._remove(task_id) is not None:
+                        deleted.append(task_id)
+                    else:
+                        missing.append(task_id)
+            finally:
+                self._bulk = False
+            for ordering in self._orderings.values():
+                ordering.remove_many(deleted)
+            self._projects.remove_many(deleted)
+            if missing:
+                # Deleted from the archive when the outermost transaction commits
+                for task in map(self._archive.get, missing):
+                    if task is not None:
+                        self._txn.archived[task.id] = task
+                        deleted.append(task.id)
+        return len(deleted)
+
+    def update_many(self, tasks: Iterable[Task]) -> int:
+        """It updates a batch of existing tasks in one transaction.
+
+        Args:
+            tasks: Tasks with updated information (unknown IDs are ignored).
+
+        Returns:
+            Number of tasks updated."""
+        count = 0
+        with self.transaction():
+            for task in tasks:
+                if task.id in self._by_id:
+                    self._put(task, UPDATED)
+                    count += 1
+        return count
 
-    def get_tasks(self, status: Optional[Status] = None) -> List[dict]:
-        """It retrieves all tasks, optionally filtered by status.
+    def complete_many(self, task_ids: Iterable[str]) -> int:
+        """It marks a batch of tasks as completed in one transaction.
 
         Args:
-            status: If provided, filters tasks by this status."""
+            task_ids: IDs of the tasks to complete (unknown or already
+                completed tasks are left alone).
+
+        Returns:
+            Number of tasks completed."""
+        with self.transaction():
+            completed = []
+            for task_id in task_ids:
+                stored = self._by_id.get(task_id)
+                if stored is not None and not stored.is_completed:
+                    # Stored tasks are replaced, never modified in place
+                    task = replace(stored)
+                    task.mark_completed()
+                    completed.append(task)
+            return self.update_many(completed)
+
+    def archive_completed(self, older_than: float) -> int:
+        """It moves tasks completed more than older_than seconds ago to the archive.
+
+        The archive append is on disk before the tasks leave the store, so a
+        crash in between leaves a task in both places (the store's copy wins).
+        Subscribers get one RELOADED notification.
+
+        Args:
+            older_than: Minimum age, in seconds since completion.
+
+        Returns:
+            Number of tasks archived."""
+        cutoff = now() - older_than
+        with self._io_lock, self._file_lock, self._lock:
+            old = []
+            # Oldest completion first: stop at the first task inside the cutoff
+            for task_id in self._orderings["completed_at"].ids(Status.COMPLETED, descending=False):
+                task = self._by_id[task_id]
+                if (task.completed_at or 0) >= cutoff:
+                    break
+                old.append(task)
+            if not old:
+                return 0
+            self._archive.put_many(old)
+            # Restored tasks archived again: their new archive entry is the one to keep
+            archived = {task.id for task in old}
+            self._archive_pending = [task_id for task_id in self._archive_pending if task_id not in archived]
+            # The I/O locks are held: the transaction must not take them again
+            with self._transaction(io_locked=True):
+                self._txn.silent = True
+                self.delete_many(task.id for task in old)
+        self._notify(RELOADED)
+        return len(old)
+
+    def get_task(self, task_id: str, include_archived: bool = False) -> Optional[Task]:
+        """It retrieves a single task by its ID.
+
+        Args:
+            task_id: Unique identifier of the task.
+            include_archived: Also look in the archive (loads it on first use).
+
+        Returns:
+            The task, or None if no task has that ID."""
+        task = self._by_id.get(task_id)
+        if task is None and include_archived:
+            task = self._archive.get(task_id)
+        return task
+
+    @profiler.timed("TaskDatabase.get_tasks")
+    def get_tasks(self, status: Optional[Status] = None, priority: Optional[Priority] = None,
+                  include_archived: bool = False) -> List[Task]:
+        """It retrieves all tasks, optionally filtered by status and/or priority.
+
+        Args:
+            status: If provided, filters tasks by this status.
+            priority: If provided, filters tasks by this priority.
+            include_archived: Also return archived tasks (loads the archive on first use)."""
+        tasks = self._get_active_tasks(status, priority)
+        if include_archived and status in (None, Status.COMPLETED):
+            tasks += [task for task in self._archived_tasks()
+                      if (priority is None or task.priority == priority) and task.id not in self._by_id]
+        return tasks
+
+    def changes_since(self, position: Optional[str]) -> Tuple[List[str], str]:
+        """It lists the IDs of tasks changed or deleted, by any process, since a feed position.
+
+        Needs change_feed=True. Only changes already written are listed, so
+        call flush() first to include this process's latest ones.
+
+        Args:
+            position: From a previous call, or None for just the current end.
+
+        Returns:
+            The IDs (a deleted task is simply missing from the store) and the new position."""
+        if self._feed is None:
+            raise RuntimeError("The change feed is disabled (open the database with change_feed=True)")
+        with self._io_lock, self._file_lock:
+            return self._feed.read(position)
+
+    def trim_changes(self, position: str) -> str:
+        """It empties the change feed if nothing changed after position. Returns the position to keep."""
+        if self._feed is None:
+            return position
+        with self._io_lock, self._file_lock:
+            return self._feed.trim(position)
+
+    def next_deadline(self) -> Optional[int]:
+        """Epoch seconds of the earliest due date or reminder of a pending task, or None."""
+        with self._lock:
+            return self._deadlines.next_deadline()
+
+    def pop_due(self, at: Optional[int] = None) -> List[Tuple[str, Task]]:
+        """It hands out the due dates and reminders reached by the given time.
+
+        Each one is handed out once (see src.utils.scheduler).
+
+        Args:
+            at: Epoch seconds (defaults to now).
+
+        Returns:
+            (kind, task) pairs, kind being scheduler.DUE or scheduler.REMIND."""
+        with self._lock:
+            return [(kind, self._by_id[task_id]) for kind, task_id in self._deadlines.pop_due(at or now())]
+
+    def due_soon(self, within: float, at: Optional[int] = None) -> List[Task]:
+        """It lists pending tasks due within the given number of seconds, overdue ones included.
+
+        Read from the due date ordering: it stops at the first task due later.
+
+        Returns:
+            The tasks, earliest due date first."""
+        cutoff = (at or now()) + within
+        tasks = []
+        with self._lock:
+            for task_id in self._orderings["due_at"].ids(Status.PENDING, descending=False):
+                task = self._by_id[task_id]
+                if task.due_at is None or task.due_at > cutoff:
+                    break
+                tasks.append(task)
+        return tasks
+
+    def _get_active_tasks(self, status: Optional[Status], priority: Optional[Priority]) -> List[Task]:
+        status_bucket = self._by_status.get(status, {}) if status is not None else None
+        priority_bucket = self._by_priority.get(priority, {}) if priority is not None else None
+        if status_bucket is not None and priority_bucket is not None:
+            # Walk the smaller bucket and probe the other one
+            small, large = sorted((status_bucket, priority_bucket), key=len)
+            return [task for task_id, task in small.items() if task_id in large]
+        if status_bucket is not None:
+            return list(status_bucket.values())
+        if priority_bucket is not None:
+            return list(priority_bucket.values())
+        return self.tasks
+
+    @profiler.timed("TaskDatabase.query")
+    def query(self, status: Optional[Status] = None, priority: Optional[Priority] = None,
+              order_by: str = "created_at", descending: bool = True,
+              offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+              include_archived: bool = False, project: Optional[str] = None,
+              tag: Optional[str] = None) -> Iterator[Task]:
+        """It lazily iterates tasks in a pre-sorted order.
+
+        A project or tag view in creation order reads only that project's
+        (and subprojects') or tag's own index.
+
+        Args:
+            status: If provided, filters tasks by this status.
+            priority: If provided, filters tasks by this priority.
+            order_by: "created_at", "priority" or "completed_at".
+            descending: Largest values first (newest first by default).
+            offset: Number of matching tasks to skip.
+            limit: Maximum number of tasks to return (None for all).
+            cursor: Resume after the task given by src.utils.ordering.cursor_for.
+            include_archived: Merge in archived tasks (loads the archive on first use).
+            project: If provided, only tasks of this project or its subprojects.
+            tag: If provided, only tasks with this tag.
+
+        Returns:
+            An iterator; consume it before mutating the database."""
+        after = decode_cursor(cursor) if cursor else None
+        grouped = project is not None or tag is not None
+        if grouped and order_by == "created_at":
+            ids = self._projects.ids(project, tag, status, descending, after)
+            tasks = (self._by_id[task_id] for task_id in ids)
+        else:
+            ids = self._orderings[order_by].ids(status, descending, after)
+            tasks = (self._by_id[task_id] for task_id in ids)
+            if grouped:
+                tasks = (task for task in tasks if self._in_group(task, project, tag))
+        if include_archived and status in (None, Status.COMPLETED):
+            archived = self._archive.load()
+            archived_tasks = (archived[task_id]
+                              for task_id in self._archive.ordering(order_by).ids(status, descending, after)
+                              if task_id not in self._by_id)
+            if grouped:
+                archived_tasks = (task for task in archived_tasks if self._in_group(task, project, tag))
+            # Both streams are already sorted by the same key
+            tasks = heapq.merge(tasks, archived_tasks, key=SORT_KEYS[order_by], reverse=descending)
+        if priority is not None:
+            tasks = (task for task in tasks if task.priority == priority)
+        return islice(tasks, offset, None if limit is None else offset + limit)
+
+    def count(self, status: Optional[Status] = None, priority: Optional[Priority] = None,
+              include_archived: bool = False, project: Optional[str] = None,
+              tag: Optional[str] = None) -> int:
+        """It counts the tasks query() yields with the same filters.
+
+        Read from the kept counts without scanning tasks, except for a tag
+        combined with a priority or project, and for archived tasks (counted
+        in the loaded archive).
+
+        Returns:
+            Number of matching tasks."""
+        with self._lock:
+            if tag is None:
+                total = self._projects.count(project, status, priority)
+            elif priority is None and project is None:
+                total = self._projects.tag_count(tag, status)
+            else:
+                total = sum(1 for _ in self.query(status, priority, project=project, tag=tag))
+            if include_archived and status in (None, Status.COMPLETED):
+                total += sum(1 for task in self._archive.load().values()
+                             if task.id not in self._by_id and (status is None or task.status == status)
+                             and (priority is None or task.priority == priority)
+                             and self._in_group(task, project, tag))
+            return total
+
+    @profiler.timed("TaskDatabase.search")
+    def search(self, query: str, status: Optional[Status] = None, include_archived: bool = False) -> List[Task]:
+        """It finds tasks whose title or description match the query.
+
+        Matching ignores case and accents; the last word of the query
+        matches as a prefix.
+
+        Args:
+            query: Words to look for.
+            status: If provided, only tasks with this status are returned.
+            include_archived: Also search archived tasks (loads the archive on first use)."""
+        if self._search is None:
+            self._search = SearchIndex()
+            for task in self._by_id.values():
+                self._search.add(task)
+        tasks = [self._by_id[task_id] for task_id in self._search.search(query)]
+        if include_archived and status in (None, Status.COMPLETED):
+            archived = self._archive.load()
+            tasks += [archived[task_id] for task_id in self._archive.search(query) if task_id not in self._by_id]
         if status is not None:
-            target = status.value
-            return [task for task in self.tasks if task.get("status") == target]
-        return self.tasks.copy()
-    
-    def _task_to_dict(self, task: dict) -> dict:
-        """Convert task dict to dictionary (JSON serializable)."""
-        # tasks are stored as dicts already; return a shallow copy to avoid mutation
-        return dict(task)
-    
+            return [task for task in tasks if task.status == status]
+        return tasks
+
+    def project_counts(self) -> Dict[str, Tuple[int, int]]:
+        """(pending, completed) tasks per project path, subprojects included.
+
+        Kept up to date on every change (archived tasks are not counted);
+        the "" entry counts every task.
+
+        Returns:
+            Counts by project path; projects exist while they have tasks."""
+        with self._lock:
+            return self._projects.project_counts()
+
+    def priority_counts(self, project: Optional[str] = None) -> Dict[Priority, Tuple[int, int]]:
+        """(pending, completed) tasks per priority, in a project (subprojects included) or in all."""
+        with self._lock:
+            return self._projects.priority_counts(project)
+
+    def tag_counts(self) -> Dict[str, Tuple[int, int]]:
+        """(pending, completed) tasks per tag."""
+        with self._lock:
+            return self._projects.tag_counts()
+
+    @staticmethod
+    def _in_group(task: Task, project: Optional[str], tag: Optional[str]) -> bool:
+        return (project is None or in_project(task, project)) and (tag is None or tag in task.tags)
+
+    def _archived_tasks(self) -> List[Task]:
+        return list(self._archive.load().values())
     
-    def _dict_to_task(self, data: dict) -> dict:
-        """Normalize loaded dictionary to task dict."""
-        # Ensure expected keys exist and return as-is (saved format uses simple primitives)
-        return {
-            "id": data.get("id"),
-            "title": data.get("title"),
-            "description": data.get("description"),
-            "priority": data.get("priority"),
-            "status": data.get("status"),
-            "created_at": data.get("created_at"),
-            "completed_at": data.get("completed_at")
-        }
\ No newline at end of file
+    def _put(self, task: Task, action: str):
+        """It stores a task (new or replacing one), stamps its version and logs the change."""
+        existing = self._by_id.get(task.id)
+        self._remember(task.id, existing)
+        self._dirty.setdefault(task.id, existing.version if existing is not None else None)
+        task.version = max(task.version, existing.version if existing is not None else 0) + 1
+        if existing is not None:
+            self._unindex_buckets(existing)
+        self._index(task)
+        self._log({"op": "put", "task": task.to_dict()}, action, task)
+
+    def _remove(self, task_id: str) -> Optional[Task]:
+        """It removes a task from every index and logs the change."""
+        task = self._drop(task_id)
+        if task is None:
+            return None
+        self._remember(task_id, task)
+        self._dirty.setdefault(task_id, task.version)
+        self._log({"op": "delete", "id": task_id}, DELETED, task)
+        return task
+
+    def _drop(self, task_id: str) -> Optional[Task]:
+        """It removes a task from every index (orderings too unless in bulk)."""
+        task = self._by_id.pop(task_id, None)
+        if task is None:
+            return None
+        self._unindex_buckets(task)
+        self._deadlines.unschedule(task_id)
+        if self._search is not None:
+            self._search.remove(task_id)
+        if not self._bulk:
+            for ordering in self._orderings.values():
+                ordering.remove(task_id)
+            self._projects.remove(task_id)
+        return task
+
+    def _remember(self, task_id: str, previous: Optional[Task]):
+        """It keeps the state a transaction found a task in (first touch only)."""
+        if self._txn is not None and task_id not in self._txn.before:
+            self._txn.before[task_id] = previous
+
+    def _log(self, record: dict, action: str, task: Task):
+        """It commits a change now, or holds it until the transaction ends."""
+        if self._txn is None:
+            self._commit(record)
+        else:
+            self._txn.records.append(record)
+            self._txn.changes.append((action, task))
+
+    def _rollback(self, txn: _Transaction):
+        """It puts every task touched by a transaction back as it was."""
+        for task_id, previous in txn.before.items():
+            self._drop(task_id)
+            if previous is not None:
+                self._index(previous)
+        # Tasks it brought back from the archive stay archived
+        self._archive_pending = [task_id for task_id in self._archive_pending
+                                 if txn.before.get(task_id, True) is not None]
+        self._dirty = txn.dirty
+
+    def _index(self, task: Task):
+        """It adds (or replaces) a task in the id index and its buckets."""
+        self._by_id[task.id] = task
+        self._by_status.setdefault(task.status, {})[task.id] = task
+        self._by_priority.setdefault(task.priority, {})[task.id] = task
+        if self._search is not None:
+            self._search.add(task)
+        if not self._bulk:
+            for ordering in self._orderings.values():
+                ordering.add(task)
+            self._projects.add(task)
+            self._deadlines.schedule(task)
+
+    def _unindex_buckets(self, task: Task):
+        """It removes a task from the status and priority buckets.
+
+        Every bucket is checked (there are only a handful), so this also works
+        when the stored object was modified in place."""
+        for bucket in self._by_status.values():
+            bucket.pop(task.id, None)
+        for bucket in self._by_priority.values():
+            bucket.pop(task.id, None)
+
+    def _rebuild_indexes(self, tasks: Iterable[Task]):
+        """It rebuilds every index from scratch (used on load)."""
+        self._by_id = {}
+        self._by_status = {}
+        self._by_priority = {}
+        self._search = None
+        self._bulk = True
+        try:
+            for task in tasks:
+                self._index(task)
+        finally:
+            self._bulk = False
+        # One sort per ordering instead of one insertion per task
+        for ordering in self._orderings.values():
+            ordering.rebuild(self._by_id.values())
+        self._projects.rebuild(self._by_id.values())
+        self._deadlines.rebuild(self._by_id.values())
+
+    def _commit(self, record: dict):
+        """It queues a single mutation for the background writer."""
+        if self._wal is not None:
+            self._pending_records.append(record)
+        self._writer.schedule()
+
+    @profiler.timed("TaskDatabase.persist")
+    def _persist(self):
+        """Writer thread: persists everything queued since the last write."""
+        # Never write a snapshot of a half-loaded store
+        self._loaded.wait()
+        try:
+            with self._io_lock, self._file_lock:
+                self._sync()
+                if self._wal is None:
+                    self._write_locked()
+                else:
+                    self._append_locked()
+                self._drop_restored_from_archive()
+            if self._wal is not None and self._wal.record_count >= self.compact_threshold:
+                self._compact()
+        except Exception:
+            self._write_failed = True
+            raise
+        self._write_failed = False
+
+    def _write_locked(self):
+        """It writes the whole store as the snapshot (file lock held)."""
+        with self._lock:
+            tasks = list(self._by_id.values())
+            dirty, self._dirty = self._dirty, {}
+        try:
+            self._feed_changes(dirty)
+            self._write_snapshot(tasks)
+        except Exception:
+            with self._lock:
+                self._restore_dirty(dirty)
+            raise
+        self._disk_state = self._snapshot_state()
+
+    def _append_locked(self):
+        """It appends the pending log records (file lock held)."""
+        with self._lock:
+            records, self._pending_records = self._pending_records, []
+            dirty, self._dirty = self._dirty, {}
+        try:
+            self._feed_changes(dirty)
+            self._wal.append_many(records)
+        except OSError:
+            # Put the records back so the next write retries them
+            with self._lock:
+                self._pending_records[:0] = records
+                self._restore_dirty(dirty)
+            raise
+        self._wal_offset = self._wal.size()
+
+    def _feed_changes(self, dirty: Dict[str, Optional[int]]):
+        """It names the tasks about to be written in the change feed (file lock held)."""
+        if self._feed is not None:
+            self._feed.append(dirty)
+
+    def _drop_restored_from_archive(self):
+        """It deletes the archive entries of restored tasks (store already on disk).
+
+        That includes tasks deleted since: their archived copy must not come back."""
+        with self._lock:
+            task_ids, self._archive_pending = self._archive_pending, []
+        if task_ids:
+            self._archive.delete_many(task_ids)
+
+    def _drop_deleted_restores(self, io_locked: bool = False):
+        """It deletes the archive entries of restored tasks that were deleted again.
+
+        Done right away (not by the next write), or archive views would show
+        the archived copy of a task that was just deleted.
+
+        Args:
+            io_locked: The caller already holds _io_lock and _file_lock."""
+        with self._lock:
+            if not self._archive_pending:
+                return
+            task_ids = [task_id for task_id in self._archive_pending if task_id not in self._by_id]
+            self._archive_pending = [task_id for task_id in self._archive_pending if task_id in self._by_id]
+        if task_ids:
+            with self._io_locks(io_locked):
+                self._archive.delete_many(task_ids)
+
+    @contextmanager
+    def _io_locks(self, held: bool = False):
+        """It takes _io_lock and _file_lock, unless the caller already holds them."""
+        if held:
+            yield
+            return
+        with self._io_lock, self._file_lock:
+            yield
+
+    def _restore_dirty(self, dirty: Dict[str, Optional[int]]):
+        """It puts back the bookkeeping of a failed write (older entries win)."""
+        for task_id, version in self._dirty.items():
+            dirty.setdefault(task_id, version)
+        self._dirty = dirty
+
+    def _sync(self):
+        """It merges what other processes wrote since we last read or wrote the store.
+
+        Called with the I/O lock and the file lock held. If the snapshot was
+        replaced (or the log compacted) every task is compared; otherwise only
+        the log records appended since our last read are applied."""
+        state = self._snapshot_state()
+        wal_size = self._wal.size() if self._wal is not None else 0
+        if state != self._disk_state or wal_size < self._wal_offset:
+            self._merge_external(self._read_disk(), full=True)
+        elif wal_size > self._wal_offset:
+            changes: Dict[str, Optional[Task]] = {}
+            for record in _expand(self._wal.read_from(self._wal_offset)):
+                if record.get("op") == "put":
+                    task = Task.from_dict(record["task"])
+                    changes[task.id] = task
+                elif record.get("op") == "delete":
+                    changes[record.get("id")] = None
+            self._merge_external(changes, full=False)
+        else:
+            return
+        self._disk_state = state
+        if self._wal is not None:
+            self._wal_offset = self._wal.size()
+
+    def _read_disk(self) -> Dict[str, Task]:
+        """It reads the stored state (snapshot plus log) without touching the indexes."""
+        disk = {}
+        if self.db_path.exists():
+            for task in self._read_snapshot():
+                disk[task.id] = task
+        if self._wal is not None:
+            for record in _expand(self._wal.replay()):
+                if record.get("op") == "put":
+                    task = Task.from_dict(record["task"])
+                    disk[task.id] = task
+                elif record.get("op") == "delete":
+                    disk.pop(record.get("id"), None)
+        return disk
+
+    def _merge_external(self, changes: Dict[str, Optional[Task]], full: bool):
+        """It applies stored task states (None = deleted) written by other processes.
+
+        Tasks with unsaved local changes keep them unless the stored version
+        moved on since they were changed here; then the other process's change
+        wins and the local one is dropped.
+
+        Args:
+            changes: Stored state of each task that may have changed.
+            full: changes holds the whole store, so tasks missing from it were deleted."""
+        applied, conflicts = [], []
+        with self._lock:
+            if full:
+                for task_id in self._by_id:
+                    if task_id not in changes:
+                        changes[task_id] = None
+            for task_id, stored in changes.items():
+                if task_id in self._dirty:
+                    if (stored.version if stored is not None else None) == self._dirty[task_id]:
+                        continue  # Nobody else touched it: the local change stands
+                    del self._dirty[task_id]
+                    conflicts.append(task_id)
+                current = self._by_id.get(task_id)
+                if stored is None:
+                    if current is not None:
+                        self._drop(task_id)
+                        applied.append((DELETED, current))
+                elif stored != current:
+                    if current is not None:
+                        self._unindex_buckets(current)
+                    self._index(stored)
+                    applied.append((UPDATED if current is not None else ADDED, stored))
+            if conflicts and self._wal is not None:
+                self._drop_records(set(conflicts))
+            if applied and self._subscribers():
+                self._external.extend(applied)
+        if conflicts:
+            print(f"Conflict: {len(conflicts)} task(s) were also changed by another process; kept its version")
+
+    def _drop_records(self, task_ids: set):
+        """It discards pending log records of the given tasks."""
+        kept = []
+        for record in self._pending_records:
+            if record.get("op") == "batch":
+                inner = [r for r in record["records"] if _record_id(r) not in task_ids]
+                if inner:
+                    kept.append({"op": "batch", "records": inner})
+            elif _record_id(record) not in task_ids:
+                kept.append(record)
+        self._pending_records = kept
+
+    def _snapshot_state(self) -> Optional[Tuple]:
+        """Identity of the snapshot file as of now (changes whenever it is replaced)."""
+        try:
+            stat = self.db_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _drain(self, block: bool) -> bool:
+        """It merges loaded batches; returns True while loading continues."""
+        if self._loader is None:
+            return False
+        merged = False
+        while True:
+            try:
+                batch = self._load_queue.get(block=block)
+            except queue.Empty:
+                break
+            if batch is None:
+                self._complete_loading()
+                return False
+            self._merge_loaded(batch)
+            merged = True
+        if merged:
+            self._notify(RELOADED)
+        return True
+
+    def _merge_loaded(self, batch: List[Task]):
+        """It adds a loaded batch, keeping tasks created meanwhile."""
+        with self._lock:
+            new_tasks = [task for task in batch if task.id not in self._by_id]
+            self._bulk = True
+            try:
+                for task in new_tasks:
+                    self._index(task)
+            finally:
+                self._bulk = False
+            for ordering in self._orderings.values():
+                ordering.add_many(new_tasks)
+            self._projects.add_many(new_tasks)
+            self._deadlines.schedule_many(new_tasks)
+
+    def _complete_loading(self):
+        self._loader.join()
+        self._loader = None
+        self._loaded.set()
+        self._notify(RELOADED)
+
+    def _compact(self):
+        """It rotates the log and folds it into a fresh JSON snapshot.
+
+        Pending records are covered by the snapshot, so they are dropped."""
+        with self._io_lock, self._file_lock:
+            self._sync()
+            with self._lock:
+                segment = self._wal.rotate()
+                tasks = list(self._by_id.values())
+                records, self._pending_records = self._pending_records, []
+                dirty, self._dirty = self._dirty, {}
+            try:
+                self._feed_changes(dirty)
+                self._write_snapshot(tasks)
+            except Exception:
+                # The rotated segment is kept and replayed; pending records are retried
+                with self._lock:
+                    self._pending_records[:0] = records
+                    self._restore_dirty(dirty)
+                raise
+            if segment is not None:
+                self._wal.discard_segments(segment)
+            self._disk_state = self._snapshot_state()
+            self._wal_offset = 0
+
+    def _report_error(self, error: Exception):
+        if self.on_error is not None:
+            self.on_error(error)
+        else:
+            print(f"Error saving tasks: {error}")
+
+    def _replay_log(self):
+        """It applies every intact log record on top of the loaded snapshot."""
+        by_id = dict(self._by_id)
+        for record in _expand(self._wal.replay()):
+            op = record.get("op")
+            if op == "put":
+                task = Task.from_dict(record["task"])
+                by_id[task.id] = task
+            elif op == "delete":
+                by_id.pop(record.get("id"), None)
+        self._rebuild_indexes(by_id.values())
+
+    def _set_aside(self, error: Exception):
+        """It moves an unreadable snapshot out of the way, so the next save cannot overwrite it.
+
+        Call with the I/O and file locks held."""
+        corrupt_path = self.db_path.with_name(self.db_path.name + ".corrupt")
+        print(f"Error loading tasks: {error}; the file was kept as {corrupt_path}")
+        try:
+            os.replace(self.db_path, corrupt_path)
+        except OSError as e:
+            print(f"Error keeping the unreadable file: {e}")
+        self._disk_state = self._snapshot_state()
+
+    def _read_snapshot(self, newest_first: bool = False) -> Iterator[Task]:
+        """It yields the tasks stored in the snapshot file.
+
+        JSON is decoded incrementally, so the raw text and a parsed copy of
+        the whole store are never held side by side. A binary snapshot is
+        memory-mapped; with newest_first it is read from the end, so the
+        first tasks shown only touch the last pages of the file."""
+        if self.snapshot_format == "binary":
+            with BinarySnapshot(self.db_path) as snapshot:
+                positions = range(len(snapshot) - 1, -1, -1) if newest_first else range(len(snapshot))
+                for position in positions:
+                    yield snapshot.task(position)
+            return
+        for task_dict in iter_json_array(self.db_path):
+            yield Task.from_dict(task_dict)
+
+    def _write_snapshot(self, tasks: List[Task]):
+        """It writes the task list atomically (temp file + fsync + rename)."""
+        if self.snapshot_format == "binary":
+            write_binary(self.db_path, tasks)
+        else:
+            data = [task.to_dict() for task in tasks]
+            tmp_path = self.db_path.with_name(self.db_path.name + ".tmp")
+            with tmp_path.open('w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.db_path)
+        if profiler.enabled:
+            profiler.count("saves")
+            profiler.count("bytes.written", self.db_path.stat().st_size)
@@ -0,0 +1,45 @@
+from typing import Callable, List, Optional
+from src.models.task import Task
+
+# Change actions sent to subscribers
+ADDED    = "added"
+UPDATED  = "updated"
+DELETED  = "deleted"
+RELOADED = "reloaded"
+BATCH    = "batch"
+
+
+class ChangeNotifier:
+    """It lets views subscribe to task changes instead of re-reading the store.
+
+    Subscribers are called as callback(action, task) where action is one of
+    ADDED, UPDATED, DELETED or RELOADED (task is None for RELOADED).
+    A committed transaction sends a single BATCH call whose second argument
+    is the list of (action, task) pairs it made, in order."""
+
+    def subscribe(self, callback: Callable[[str, Optional[Task]], None]):
+        """It registers a callback for task changes.
+
+        Args:
+            callback: Function called with (action, task) after each change."""
+        self._subscribers().append(callback)
+
+    def unsubscribe(self, callback: Callable[[str, Optional[Task]], None]):
+        """It removes a previously registered callback."""
+        subscribers = self._subscribers()
+        if callback in subscribers:
+            subscribers.remove(callback)
+
+    def _notify(self, action: str, task: Optional[Task] = None):
+        """It calls every subscriber; a failing subscriber does not stop the others."""
+        for callback in list(self._subscribers()):
+            try:
+                callback(action, task)
+            except Exception as e:
+                print(f"Error in change subscriber: {e}")
+
+    def _subscribers(self) -> List[Callable]:
+        # Created lazily so subclasses don't have to call a base __init__
+        if not hasattr(self, "_change_subscribers"):
+            self._change_subscribers = []
+        return self._change_subscribers
@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """It holds an advisory, exclusive lock on a side file (e.g. tasks.json.lock).
+
+    Processes sharing a task store take it around every read-merge-write,
+    so they take turns instead of overwriting each other. The lock is only
+    respected by cooperating processes. It is released automatically if
+    the process dies.
+
+    Not reentrant and not thread-safe: TaskDatabase only takes it while
+    holding its own I/O lock.
+
+    Usage:
+        with FileLock("tasks.json.lock"):
+            ...
+
+    Attributes:
+        path: Path to the lock file (created on first use, never deleted)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd = None
+
+    def acquire(self):
+        """It blocks until the lock is held by this process."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                while True:
+                    try:
+                        # LK_LOCK retries for ~10 seconds before giving up; keep waiting
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def release(self):
+        """It releases the lock."""
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
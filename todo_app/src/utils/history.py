@@ -0,0 +1,196 @@
+import json
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+from src.models.task import Task, same_content
+
+# A step is (label, changes); each change is a [before, after] pair of
+# task dicts, None where the task did not exist. Undo writes the befores,
+# redo the afters, so a step costs the tasks it touched, never a copy of
+# the whole store.
+Step = Tuple[str, List[list]]
+
+
+class UndoHistory:
+    """It keeps undo/redo stacks of task changes, persisted in a bounded journal.
+
+    The journal is a JSON Lines file of events: {"do": label, "changes": ...}
+    pushes a step, {"undo": 1} and {"redo": 1} move the top step between the
+    stacks. Replaying it rebuilds both stacks, so history survives restarts.
+    Only the newest `limit` steps are kept; the journal is rewritten with
+    just those once it has grown past three times that. It is read on
+    first use, not at startup.
+
+    Undo and redo apply a whole step in one transaction: one save and one
+    BATCH notification however many tasks it touched. A task changed since
+    the step (another window, sync) is left alone and reported as a conflict.
+
+    Usage:
+        history = UndoHistory(db, "tasks.json.history")
+        with history.step("Excluir 3 tarefa(s)", task_ids):
+            db.delete_many(task_ids)
+        history.undo()
+
+    Attributes:
+        path: Path to the journal file.
+        limit: Maximum number of steps kept."""
+
+    def __init__(self, db, path: Path, limit: int = 100):
+        self.db = db
+        self.path = Path(path)
+        self.limit = limit
+        self._undo: Optional[deque] = None  # Loaded from the journal on first use
+        self._redo: List[Step] = []
+        self._events = 0  # Journal lines
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._stacks()[0])
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._stacks()[1])
+
+    def record(self, label: str, changes: Iterable[Tuple[Optional[Task], Optional[Task]]]):
+        """It pushes a step made of (before, after) task pairs and drops the redo stack.
+
+        Pairs whose task did not change are left out; nothing is pushed if
+        none are left.
+
+        Args:
+            label: What the user did, shown by undo/redo.
+            changes: (before, after) tasks, None where the task did not exist."""
+        changes = [[before, after] for before, after in
+                   ((task.to_dict() if task is not None else None for task in pair) for pair in changes)
+                   if not same_content(before, after)]
+        if not changes:
+            return
+        undo, redo = self._stacks()
+        undo.append((label, changes))
+        redo.clear()
+        self._write({"do": label, "changes": changes})
+
+    @contextmanager
+    def step(self, label: str, task_ids: Iterable[str]):
+        """It records the changes the block makes to the given tasks as one step.
+
+        Args:
+            label: What the user did, shown by undo/redo.
+            task_ids: IDs of every task the block may change."""
+        before, archived = {}, set()
+        for task_id in task_ids:
+            task = before[task_id] = self.db.get_task(task_id)
+            if task is None:
+                # Not in the live store: it may be archived
+                task = before[task_id] = self.db.get_task(task_id, include_archived=True)
+                if task is not None:
+                    archived.add(task_id)
+        yield
+        # Tasks the block did not bring back are still archived, not deleted
+        self.record(label, ((task, self.db.get_task(task_id, include_archived=task_id in archived))
+                            for task_id, task in before.items()))
+
+    def undo(self) -> Optional[Tuple[str, int]]:
+        """It reverts the newest step.
+
+        Returns:
+            The step's label and how many tasks were left alone because they
+            changed since, or None if there is nothing to undo."""
+        undo, redo = self._stacks()
+        if not undo:
+            return None
+        label, changes = undo.pop()
+        redo.append((label, changes))
+        self._write({"undo": 1})
+        return label, self._apply(changes, 0)
+
+    def redo(self) -> Optional[Tuple[str, int]]:
+        """It re-applies the newest undone step (same return as undo)."""
+        undo, redo = self._stacks()
+        if not redo:
+            return None
+        label, changes = redo.pop()
+        undo.append((label, changes))
+        self._write({"redo": 1})
+        return label, self._apply(changes, 1)
+
+    def _apply(self, changes: List[list], side: int) -> int:
+        """It writes one side of every change (0: before, 1: after) in one transaction."""
+        added, updated, deleted, conflicts = [], [], [], 0
+        for change in changes:
+            target, expected = change[side], change[1 - side]
+            task_id = (target or expected)["id"]
+            current = self.db.get_task(task_id)
+            if current is None:
+                current = self.db.get_task(task_id, include_archived=True)
+            if not same_content(current.to_dict() if current is not None else None, expected):
+                conflicts += 1
+            elif target is None:
+                deleted.append(task_id)
+            elif current is None:
+                added.append(Task.from_dict(target))
+            else:
+                task = Task.from_dict(target)
+                # Continue from the stored version so other processes see a change
+                task.version = current.version
+                updated.append(task)
+        if added or updated or deleted:
+            with self.db.transaction():
+                self.db.add_many(added)
+                for task in updated:
+                    self.db.update_task(task)  # Also brings archived tasks back
+                self.db.delete_many(deleted)
+        if conflicts:
+            print(f"Conflict: {conflicts} task(s) changed since; left them as they are")
+        return conflicts
+
+    def _stacks(self) -> Tuple[deque, List[Step]]:
+        if self._undo is None:
+            self._undo = deque(maxlen=self.limit)
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            self._replay(json.loads(line))
+                        except (ValueError, KeyError, TypeError):
+                            continue  # Torn last line after a crash
+                        self._events += 1
+            except FileNotFoundError:
+                pass
+        return self._undo, self._redo
+
+    def _replay(self, event: dict):
+        if "do" in event:
+            self._undo.append((event["do"], event["changes"]))
+            self._redo.clear()
+        elif "undo" in event and self._undo:
+            self._redo.append(self._undo.pop())
+        elif "redo" in event and self._redo:
+            self._undo.append(self._redo.pop())
+
+    def _write(self, event: dict):
+        """It appends an event, or rewrites the journal with the kept steps once it has grown."""
+        # A rewrite leaves at most 2 * limit lines (every step undone)
+        if self._events >= 3 * self.limit:
+            self._rewrite()
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._events += 1
+
+    def _rewrite(self):
+        # Undone steps go back on top of the undo stack, then are undone
+        # again. Replaying pushes every step through a deque of `limit`, so
+        # keep at most that many in total (dropping the oldest undo steps)
+        del self._redo[:-self.limit]
+        while self._undo and len(self._undo) + len(self._redo) > self.limit:
+            self._undo.popleft()
+        steps = list(self._undo) + self._redo[::-1]
+        lines = [json.dumps({"do": label, "changes": changes}, ensure_ascii=False) + "\n" for label, changes in steps]
+        lines += ['{"undo": 1}\n'] * len(self._redo)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        tmp_path.replace(self.path)
+        self._events = len(lines)
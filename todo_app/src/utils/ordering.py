@@ -0,0 +1,235 @@
+import heapq
+import json
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.models.task import Status, Task
+
+# Sort keys supported by the query API. Every key ends with the task ID so
+# orderings are total and cursors are unambiguous.
+SORT_KEYS: Dict[str, Callable[[Task], Tuple]] = {
+    "created_at":   lambda task: (task.created_at, task.id),
+    "priority":     lambda task: (task.priority.value, task.created_at, task.id),
+    "completed_at": lambda task: (task.completed_at or 0, task.id),
+    # Tasks without a due date sort after every dated one
+    "due_at":       lambda task: (task.due_at is None, task.due_at or 0, task.id),
+}
+
+
+def encode_cursor(key: Tuple) -> str:
+    """Turns a sort key into an opaque cursor string."""
+    return json.dumps(list(key), separators=(",", ":"))
+
+
+def decode_cursor(cursor: str) -> Tuple:
+    """Turns a cursor string back into a sort key."""
+    return tuple(json.loads(cursor))
+
+
+def cursor_for(task: Task, order_by: str = "created_at") -> str:
+    """Cursor that resumes a query right after the given task."""
+    return encode_cursor(SORT_KEYS[order_by](task))
+
+
+class SortedIndex:
+    """It keeps task IDs pre-sorted by one sort key, partitioned by status.
+
+    Each status has its own sorted list of keys (ending with the ID), so a filtered
+    view reads one list and the unfiltered view lazily merges them. Pages
+    start with a binary search, never with a sort."""
+
+    def __init__(self, order_by: str):
+        """It creates an empty index.
+
+        Args:
+            order_by: One of the names in SORT_KEYS."""
+        self.order_by = order_by
+        self.key = SORT_KEYS[order_by]
+        self._entries: Dict[Status, List[Tuple]] = {status: [] for status in Status}
+        self._keys: Dict[str, Tuple[Status, Tuple]] = {}
+
+    def add(self, task: Task):
+        """It inserts a task (replacing its previous position, if any)."""
+        self.remove(task.id)
+        key = self.key(task)
+        insort(self._entries[task.status], key)
+        self._keys[task.id] = (task.status, key)
+
+    def remove(self, task_id: str):
+        """It removes a task from the index."""
+        entry = self._keys.pop(task_id, None)
+        if entry is None:
+            return
+        status, key = entry
+        entries = self._entries[status]
+        del entries[bisect_left(entries, key)]
+
+    def add_many(self, tasks: Iterable[Task]):
+        """It inserts a batch of new tasks with one sort per touched status.
+
+        Timsort merges the appended run with the sorted prefix in linear time."""
+        touched = set()
+        for task in tasks:
+            self.remove(task.id)
+            key = self.key(task)
+            self._entries[task.status].append(key)
+            self._keys[task.id] = (task.status, key)
+            touched.add(task.status)
+        for status in touched:
+            self._entries[status].sort()
+
+    def remove_many(self, task_ids: Iterable[str]):
+        """It removes a batch of tasks with one pass per touched status."""
+        removed: Dict[Status, set] = {}
+        for task_id in task_ids:
+            entry = self._keys.pop(task_id, None)
+            if entry is not None:
+                removed.setdefault(entry[0], set()).add(task_id)
+        for status, ids in removed.items():
+            self._entries[status] = [key for key in self._entries[status] if key[-1] not in ids]
+
+    def rebuild(self, tasks: Iterable[Task]):
+        """It rebuilds the index with one sort per status (used on load)."""
+        self._entries = {status: [] for status in Status}
+        self._keys = {}
+        for task in tasks:
+            key = self.key(task)
+            self._entries[task.status].append(key)
+            self._keys[task.id] = (task.status, key)
+        for entries in self._entries.values():
+            entries.sort()
+
+    def key_of(self, task_id: str) -> Optional[Tuple]:
+        entry = self._keys.get(task_id)
+        return entry[1] if entry is not None else None
+
+    def count(self, status: Optional[Status] = None) -> int:
+        """Number of indexed tasks (with the given status)."""
+        if status is None:
+            return len(self._keys)
+        return len(self._entries[status])
+
+    def ids(self, status: Optional[Status] = None, descending: bool = True,
+            after: Optional[Tuple] = None) -> Iterator[str]:
+        """It lazily yields task IDs in order.
+
+        The iterator reads the live index; consume it before mutating the store.
+
+        Args:
+            status: If provided, only IDs of tasks with this status.
+            descending: Largest keys first (newest first for created_at).
+            after: Resume strictly after this key (from a cursor)."""
+        for key in self.keys(status, descending, after):
+            yield key[-1]
+
+    def keys(self, status: Optional[Status] = None, descending: bool = True,
+             after: Optional[Tuple] = None) -> Iterator[Tuple]:
+        """Same as ids() but yields the sort keys (to merge several indexes)."""
+        statuses = [status] if status is not None else list(Status)
+        streams = [self._iter(self._entries[s], descending, after) for s in statuses]
+        if len(streams) == 1:
+            return streams[0]
+        return heapq.merge(*streams, reverse=descending)
+
+    @staticmethod
+    def _iter(entries: List[Tuple], descending: bool, after: Optional[Tuple]) -> Iterator[Tuple]:
+        if descending:
+            index = bisect_left(entries, after) if after is not None else len(entries)
+            while index > 0:
+                index -= 1
+                yield entries[index]
+        else:
+            index = bisect_right(entries, after) if after is not None else 0
+            while index < len(entries):
+                yield entries[index]
+                index += 1
+
+
+class PagedTasks:
+    """Tasks of a sorted query, fetched a page at a time as rows are read.
+
+    It stands in for the list VirtualTaskList shows. The rows read so far
+    (loaded) are a prefix of the query's order; reading past them fetches
+    the next page, resuming after the last loaded task with a cursor, so
+    only the rows scrolled to are ever built. len() is the store's count,
+    so the scrollbar spans every row before any is fetched; it is
+    corrected when a fetch comes back short.
+
+    Rows are inserted and removed within the loaded prefix only: a task
+    that sorts after the last loaded row is left for a later fetch.
+
+    Attributes:
+        loaded: The rows fetched so far, in order.
+        complete: Every row of the query is loaded.
+        on_loaded: Called with each fetched page (set by the list showing the rows)."""
+
+    def __init__(self, fetch: Callable[[Optional[str], int], Iterable[Task]], count: Callable[[], int],
+                 order_by: str, page_size: int = 100):
+        """
+        Args:
+            fetch: fetch(cursor, limit) -> the next tasks after the cursor (None: from the start).
+            count: count() -> how many tasks the query yields now.
+            order_by: SORT_KEYS name of the query's order (for the cursors).
+            page_size: Smallest number of tasks fetched at once."""
+        self.fetch = fetch
+        self.count = count
+        self.order_by = order_by
+        self.page_size = page_size
+        self.loaded: List[Task] = []
+        self.total = count()
+        self.complete = self.total == 0
+        self.on_loaded: Optional[Callable[[List[Task]], None]] = None
+
+    @classmethod
+    def of(cls, tasks: List[Task]) -> "PagedTasks":
+        """Rows that are all in memory already (search results, small views)."""
+        pages = cls(lambda cursor, limit: (), lambda: len(tasks), "created_at")
+        pages.loaded, pages.complete = tasks, True
+        return pages
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __getitem__(self, index: int) -> Task:
+        if index >= len(self.loaded):
+            self.load(index + 1)
+        return self.loaded[index]
+
+    def __setitem__(self, index: int, task: Task):
+        self.loaded[index] = task
+
+    def __iter__(self) -> Iterator[Task]:
+        index = 0
+        while index < len(self.loaded) or self.load(index + 1) > index:
+            yield self.loaded[index]
+            index += 1
+
+    def insert(self, index: int, task: Task):
+        self.loaded.insert(index, task)
+        self.total += 1
+
+    def pop(self, index: int) -> Task:
+        self.total -= 1
+        return self.loaded.pop(index)
+
+    def load(self, count: int) -> int:
+        """It fetches pages until count rows are loaded or the query runs out.
+
+        Returns:
+            How many of the first count rows are loaded."""
+        while len(self.loaded) < count and not self.complete:
+            limit = max(self.page_size, count - len(self.loaded))
+            cursor = cursor_for(self.loaded[-1], self.order_by) if self.loaded else None
+            page = list(self.fetch(cursor, limit))
+            self.loaded.extend(page)
+            if len(page) < limit:
+                self.complete = True
+            if page and self.on_loaded is not None:
+                self.on_loaded(page)
+        self.total = len(self.loaded) if self.complete else max(self.total, len(self.loaded))
+        return min(count, len(self.loaded))
+
+    def recount(self):
+        """It re-reads the total after a change that may have touched rows not loaded yet."""
+        if not self.complete:
+            self.total = max(self.count(), len(self.loaded))
+
@@ -0,0 +1,179 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from src.config import settings
+
+
+class _NullSpan:
+    """Shared do-nothing span returned while profiling is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class Profiler:
+    """It records timing spans and counters for the hot paths (opt-in).
+
+    While disabled, span() returns a shared no-op context manager and
+    count() returns right away, so instrumented code costs one attribute
+    check. Finished spans are kept in a bounded ring buffer (for trace
+    export) and folded into per-name aggregates (for the debug overlay).
+
+    Usage:
+        with profiler.span("TaskDatabase.save_tasks"):
+            ...
+        profiler.count("bytes.written", size)
+
+    Attributes:
+        enabled: Whether spans and counters are recorded.
+        max_events: Number of finished spans kept for export."""
+
+    def __init__(self, enabled: bool = False, max_events: int = 100_000):
+        self.enabled = enabled
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """It drops every recorded span and counter."""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._events = deque(maxlen=self.max_events)   # (name, start, end, thread id)
+            self._counter_events = deque(maxlen=self.max_events)  # (name, time, total)
+            self._stats: Dict[str, list] = {}              # name -> [count, total s, max s]
+            self._counters: Dict[str, int] = {}
+            self._threads: Dict[int, str] = {}
+
+    def span(self, name: str):
+        """Context manager timing the enclosed block under the given name."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """Decorator wrapping every call of a function in a span.
+
+        Args:
+            name: Span name (defaults to the function's qualified name)."""
+        def decorator(fn):
+            span_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(self, span_name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, value: int = 1):
+        """It adds value to a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            total = self._counters[name] = self._counters.get(name, 0) + value
+            self._counter_events.append((name, time.perf_counter(), total))
+
+    def record(self, name: str, seconds: float):
+        """It records a duration measured elsewhere (e.g. event loop lag)."""
+        if not self.enabled:
+            return
+        end = time.perf_counter()
+        self._record(name, end - seconds, end)
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-span aggregates: count, total_ms, mean_ms and max_ms."""
+        with self._lock:
+            return {
+                name: {"count": count, "total_ms": total * 1000,
+                       "mean_ms": total / count * 1000, "max_ms": peak * 1000}
+                for name, (count, total, peak) in self._stats.items()
+            }
+
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def trace_events(self) -> list:
+        """Recorded spans and counters in the Chrome trace-event format."""
+        pid = os.getpid()
+        with self._lock:
+            origin = self._origin
+            events = [
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+                for tid, thread_name in self._threads.items()
+            ]
+            for name, start, end, tid in self._events:
+                events.append({"name": name, "ph": "X", "pid": pid, "tid": tid,
+                               "ts": (start - origin) * 1e6, "dur": (end - start) * 1e6})
+            for name, at, total in self._counter_events:
+                events.append({"name": name, "ph": "C", "pid": pid, "tid": 0,
+                               "ts": (at - origin) * 1e6, "args": {"value": total}})
+        return events
+
+    def export(self, path: Path) -> Path:
+        """It writes a trace-event JSON file.
+
+        The file opens in chrome://tracing, Perfetto and speedscope; the
+        aggregates and counters ride along under "stats" and "counters".
+
+        Returns:
+            The path written."""
+        path = Path(path)
+        data = {
+            "traceEvents": self.trace_events(),
+            "displayTimeUnit": "ms",
+            "stats": self.stats(),
+            "counters": self.counters(),
+        }
+        with path.open('w', encoding='utf-8') as f:
+            json.dump(data, f)
+        return path
+
+    def _record(self, name: str, start: float, end: float):
+        thread = threading.current_thread()
+        duration = end - start
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            self._events.append((name, start, end, thread.ident))
+            entry = self._stats.get(name)
+            if entry is None:
+                self._stats[name] = [1, duration, duration]
+            else:
+                entry[0] += 1
+                entry[1] += duration
+                if duration > entry[2]:
+                    entry[2] = duration
+
+
+# Process-wide profiler used by the instrumented modules
+profiler = Profiler(enabled=settings.PROFILE)
@@ -0,0 +1,240 @@
+import heapq
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from src.models.task import Priority, Status, Task
+from src.utils.ordering import SortedIndex
+
+SEPARATOR = "/"  # Between the levels of a project path: "Trabalho/Cliente A"
+
+
+def normalize_project(text: Optional[str]) -> Optional[str]:
+    """A project path with blank levels and surrounding spaces removed (None if empty)."""
+    parts = (part.strip() for part in (text or "").split(SEPARATOR))
+    return SEPARATOR.join(part for part in parts if part) or None
+
+
+def normalize_tags(tags: Union[Iterable[str], str, None]) -> Tuple[str, ...]:
+    """Lowercase tag names without "#", in order and without duplicates.
+
+    A string is split on commas and spaces ("casa, #urgente"); the names
+    of a list are split on commas, so no tag ever holds one (hand-written
+    CSV cells list tags comma-separated)."""
+    if isinstance(tags, str):
+        tags = tags.replace(",", " ").split()
+    names = (name.strip().lstrip("#").lower() for tag in tags or () for name in tag.split(","))
+    return tuple(dict.fromkeys(name for name in names if name))
+
+
+def lineage(project: Optional[str]) -> List[str]:
+    """The project and its ancestors, outermost first: "a/b" -> ["a", "a/b"]."""
+    if not project:
+        return []
+    parts = project.split(SEPARATOR)
+    return [SEPARATOR.join(parts[:depth]) for depth in range(1, len(parts) + 1)]
+
+
+def parent_of(project: str) -> str:
+    """The parent project path ("" for a top-level project)."""
+    return project.rpartition(SEPARATOR)[0]
+
+
+def in_project(task: Task, project: str) -> bool:
+    """Whether the task belongs to the project or one of its subprojects."""
+    return task.project == project or (task.project or "").startswith(project + SEPARATOR)
+
+
+# Membership of an indexed task: what it was counted under
+_Member = Tuple[Optional[str], Tuple[str, ...], Status, Priority]
+
+
+class ProjectIndex:
+    """It groups task IDs by project and tag and keeps their counts up to date.
+
+    Every project and tag has its own SortedIndex (newest first), so
+    listing a project reads only its own tasks, however many others
+    there are; a project with subprojects lazily merges their indexes.
+
+    Pending/completed counts per priority are kept for every project
+    path including its subprojects ("" holding the whole store), and
+    adjusted on each add/remove: reading them never scans tasks.
+
+    Counts and groups are recorded per task ID, so removing works even if
+    the stored task object was modified in place.
+    """
+
+    def __init__(self):
+        self._members: Dict[str, _Member] = {}
+        self._projects: Dict[str, SortedIndex] = {}   # Exact project -> its tasks
+        self._tags: Dict[str, SortedIndex] = {}
+        self._counts: Dict[str, Dict[Tuple[Status, Priority], int]] = {}  # Project subtree -> counts
+        self._children: Dict[str, Set[str]] = {}      # Project ("" for the top) -> subprojects
+
+    def add(self, task: Task):
+        """It indexes a task (replacing its previous entry, if any)."""
+        self.remove(task.id)
+        self._remember(task)
+        if task.project is not None:
+            self._group(self._projects, task.project).add(task)
+        for tag in task.tags:
+            self._group(self._tags, tag).add(task)
+        self._count(task.project, task.status, task.priority, 1)
+
+    def remove(self, task_id: str):
+        """It removes a task from the index."""
+        member = self._members.pop(task_id, None)
+        if member is None:
+            return
+        project, tags, status, priority = member
+        if project is not None:
+            self._leave(self._projects, project, [task_id])
+        for tag in tags:
+            self._leave(self._tags, tag, [task_id])
+        self._count(project, status, priority, -1)
+
+    def add_many(self, tasks: Iterable[Task]):
+        """It indexes a batch of tasks with one sort per touched project and tag."""
+        projects: Dict[str, List[Task]] = {}
+        tags: Dict[str, List[Task]] = {}
+        added = Counter()
+        for task in tasks:
+            if task.id in self._members:
+                self.remove(task.id)
+            self._remember(task)
+            added[task.project, task.status, task.priority] += 1
+            if task.project is not None:
+                projects.setdefault(task.project, []).append(task)
+            for tag in task.tags:
+                tags.setdefault(tag, []).append(task)
+        for project, group in projects.items():
+            self._group(self._projects, project).add_many(group)
+        for tag, group in tags.items():
+            self._group(self._tags, tag).add_many(group)
+        for (project, status, priority), count in added.items():
+            self._count(project, status, priority, count)
+
+    def remove_many(self, task_ids: Iterable[str]):
+        """It removes a batch of tasks with one pass per touched project and tag."""
+        projects: Dict[str, List[str]] = {}
+        tags: Dict[str, List[str]] = {}
+        removed = Counter()
+        for task_id in task_ids:
+            member = self._members.pop(task_id, None)
+            if member is None:
+                continue
+            removed[member[0], member[2], member[3]] += 1
+            if member[0] is not None:
+                projects.setdefault(member[0], []).append(task_id)
+            for tag in member[1]:
+                tags.setdefault(tag, []).append(task_id)
+        for project, group in projects.items():
+            self._leave(self._projects, project, group)
+        for tag, group in tags.items():
+            self._leave(self._tags, tag, group)
+        for (project, status, priority), count in removed.items():
+            self._count(project, status, priority, -count)
+
+    def rebuild(self, tasks: Iterable[Task]):
+        """It rebuilds the index from scratch (used on load)."""
+        self.__init__()
+        self.add_many(tasks)
+
+    def ids(self, project: Optional[str] = None, tag: Optional[str] = None, status: Optional[Status] = None,
+            descending: bool = True, after: Optional[Tuple] = None) -> Iterator[str]:
+        """It lazily yields the IDs of a project's (subprojects included) and/or tag's tasks, by creation time.
+
+        The iterator reads the live index; consume it before mutating the store.
+
+        Args:
+            project: Project path.
+            tag: Tag name (with a project too: tasks having both).
+            status: If provided, only IDs of tasks with this status.
+            descending: Newest first.
+            after: Resume strictly after this created_at sort key."""
+        if tag is not None:
+            index = self._tags.get(tag)
+            keys = index.keys(status, descending, after) if index is not None else iter(())
+            if project is not None:
+                keys = (key for key in keys if self._member_of(key[-1], project))
+        else:
+            streams = [self._projects[name].keys(status, descending, after)
+                       for name in self._subtree(project) if name in self._projects]
+            keys = heapq.merge(*streams, reverse=descending)
+        for key in keys:
+            yield key[-1]
+
+    def project_counts(self) -> Dict[str, Tuple[int, int]]:
+        """(pending, completed) per project path, subprojects included ("" for every task)."""
+        return {project: self._by_status(counts) for project, counts in self._counts.items()}
+
+    def priority_counts(self, project: Optional[str] = None) -> Dict[Priority, Tuple[int, int]]:
+        """(pending, completed) per priority, in a project (subprojects included) or everywhere."""
+        counts = self._counts.get(project or "", {})
+        return {priority: (counts.get((Status.PENDING, priority), 0), counts.get((Status.COMPLETED, priority), 0))
+                for priority in Priority}
+
+    def tag_counts(self) -> Dict[str, Tuple[int, int]]:
+        """(pending, completed) per tag."""
+        return {tag: (index.count(Status.PENDING), index.count(Status.COMPLETED))
+                for tag, index in self._tags.items()}
+
+    def count(self, project: Optional[str] = None, status: Optional[Status] = None,
+              priority: Optional[Priority] = None) -> int:
+        """Tasks in a project (subprojects included; None for every task), optionally of one status and priority."""
+        counts = self._counts.get(project or "", {})
+        return sum(n for (task_status, task_priority), n in counts.items()
+                   if (status is None or task_status == status) and (priority is None or task_priority == priority))
+
+    def tag_count(self, tag: str, status: Optional[Status] = None) -> int:
+        """Tasks with a tag, optionally of one status."""
+        index = self._tags.get(tag)
+        return index.count(status) if index is not None else 0
+
+    def _remember(self, task: Task):
+        self._members[task.id] = (task.project, task.tags, task.status, task.priority)
+
+    def _member_of(self, task_id: str, project: str) -> bool:
+        name = self._members[task_id][0] or ""
+        return name == project or name.startswith(project + SEPARATOR)
+
+    def _count(self, project: Optional[str], status: Status, priority: Priority, delta: int):
+        """It adjusts the counts of a project and every ancestor (and of "")."""
+        key = (status, priority)
+        for path in [""] + lineage(project):
+            counts = self._counts.setdefault(path, {})
+            counts[key] = counts.get(key, 0) + delta
+            if path:
+                self._children.setdefault(parent_of(path), set()).add(path)
+            if delta < 0 and not any(counts.values()):
+                # Projects exist while they have tasks
+                del self._counts[path]
+                if path:
+                    self._children.get(parent_of(path), set()).discard(path)
+
+    def _subtree(self, project: str) -> Iterator[str]:
+        stack = [project]
+        while stack:
+            name = stack.pop()
+            yield name
+            stack.extend(self._children.get(name, ()))
+
+    @staticmethod
+    def _group(groups: Dict[str, SortedIndex], name: str) -> SortedIndex:
+        group = groups.get(name)
+        if group is None:
+            group = groups[name] = SortedIndex("created_at")
+        return group
+
+    @staticmethod
+    def _leave(groups: Dict[str, SortedIndex], name: str, task_ids: List[str]):
+        group = groups[name]
+        if len(task_ids) == 1:
+            group.remove(task_ids[0])
+        else:
+            group.remove_many(task_ids)
+        if not group.count():
+            del groups[name]
+
+    @staticmethod
+    def _by_status(counts: Dict[Tuple[Status, Priority], int]) -> Tuple[int, int]:
+        pending = sum(count for (status, _), count in counts.items() if status == Status.PENDING)
+        return pending, sum(counts.values()) - pending
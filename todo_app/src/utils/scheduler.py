@@ -0,0 +1,132 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.models.task import Status, Task
+
+# Kinds of deadline a task can have
+DUE = "due"
+REMIND = "remind"
+
+
+class DeadlineScheduler:
+    """It keeps the upcoming due dates and reminders of pending tasks in a min-heap.
+
+    The heap holds (time, task ID, kind) entries. Rescheduling or
+    unscheduling a task does not search the heap: its current deadlines
+    are kept in a dict, and heap entries that no longer match it are
+    dropped when they reach the top. The heap is rebuilt once stale
+    entries outnumber live ones, so memory stays proportional to the
+    scheduled tasks.
+
+    next_deadline() is O(1) (amortized) and pop_due() only touches the
+    entries that are due, so a caller can sleep until the next deadline
+    instead of scanning tasks periodically.
+
+    Fired deadlines are remembered per task, so unscheduling a task and
+    scheduling it again with the same values (a rolled back transaction,
+    an undone delete) does not fire them a second time."""
+
+    def __init__(self):
+        self._heap: List[Tuple[int, str, str]] = []
+        # task id -> (due_at, remind_at) as scheduled
+        self._deadlines: Dict[str, Tuple[Optional[int], Optional[int]]] = {}
+        # task id -> (due_at, remind_at) already handed out by pop_due()
+        self._fired: Dict[str, Tuple[Optional[int], Optional[int]]] = {}
+        # Everything up to this time has been handed out by pop_due()
+        self._fired_until = 0
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, task: Task):
+        """It (re)schedules a task's deadlines; completed tasks have none."""
+        deadlines = self._deadlines_of(task)
+        if deadlines is None:
+            self._deadlines.pop(task.id, None)
+            return
+        previous = self._deadlines.get(task.id, (None, None))
+        if previous == deadlines:
+            return
+        self._deadlines[task.id] = deadlines
+        # Only changed deadlines get a new entry (an unchanged one keeps its
+        # entry, or stays fired)
+        fired = self._fired.get(task.id, (None, None))
+        for kind, at, before, done in zip((DUE, REMIND), deadlines, previous, fired):
+            if at is not None and at != before and at != done:
+                heapq.heappush(self._heap, (at, task.id, kind))
+        limit = 2 * len(self._deadlines) + 64
+        if len(self._heap) > limit or len(self._fired) > limit:
+            self._compact()
+
+    def schedule_many(self, tasks: Iterable[Task]):
+        for task in tasks:
+            self.schedule(task)
+
+    def unschedule(self, task_id: str):
+        """It forgets a task's deadlines (its heap entries go stale).
+
+        Which of them already fired is kept until the next compaction."""
+        self._deadlines.pop(task_id, None)
+
+    def rebuild(self, tasks: Iterable[Task]):
+        """It replaces every deadline with one heapify (used on load).
+
+        Deadlines that passed before the first pop_due() are kept (they were
+        missed while nobody was watching); ones already popped are not."""
+        self._deadlines = {}
+        for task in tasks:
+            deadlines = self._deadlines_of(task)
+            if deadlines is not None:
+                self._deadlines[task.id] = deadlines
+        self._fired = {task_id: fired for task_id, fired in self._fired.items() if task_id in self._deadlines}
+        self._heap = [(at, task_id, kind)
+                      for task_id, deadlines in self._deadlines.items()
+                      for kind, at, done in zip((DUE, REMIND), deadlines,
+                                                self._fired.get(task_id, (None, None)))
+                      if at is not None and at > self._fired_until and at != done]
+        heapq.heapify(self._heap)
+
+    def next_deadline(self) -> Optional[int]:
+        """Epoch seconds of the earliest scheduled deadline, or None."""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, at: int) -> List[Tuple[str, str]]:
+        """It removes and returns the deadlines reached by the given time.
+
+        Each deadline fires once: rescheduling the same values does not
+        bring it back, changing them does.
+
+        Returns:
+            (kind, task ID) pairs, earliest first."""
+        due = []
+        self._fired_until = max(self._fired_until, at)
+        heap = self._heap
+        while heap and heap[0][0] <= at:
+            entry = heapq.heappop(heap)
+            if not self._is_live(entry):
+                continue
+            deadline, task_id, kind = entry
+            fired = self._fired.get(task_id, (None, None))
+            if fired[0 if kind == DUE else 1] == deadline:
+                continue  # A second entry pushed when the task was rescheduled
+            due.append((kind, task_id))
+            self._fired[task_id] = (deadline, fired[1]) if kind == DUE else (fired[0], deadline)
+        return due
+
+    def _is_live(self, entry: Tuple[int, str, str]) -> bool:
+        at, task_id, kind = entry
+        deadlines = self._deadlines.get(task_id)
+        return deadlines is not None and deadlines[0 if kind == DUE else 1] == at
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if self._is_live(entry)]
+        heapq.heapify(self._heap)
+        self._fired = {task_id: fired for task_id, fired in self._fired.items() if task_id in self._deadlines}
+
+    @staticmethod
+    def _deadlines_of(task: Task) -> Optional[Tuple[Optional[int], Optional[int]]]:
+        if task.status is not Status.PENDING or (task.due_at is None and task.remind_at is None):
+            return None
+        return task.due_at, task.remind_at
@@ -0,0 +1,107 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Dict, FrozenSet, List, Set
+from src.models.task import Task
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Lowercases text and strips accents ("Média" -> "media")."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """Splits text into normalized word tokens."""
+    return _TOKEN_RE.findall(normalize(text)) if text else []
+
+
+def task_tokens(task: Task) -> FrozenSet[str]:
+    """Distinct tokens of a task's title and description."""
+    return frozenset(tokenize(task.title) + tokenize(task.description or ""))
+
+
+def matches(task: Task, query: str) -> bool:
+    """Checks a single task against a query without using an index.
+
+    Every query word must match a task word; the last one may be a prefix
+    (so partially typed words match)."""
+    terms = tokenize(query)
+    if not terms:
+        return True
+    tokens = task_tokens(task)
+    *exact, prefix = terms
+    return all(term in tokens for term in exact) and any(token.startswith(prefix) for token in tokens)
+
+
+class SearchIndex:
+    """It keeps an inverted index (token -> task IDs) over titles and descriptions.
+
+    Tokens are accent-insensitive. The vocabulary is kept sorted so the
+    last (partially typed) query word is resolved as a prefix range with a
+    binary search instead of a scan."""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._vocabulary: List[str] = []        # Sorted, for prefix lookups
+        self._tokens_by_id: Dict[str, FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens_by_id)
+
+    def add(self, task: Task):
+        """It indexes a task (replacing its previous entry, if any)."""
+        if task.id in self._tokens_by_id:
+            self.remove(task.id)
+        tokens = task_tokens(task)
+        self._tokens_by_id[task.id] = tokens
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                ids = self._postings[token] = set()
+                insort(self._vocabulary, token)
+            ids.add(task.id)
+
+    def remove(self, task_id: str):
+        """It removes a task from the index."""
+        tokens = self._tokens_by_id.pop(task_id, ())
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(task_id)
+            if not ids:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def search(self, query: str) -> Set[str]:
+        """It returns the IDs of tasks matching every word of the query.
+
+        The last word matches as a prefix (search-as-you-type)."""
+        terms = tokenize(query)
+        if not terms:
+            return set(self._tokens_by_id)
+        *exact, prefix = terms
+        result = None
+        # Intersect exact words starting with the rarest one
+        for term in sorted(exact, key=lambda t: len(self._postings.get(t, ()))):
+            ids = self._postings.get(term)
+            if not ids:
+                return set()
+            result = set(ids) if result is None else result & ids
+            if not result:
+                return result
+        if result is not None and len(result) < 64:
+            # Few candidates left: checking their own tokens is cheaper than a prefix union
+            tokens_by_id = self._tokens_by_id
+            return {task_id for task_id in result
+                    if any(token.startswith(prefix) for token in tokens_by_id[task_id])}
+        prefix_ids: Set[str] = set()
+        vocabulary = self._vocabulary
+        index = bisect_left(vocabulary, prefix)
+        while index < len(vocabulary) and vocabulary[index].startswith(prefix):
+            prefix_ids |= self._postings[vocabulary[index]]
+            index += 1
+        return prefix_ids if result is None else result & prefix_ids
@@ -0,0 +1,680 @@
+import json
+import sqlite3
+import uuid
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.models.task import Priority, Status, Task, now
+from src.utils.ordering import decode_cursor
+from src.utils.projects import SEPARATOR, lineage
+from src.utils.scheduler import DeadlineScheduler
+from src.utils.search import tokenize
+from src.utils.profiling import profiler
+from src.utils.events import ChangeNotifier, ADDED, UPDATED, DELETED, RELOADED, BATCH
+
+# Statements are kept as constants so sqlite3's statement cache reuses
+# the prepared form on every call.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id           TEXT PRIMARY KEY,
+    title        TEXT NOT NULL,
+    description  TEXT,
+    priority     INTEGER,
+    status       TEXT NOT NULL,
+    created_at   INTEGER,
+    completed_at INTEGER,
+    version      INTEGER NOT NULL DEFAULT 0,
+    due_at       INTEGER,
+    remind_at    INTEGER,
+    project      TEXT,
+    tags         TEXT
+);
+DROP INDEX IF EXISTS idx_tasks_status;
+DROP INDEX IF EXISTS idx_tasks_priority;
+DROP INDEX IF EXISTS idx_tasks_created_at;
+DROP INDEX IF EXISTS idx_tasks_due_at;
+CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_by_priority ON tasks(priority, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks(COALESCE(completed_at, 0), id);
+CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks(due_at IS NULL, COALESCE(due_at, 0), id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks(status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_priority ON tasks(status, priority, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_completed ON tasks(status, COALESCE(completed_at, 0), id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks(status, due_at IS NULL, COALESCE(due_at, 0), id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_due_at ON tasks(status, due_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks(project, status, created_at);
+"""
+# Sort columns for query(); each ends with id so keyset cursors are unambiguous.
+# Every order has an index on exactly these expressions, with and without a
+# leading status (and priority) filter, so pages are read in index order
+# instead of being sorted in a temporary B-tree (the old single-column
+# indexes above are dropped from existing databases).
+_ORDER_COLUMNS = {
+    "created_at":   ["created_at", "id"],
+    "priority":     ["priority", "created_at", "id"],
+    "completed_at": ["COALESCE(completed_at, 0)", "id"],
+    "due_at":       ["due_at IS NULL", "COALESCE(due_at, 0)", "id"],
+}
+# Accent-insensitive full-text index kept in sync with the tasks table by triggers
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    title, description,
+    content='tasks', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+"""
+# Change feed for sync: every write to tasks, by any connection, logs the task ID
+_FEED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_changes (
+    seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id TEXT NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS task_changes_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO task_changes(task_id) VALUES (new.id);
+END;
+CREATE TRIGGER IF NOT EXISTS task_changes_update AFTER UPDATE ON tasks BEGIN
+    INSERT INTO task_changes(task_id) VALUES (new.id);
+END;
+CREATE TRIGGER IF NOT EXISTS task_changes_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO task_changes(task_id) VALUES (old.id);
+END;
+"""
+# Tags (a JSON array) and project counts, kept up to date by triggers on
+# every write so reading the sidebar counts never scans the tasks table
+_GROUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_tags (
+    tag     TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    PRIMARY KEY (tag, task_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS project_counts (
+    project  TEXT NOT NULL,
+    status   TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    n        INTEGER NOT NULL,
+    PRIMARY KEY (project, status, priority)
+);
+CREATE TABLE IF NOT EXISTS tag_counts (
+    tag    TEXT NOT NULL,
+    status TEXT NOT NULL,
+    n      INTEGER NOT NULL,
+    PRIMARY KEY (tag, status)
+);
+CREATE TRIGGER IF NOT EXISTS task_groups_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO project_counts VALUES (COALESCE(new.project, ''), new.status, new.priority, 1)
+        ON CONFLICT DO UPDATE SET n = n + 1;
+    INSERT INTO task_tags SELECT value, new.id FROM json_each(COALESCE(new.tags, '[]'));
+    INSERT INTO tag_counts SELECT value, new.status, 1 FROM json_each(COALESCE(new.tags, '[]')) WHERE 1
+        ON CONFLICT DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS task_groups_delete AFTER DELETE ON tasks BEGIN
+    UPDATE project_counts SET n = n - 1
+        WHERE project = COALESCE(old.project, '') AND status = old.status AND priority = old.priority;
+    DELETE FROM task_tags WHERE task_id = old.id AND tag IN (SELECT value FROM json_each(COALESCE(old.tags, '[]')));
+    UPDATE tag_counts SET n = n - 1
+        WHERE status = old.status AND tag IN (SELECT value FROM json_each(COALESCE(old.tags, '[]')));
+END;
+CREATE TRIGGER IF NOT EXISTS task_groups_update AFTER UPDATE OF project, status, priority, tags ON tasks BEGIN
+    UPDATE project_counts SET n = n - 1
+        WHERE project = COALESCE(old.project, '') AND status = old.status AND priority = old.priority;
+    DELETE FROM task_tags WHERE task_id = old.id AND tag IN (SELECT value FROM json_each(COALESCE(old.tags, '[]')));
+    UPDATE tag_counts SET n = n - 1
+        WHERE status = old.status AND tag IN (SELECT value FROM json_each(COALESCE(old.tags, '[]')));
+    INSERT INTO project_counts VALUES (COALESCE(new.project, ''), new.status, new.priority, 1)
+        ON CONFLICT DO UPDATE SET n = n + 1;
+    INSERT INTO task_tags SELECT value, new.id FROM json_each(COALESCE(new.tags, '[]'));
+    INSERT INTO tag_counts SELECT value, new.status, 1 FROM json_each(COALESCE(new.tags, '[]')) WHERE 1
+        ON CONFLICT DO UPDATE SET n = n + 1;
+END;
+"""
+# Fills the group tables of databases created before them
+_GROUP_BACKFILL = """
+INSERT INTO project_counts SELECT COALESCE(project, ''), status, priority, COUNT(*) FROM tasks GROUP BY 1, 2, 3;
+INSERT OR IGNORE INTO task_tags SELECT j.value, t.id FROM tasks t, json_each(COALESCE(t.tags, '[]')) j;
+INSERT INTO tag_counts SELECT j.value, t.status, COUNT(*) FROM tasks t, json_each(COALESCE(t.tags, '[]')) j GROUP BY 1, 2;
+"""
+_COLUMNS = ("id, title, description, priority, status, created_at, completed_at, version, due_at, remind_at, "
+            "project, tags")
+_INSERT = (f"INSERT OR REPLACE INTO tasks ({_COLUMNS}) "
+           "VALUES (:id, :title, :description, :priority, :status, :created_at, :completed_at, :version, "
+           ":due_at, :remind_at, :project, :tags)")
+# Optimistic update: only applies if nobody changed the row since the caller read it
+_UPDATE = ("UPDATE tasks SET title = :title, description = :description, priority = :priority, "
+           "status = :status, created_at = :created_at, completed_at = :completed_at, due_at = :due_at, "
+           "remind_at = :remind_at, project = :project, tags = :tags, version = version + 1 "
+           "WHERE id = :id AND version = :version")
+_DELETE = "DELETE FROM tasks WHERE id = ?"
+_SELECT_SCHEDULED = (f"SELECT {_COLUMNS} FROM tasks WHERE status = 'Pending' "
+                     "AND (due_at IS NOT NULL OR remind_at IS NOT NULL)")
+_SELECT_DUE_BEFORE = (f"SELECT {_COLUMNS} FROM tasks WHERE status = 'Pending' AND due_at <= ? "
+                      "ORDER BY due_at, id")
+_SELECT_ONE = f"SELECT {_COLUMNS} FROM tasks WHERE id = ?"
+_SELECT_ALL = f"SELECT {_COLUMNS} FROM tasks ORDER BY rowid"
+_SELECT_BY_STATUS = f"SELECT {_COLUMNS} FROM tasks WHERE status = ? ORDER BY rowid"
+_SELECT_BY_PRIORITY = f"SELECT {_COLUMNS} FROM tasks WHERE priority = ? ORDER BY rowid"
+_SELECT_BY_BOTH = f"SELECT {_COLUMNS} FROM tasks WHERE status = ? AND priority = ? ORDER BY rowid"
+_SEARCH = f"SELECT {_COLUMNS} FROM tasks WHERE rowid IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?) ORDER BY rowid"
+_SEARCH_BY_STATUS = (f"SELECT {_COLUMNS} FROM tasks WHERE rowid IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?) "
+                     "AND status = ? ORDER BY rowid")
+_SELECT_PROJECT_COUNTS = "SELECT project, status, priority, n FROM project_counts WHERE n > 0"
+_SELECT_TAG_COUNTS = "SELECT tag, status, n FROM tag_counts WHERE n > 0"
+
+
+def _row(task: Task) -> dict:
+    """Statement parameters for a task (tags stored as a JSON array, NULL when none).
+
+    Tags are deduplicated: task_tags has one row per (tag, task)."""
+    row = task.to_dict()
+    row["tags"] = json.dumps(list(dict.fromkeys(row["tags"])), ensure_ascii=False) if row["tags"] else None
+    return row
+
+
+def _task(row: sqlite3.Row) -> Task:
+    """Task from a row (the inverse of _row)."""
+    data = dict(row)
+    data["tags"] = json.loads(data["tags"]) if data["tags"] else ()
+    return Task.from_dict(data)
+
+
+class SQLiteTaskDatabase(ChangeNotifier):
+    """It manages task storage and retrieval using a SQLite database.
+
+    Offers the same public API as TaskDatabase, but every mutation is a
+    single indexed statement instead of a rewrite of the whole store.
+
+    SQLite already locks the file for writers in other processes. Updates
+    are optimistic: they only apply if the row still has the version the
+    caller read, otherwise the stored row is kept and announced instead.
+    poll_changes() tells views when another connection committed.
+
+    Upcoming due dates and reminders are kept in an in-memory
+    DeadlineScheduler, filled from the (status, due_at, id) index on open.
+    Project and tag counts live in small tables maintained by triggers.
+
+    Attributes:
+        db_path: Path to the SQLite database file.
+        on_error: Kept for API parity with TaskDatabase; SQLite writes are
+            synchronous and raise directly."""
+
+    def __init__(self, db_path: str = "tasks.db", change_feed: bool = False):
+        """It opens (or creates) the database and makes sure the schema exists.
+
+        Args:
+            db_path: Path to the SQLite database file.
+            change_feed: Log changed task IDs for sync (see changes_since).
+                Once enabled, the triggers stay in the database file."""
+        self.db_path = Path(db_path)
+        self.on_error = None
+        self._changes = None  # (action, task) pairs of the open transaction()
+        self._deadlines = DeadlineScheduler()
+        self.change_feed = change_feed
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # INSERT OR REPLACE must fire the delete triggers of the replaced row
+        self.conn.execute("PRAGMA recursive_triggers=ON")
+        self.load_tasks()
+        self._data_version = self._read_data_version()
+        self._load_deadlines()
+
+    @profiler.timed("SQLiteTaskDatabase.load_tasks")
+    def load_tasks(self):
+        """It makes sure the schema and indexes exist.
+
+        Rows are read on demand, so nothing is loaded into memory here."""
+        has_fts = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'"
+        ).fetchone() is not None
+        has_groups = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'project_counts'"
+        ).fetchone() is not None
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(tasks)")}
+        with self.conn:
+            if columns and "version" not in columns:
+                # Databases created before version stamps existed
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            if columns and "due_at" not in columns:
+                # Databases created before due dates existed
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN due_at INTEGER")
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN remind_at INTEGER")
+            if columns and "project" not in columns:
+                # Databases created before projects and tags existed
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN project TEXT")
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN tags TEXT")
+            self.conn.executescript(_SCHEMA + _FTS_SCHEMA + _GROUP_SCHEMA +
+                                    (_FEED_SCHEMA if self.change_feed else ""))
+            if not has_fts:
+                # Databases created before search existed: index the rows they already have
+                self.conn.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+            if not has_groups:
+                self.conn.executescript(_GROUP_BACKFILL)
+
+    @profiler.timed("SQLiteTaskDatabase.save_tasks")
+    def save_tasks(self):
+        """It commits any pending changes to disk."""
+        try:
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error saving tasks: {e}")
+
+    @property
+    def loading(self) -> bool:
+        """Rows are read on demand, so there is never a load in progress."""
+        return False
+
+    def poll_loading(self) -> bool:
+        return False
+
+    def finish_loading(self):
+        pass
+
+    def archive_completed(self, older_than: float) -> int:
+        """Completed rows stay in the table (its indexes already keep them
+        out of the active views), so there is no archive. Returns 0."""
+        return 0
+
+    def poll_changes(self) -> bool:
+        """It tells subscribers when another connection committed changes.
+
+        PRAGMA data_version only says that something changed, not what, so
+        subscribers get RELOADED (rows are read on demand anyway).
+
+        Returns:
+            True if another connection committed since the last call."""
+        data_version = self._read_data_version()
+        if data_version == self._data_version:
+            return False
+        self._data_version = data_version
+        self._load_deadlines()
+        self._notify(RELOADED)
+        return True
+
+    def changes_since(self, position: Optional[str]) -> Tuple[List[str], str]:
+        """It lists the IDs of tasks changed or deleted, by any connection, since a feed position.
+
+        Same contract as TaskDatabase.changes_since; positions are feed sequence numbers."""
+        if not self.change_feed:
+            raise RuntimeError("The change feed is disabled (open the database with change_feed=True)")
+        if position is None:
+            row = self.conn.execute("SELECT MAX(seq) FROM task_changes").fetchone()
+            return [], str(row[0] or 0)
+        rows = self.conn.execute("SELECT seq, task_id FROM task_changes WHERE seq > ? ORDER BY seq",
+                                 (int(position),)).fetchall()
+        if not rows:
+            return [], position
+        return list(dict.fromkeys(row["task_id"] for row in rows)), str(rows[-1]["seq"])
+
+    def trim_changes(self, position: str) -> str:
+        """It drops the feed entries up to position. Returns the position to keep."""
+        if self.change_feed:
+            with self.conn:
+                self.conn.execute("DELETE FROM task_changes WHERE seq <= ?", (int(position),))
+        return position
+
+    def next_deadline(self) -> Optional[int]:
+        """Epoch seconds of the earliest due date or reminder of a pending task, or None."""
+        return self._deadlines.next_deadline()
+
+    def pop_due(self, at: Optional[int] = None) -> List[Tuple[str, Task]]:
+        """It hands out the due dates and reminders reached by the given time.
+
+        Same contract as TaskDatabase.pop_due."""
+        due = []
+        for kind, task_id in self._deadlines.pop_due(at or now()):
+            task = self.get_task(task_id)
+            if task is not None:
+                due.append((kind, task))
+        return due
+
+    def due_soon(self, within: float, at: Optional[int] = None) -> List[Task]:
+        """It lists pending tasks due within the given number of seconds, overdue ones included.
+
+        Same contract as TaskDatabase.due_soon; served by the (status, due_at, id) index."""
+        rows = self.conn.execute(_SELECT_DUE_BEFORE, ((at or now()) + within,))
+        return [_task(row) for row in rows]
+
+    def _load_deadlines(self):
+        rows = self.conn.execute(_SELECT_SCHEDULED)
+        self._deadlines.rebuild(_task(row) for row in rows)
+
+    def _read_data_version(self) -> int:
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def flush(self, timeout=None) -> bool:
+        """It commits pending changes (every mutation already commits)."""
+        self.save_tasks()
+        return True
+
+    def close(self):
+        """It closes the database connection."""
+        self.conn.close()
+
+    @property
+    def tasks(self) -> List[Task]:
+        """All tasks in insertion order."""
+        return self.get_tasks()
+
+    def add_task(self, title: str, description: Optional[str] = None, priority: Priority = Priority.MEDIUM,
+                 due_at: Optional[int] = None, remind_at: Optional[int] = None,
+                 project: Optional[str] = None, tags: Tuple[str, ...] = ()) -> Task:
+        """It creates a new task and adds it to the database.
+
+        Args:
+            title: Title of the task.
+            description: Detailed description of the task.
+            priority: Priority level of the task.
+            due_at: Epoch seconds the task is due.
+            remind_at: Epoch seconds to remind the user.
+            project: Project path (see src.utils.projects.normalize_project).
+            tags: Tag names."""
+        task = Task(id=str(uuid.uuid4()), title=title, description=description, priority=priority,
+                    due_at=due_at, remind_at=remind_at, project=project, tags=tags)
+        with self._writing():
+            self.conn.execute(_INSERT, _row(task))
+        self._changed(ADDED, task)
+        return task
+
+    def delete_task(self, task_id: str) -> bool:
+        """It deletes a task by its ID.
+
+        Args:
+            task_id: Unique identifier of the task to delete.
+
+        Returns:
+            True if the task was found and deleted, False otherwise."""
+        task = self.get_task(task_id)
+        if task is None:
+            return False
+        with self._writing():
+            self.conn.execute(_DELETE, (task_id,))
+        self._changed(DELETED, task)
+        return True
+
+    def update_task(self, task: Task):
+        """It updates an existing task in the database.
+
+        If another process changed the task since it was read (its version
+        moved on), the stored row wins and is announced instead.
+
+        Args:
+            task: The task with updated information.
+        """
+        with self._writing():
+            self._update(task)
+
+    @contextmanager
+    def transaction(self):
+        """It groups the mutations made inside the block into one SQLite transaction.
+
+        Same contract as TaskDatabase.transaction: one commit, one BATCH
+        notification, and a rollback if the block raises."""
+        if self._changes is not None:
+            yield self
+            return
+        self._changes = changes = []
+        try:
+            with self.conn:
+                yield self
+        finally:
+            self._changes = None
+        for action, task in changes:
+            self._track_deadlines(action, task)
+        if changes:
+            self._notify(BATCH, changes)
+
+    def add_many(self, tasks: Iterable[Task]) -> List[Task]:
+        """It adds a batch of tasks (keeping their IDs) in one transaction."""
+        tasks = list(tasks)
+        with self.transaction():
+            for task in tasks:
+                action = ADDED if self.get_task(task.id) is None else UPDATED
+                self.conn.execute(_INSERT, _row(task))
+                self._changed(action, task)
+        return tasks
+
+    def delete_many(self, task_ids: Iterable[str]) -> int:
+        """It deletes a batch of tasks in one transaction. Returns the number deleted."""
+        with self.transaction():
+            return sum(self.delete_task(task_id) for task_id in task_ids)
+
+    def update_many(self, tasks: Iterable[Task]) -> int:
+        """It updates a batch of existing tasks in one transaction. Returns the number updated."""
+        with self.transaction():
+            return sum(self._update(task) for task in tasks)
+
+    def complete_many(self, task_ids: Iterable[str]) -> int:
+        """It marks a batch of tasks as completed in one transaction. Returns the number completed."""
+        with self.transaction():
+            completed = []
+            for task_id in task_ids:
+                task = self.get_task(task_id)
+                if task is not None and not task.is_completed:
+                    task.mark_completed()
+                    completed.append(task)
+            return self.update_many(completed)
+
+    def _update(self, task: Task) -> bool:
+        """It runs the optimistic update; returns True if it was applied."""
+        if self.conn.execute(_UPDATE, _row(task)).rowcount > 0:
+            task.version += 1
+            self._changed(UPDATED, task)
+            return True
+        stored = self.get_task(task.id)
+        if stored is not None:
+            print(f"Conflict: task {task.id} was changed by another process; kept its version")
+            self._changed(UPDATED, stored)
+        return False
+
+    def _writing(self):
+        """Commits a single mutation, unless a transaction() will commit it."""
+        return nullcontext() if self._changes is not None else self.conn
+
+    def _changed(self, action: str, task: Task):
+        if self._changes is not None:
+            self._changes.append((action, task))
+        else:
+            self._track_deadlines(action, task)
+            self._notify(action, task)
+
+    def _track_deadlines(self, action: str, task: Task):
+        """Applies a committed change to the deadline scheduler."""
+        if action == DELETED:
+            self._deadlines.unschedule(task.id)
+        else:
+            self._deadlines.schedule(task)
+
+    def get_task(self, task_id: str, include_archived: bool = False) -> Optional[Task]:
+        """It retrieves a single task by its ID.
+
+        Args:
+            task_id: Unique identifier of the task.
+            include_archived: Accepted for parity with TaskDatabase (nothing is archived).
+
+        Returns:
+            The task, or None if no task has that ID."""
+        row = self.conn.execute(_SELECT_ONE, (task_id,)).fetchone()
+        return _task(row) if row is not None else None
+
+    @profiler.timed("SQLiteTaskDatabase.get_tasks")
+    def get_tasks(self, status: Optional[Status] = None, priority: Optional[Priority] = None,
+                  include_archived: bool = False) -> List[Task]:
+        """It retrieves all tasks, optionally filtered by status and/or priority.
+
+        Args:
+            status: If provided, filters tasks by this status.
+            priority: If provided, filters tasks by this priority.
+            include_archived: Accepted for parity with TaskDatabase (nothing is archived)."""
+        if status is not None and priority is not None:
+            rows = self.conn.execute(_SELECT_BY_BOTH, (status.value, priority.value))
+        elif status is not None:
+            rows = self.conn.execute(_SELECT_BY_STATUS, (status.value,))
+        elif priority is not None:
+            rows = self.conn.execute(_SELECT_BY_PRIORITY, (priority.value,))
+        else:
+            rows = self.conn.execute(_SELECT_ALL)
+        return [_task(row) for row in rows]
+
+    def query(self, status: Optional[Status] = None, priority: Optional[Priority] = None,
+              order_by: str = "created_at", descending: bool = True,
+              offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+              include_archived: bool = False, project: Optional[str] = None,
+              tag: Optional[str] = None) -> Iterator[Task]:
+        """It lazily iterates tasks in order, using the column indexes.
+
+        Same arguments as TaskDatabase.query; cursors use keyset pagination."""
+        sql, params = self._query_sql(status, priority, order_by, descending, offset, limit, cursor,
+                                      project, tag)
+        # A dedicated cursor keeps the iterator independent from other statements
+        for row in self.conn.cursor().execute(sql, params):
+            yield _task(row)
+
+    @staticmethod
+    def _query_sql(status: Optional[Status], priority: Optional[Priority], order_by: str, descending: bool,
+                   offset: int, limit: Optional[int], cursor: Optional[str], project: Optional[str],
+                   tag: Optional[str]) -> Tuple[str, list]:
+        """The SELECT statement (and its parameters) query() runs."""
+        columns = _ORDER_COLUMNS[order_by]
+        direction = "DESC" if descending else "ASC"
+        where, params = SQLiteTaskDatabase._filters(status, priority, project, tag)
+        if cursor:
+            key, compared = decode_cursor(cursor), columns
+            if priority is not None and columns[0] == "priority":
+                # The filter pins the first column: compare the rest, or the planner
+                # seeks on the row value instead of priority = ? and sorts again
+                if key[0] == priority.value:
+                    key, compared = key[1:], columns[1:]
+                elif (priority.value < key[0]) != descending:
+                    where.append("0")  # The whole filtered range is before the cursor
+                    key = []
+                else:
+                    key = []
+            if key:
+                where.append(f"({', '.join(compared)}) {'<' if descending else '>'} "
+                             f"({', '.join('?' * len(key))})")
+                params.extend(key)
+        order = ", ".join(f"{column} {direction}" for column in columns)
+        sql = f"SELECT {_COLUMNS} FROM tasks"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, offset])
+        return sql, params
+
+    @staticmethod
+    def _filters(status: Optional[Status], priority: Optional[Priority], project: Optional[str],
+                 tag: Optional[str]) -> Tuple[List[str], list]:
+        """WHERE conditions (and their parameters) shared by query() and count()."""
+        where, params = [], []
+        if status is not None:
+            where.append("status = ?")
+            params.append(status.value)
+        if priority is not None:
+            where.append("priority = ?")
+            params.append(priority.value)
+        if project is not None:
+            # Subprojects sort between "project/" and "project0" ("0" follows "/")
+            where.append("(project = ? OR (project >= ? AND project < ?))")
+            params.extend([project, project + SEPARATOR, project + chr(ord(SEPARATOR) + 1)])
+        if tag is not None:
+            where.append("id IN (SELECT task_id FROM task_tags WHERE tag = ?)")
+            params.append(tag)
+        return where, params
+
+    def count(self, status: Optional[Status] = None, priority: Optional[Priority] = None,
+              include_archived: bool = False, project: Optional[str] = None,
+              tag: Optional[str] = None) -> int:
+        """It counts the tasks query() yields with the same filters (served by the same indexes)."""
+        where, params = self._filters(status, priority, project, tag)
+        sql = "SELECT COUNT(*) FROM tasks" + (" WHERE " + " AND ".join(where) if where else "")
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def project_counts(self) -> Dict[str, Tuple[int, int]]:
+        """(pending, completed) tasks per project path, subprojects included.
+
+        Same contract as TaskDatabase.project_counts; read from the trigger-maintained table."""
+        totals: Dict[str, List[int]] = {}
+        for row in self.conn.execute(_SELECT_PROJECT_COUNTS):
+            column = 0 if row["status"] == Status.PENDING.value else 1
+            for path in [""] + lineage(row["project"]):
+                totals.setdefault(path, [0, 0])[column] += row["n"]
+        return {path: tuple(counts) for path, counts in totals.items()}
+
+    def priority_counts(self, project: Optional[str] = None) -> Dict[Priority, Tuple[int, int]]:
+        """(pending, completed) tasks per priority, in a project (subprojects included) or in all."""
+        totals = {priority: [0, 0] for priority in Priority}
+        for row in self.conn.execute(_SELECT_PROJECT_COUNTS):
+            if project and project not in lineage(row["project"]):
+                continue
+            totals[Priority(row["priority"])][0 if row["status"] == Status.PENDING.value else 1] += row["n"]
+        return {priority: tuple(counts) for priority, counts in totals.items()}
+
+    def tag_counts(self) -> Dict[str, Tuple[int, int]]:
+        """(pending, completed) tasks per tag."""
+        totals: Dict[str, List[int]] = {}
+        for row in self.conn.execute(_SELECT_TAG_COUNTS):
+            totals.setdefault(row["tag"], [0, 0])[0 if row["status"] == Status.PENDING.value else 1] += row["n"]
+        return {tag: tuple(counts) for tag, counts in totals.items()}
+
+    @profiler.timed("SQLiteTaskDatabase.search")
+    def search(self, query: str, status: Optional[Status] = None, include_archived: bool = False) -> List[Task]:
+        """It finds tasks whose title or description match the query.
+
+        Matching ignores case and accents; the last word of the query
+        matches as a prefix.
+
+        Args:
+            query: Words to look for.
+            status: If provided, only tasks with this status are returned.
+            include_archived: Accepted for parity with TaskDatabase (nothing is archived)."""
+        terms = tokenize(query)
+        if not terms:
+            return self.get_tasks(status)
+        expression = " ".join(f'"{term}"' for term in terms) + "*"
+        if status is not None:
+            rows = self.conn.execute(_SEARCH_BY_STATUS, (expression, status.value))
+        else:
+            rows = self.conn.execute(_SEARCH, (expression,))
+        return [_task(row) for row in rows]
+
+    def import_json(self, json_path: str) -> int:
+        """It bulk-imports a tasks.json file inside a single transaction.
+
+        Tasks whose ID already exists are replaced, so the import can be re-run.
+
+        Args:
+            json_path: Path to a JSON file written by TaskDatabase.
+
+        Returns:
+            Number of imported tasks."""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        with self.conn:
+            self.conn.executemany(_INSERT, (_row(Task.from_dict(task_dict)) for task_dict in data))
+        self._load_deadlines()
+        self._notify(RELOADED)
+        return len(data)
+
+    def is_empty(self) -> bool:
+        """It checks whether the database holds no tasks."""
+        return self.conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is None
+
+
+if __name__ == "__main__":
+    # One-shot migration: python -m src.utils.sqlite_database tasks.json tasks.db
+    import sys
+    source = sys.argv[1] if len(sys.argv) > 1 else "tasks.json"
+    target = sys.argv[2] if len(sys.argv) > 2 else "tasks.db"
+    db = SQLiteTaskDatabase(target)
+    print(f"Imported {db.import_json(source)} tasks into {target}")
+    db.close()
@@ -0,0 +1,36 @@
+import time
+from typing import Dict
+
+# Taken when this module is first imported; src/main.py imports it before
+# anything heavy so the clock covers the customtkinter import too.
+_STARTED_AT = time.perf_counter()
+
+
+class StartupTimer:
+    """It records named startup milestones in milliseconds since launch.
+
+    Milestones used by the app:
+        imports      GUI modules imported
+        window       window shell built (no tasks yet)
+        first_paint  first idle pass after the shell was drawn
+        interactive  first screen of tasks listed and the load finished"""
+
+    def __init__(self, started_at: float = _STARTED_AT):
+        self.started_at = started_at
+        self.marks: Dict[str, float] = {}
+
+    def mark(self, name: str) -> float:
+        """It records a milestone once (later calls keep the first time).
+
+        Returns:
+            float: Milliseconds since launch for this milestone."""
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - self.started_at) * 1000
+        return self.marks[name]
+
+    def report(self) -> str:
+        """It formats the recorded milestones as a single line."""
+        return "Startup: " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.marks.items())
+
+
+startup_timer = StartupTimer()
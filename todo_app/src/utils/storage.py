@@ -0,0 +1,40 @@
+from pathlib import Path
+from src.config import settings
+
+
+def open_database(lazy: bool = False):
+    """It opens the storage backend selected in settings.
+
+    The SQLite backend and the binary snapshot format import an existing
+    tasks.json on first use. The change feed is on when sync is configured.
+    Backends are imported here, on demand, so callers only pay for the one
+    they use.
+
+    Args:
+        lazy: Stream tasks in on a background thread (json backend only).
+
+    Returns:
+        A TaskDatabase or SQLiteTaskDatabase (same public API)."""
+    if settings.STORAGE_BACKEND == "sqlite":
+        from src.utils.sqlite_database import SQLiteTaskDatabase
+        db = SQLiteTaskDatabase(settings.SQLITE_PATH, change_feed=bool(settings.SYNC_URL))
+        if db.is_empty() and Path(settings.DB_PATH).exists():
+            db.import_json(settings.DB_PATH)
+        return db
+    from src.utils.database import TaskDatabase
+    db_path = settings.DB_PATH
+    if settings.SNAPSHOT_FORMAT == "binary":
+        from src.utils.binary_snapshot import json_to_binary
+        db_path = settings.BINARY_DB_PATH
+        if not Path(db_path).exists() and Path(settings.DB_PATH).exists():
+            json_to_binary(settings.DB_PATH, db_path)
+    return TaskDatabase(
+        db_path,
+        storage_mode=settings.STORAGE_MODE,
+        compact_threshold=settings.WAL_COMPACT_THRESHOLD,
+        write_delay=settings.WRITE_DELAY,
+        write_max_delay=settings.WRITE_MAX_DELAY,
+        lazy=lazy,
+        snapshot_format=settings.SNAPSHOT_FORMAT,
+        change_feed=bool(settings.SYNC_URL)
+    )
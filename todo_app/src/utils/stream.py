@@ -0,0 +1,133 @@
+import csv
+import json
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(path: Path, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """It yields the items of a top-level JSON array one at a time.
+
+    The file is read in chunks and decoded incrementally, so memory stays
+    at one chunk plus the item being decoded instead of the whole file and
+    its parsed copy.
+
+    Args:
+        path: JSON file whose top level is an array.
+        chunk_size: Number of characters read per chunk.
+
+    Raises:
+        json.JSONDecodeError: If the file is not a well-formed array."""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size)
+        pos = _skip(buffer, 0)
+        if pos == len(buffer):
+            return  # Empty file
+        if buffer[pos] != "[":
+            raise json.JSONDecodeError("Expected '['", buffer, pos)
+        pos += 1
+        eof = False
+        while True:
+            pos = _skip(buffer, pos, ",")
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                if pos == len(buffer):
+                    raise json.JSONDecodeError("Need more data", buffer, pos)
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Item continues in the next chunk: keep only the unread tail
+                more = f.read(chunk_size)
+                eof = not more
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+            yield item
+            pos = end
+
+
+def _skip(buffer: str, pos: int, extra: str = "") -> int:
+    chars = _WHITESPACE + extra
+    while pos < len(buffer) and buffer[pos] in chars:
+        pos += 1
+    return pos
+
+
+# Record formats understood by iter_records/write_records
+FORMATS = ("jsonl", "csv")
+# CSV columns, in Task.to_dict order
+CSV_FIELDS = ["id", "title", "description", "priority", "status", "created_at", "completed_at",
+              "version", "due_at", "remind_at", "project", "tags"]
+
+
+def iter_records(f: IO[str], fmt: str) -> Iterator[Tuple[int, dict]]:
+    """It yields the task dicts of a JSON Lines or CSV stream one at a time.
+
+    Only the current line is held in memory. Blank JSON lines are skipped;
+    empty CSV cells become None, so Task.from_dict applies its defaults.
+    A CSV tags cell holding a JSON array (what write_records writes) is
+    decoded; any other text is left for Task.from_dict to split on commas.
+
+    Args:
+        f: Text stream to read (a file or sys.stdin).
+        fmt: "jsonl" or "csv" (CSV needs a header row naming the columns).
+
+    Returns:
+        (line number, record) pairs, so callers can point at bad input.
+
+    Raises:
+        json.JSONDecodeError: If a JSON line is malformed."""
+    if fmt == "csv":
+        reader = csv.DictReader(f)
+        for row in reader:
+            record = {key: value if value != "" else None for key, value in row.items()}
+            if "tags" in record:
+                record["tags"] = _csv_tags(record["tags"])
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(f, 1):
+        if line.strip():
+            yield line_number, json.loads(line)
+
+
+def write_records(f: IO[str], records: Iterable[dict], fmt: str) -> int:
+    """It writes task dicts as JSON Lines or CSV, one line at a time.
+
+    Returns:
+        Number of records written."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for record in records:
+            # One cell per column: tags are written as a JSON array, so names
+            # holding commas come back whole
+            tags = record.get("tags")
+            writer.writerow({**record, "tags": json.dumps(list(tags), ensure_ascii=False) if tags else ""})
+            count += 1
+        return count
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        count += 1
+    return count
+
+
+def _csv_tags(cell: Optional[str]) -> Union[List[str], str, None]:
+    """The tags of a CSV cell: a JSON array as a list, anything else as it is."""
+    if cell and cell.startswith("["):
+        try:
+            tags = json.loads(cell)
+        except ValueError:
+            return cell
+        if isinstance(tags, list) and all(isinstance(tag, str) for tag in tags):
+            return tags
+    return cell
+
+
+def format_for(path: str, default: str = "jsonl") -> str:
+    """Record format implied by a file name (".csv" or anything else)."""
+    return "csv" if Path(path).suffix.lower() == ".csv" else default
@@ -0,0 +1,196 @@
+import gzip
+import json
+import uuid
+import zlib
+import urllib.error
+import urllib.request
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from src.models.task import Task, same_content
+
+# Wire format: one POST /sync per batch, gzip-compressed JSON both ways.
+#
+#   request   {"protocol": 1, "client": ID, "cursor": N, "limit": L,
+#              "changes": [{"id": ..., "task": {...} | null}, ...]}
+#   response  {"cursor": N, "more": bool, "rejected": [ID, ...],
+#              "changes": [{"id": ..., "task": {...} | null, "seq": N}, ...]}
+#
+# The server numbers every change it accepts (seq). A client sends the
+# changes it made since its last sync and receives the ones other clients
+# made after its cursor, at most L per request. "task": null is a
+# tombstone (the task was deleted).
+PROTOCOL = 1
+
+
+def encode_body(payload: dict) -> bytes:
+    return gzip.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+
+
+class BodyTooLarge(ValueError):
+    """A sync body decompressed to more than the accepted size."""
+
+
+def decode_body(data: bytes, content_encoding: Optional[str] = "gzip", max_size: Optional[int] = None) -> dict:
+    """It decodes a (gzip-compressed) JSON body.
+
+    Raises:
+        BodyTooLarge: If the body is larger than max_size once decompressed.
+        ValueError: If the body is malformed."""
+    if content_encoding == "gzip":
+        if max_size is None:
+            data = gzip.decompress(data)
+        else:
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            data = decompressor.decompress(data, max_size)
+            if decompressor.unconsumed_tail:
+                raise BodyTooLarge(f"request body is larger than {max_size} bytes")
+    return json.loads(data.decode("utf-8"))
+
+
+class SyncError(Exception):
+    """The sync server could not be reached or refused the request."""
+
+
+class SyncClient:
+    """It keeps a task store in sync with a sync server by exchanging deltas.
+
+    Local changes come from the store's change feed (changes_since), so a
+    sync reads and sends only the tasks changed since the last one; the
+    server answers with the changes other clients made after this client's
+    cursor. Both directions are batched (batch_size changes per request).
+
+    Conflicts: a local change to a task that another client changed after
+    our cursor is rejected by the server, and the other client's version
+    is applied here instead (like TaskDatabase does between processes).
+
+    Applying remote changes writes them to the local feed too; those
+    echoes are recognized by content and skipped, so only tasks edited
+    here meanwhile are carried over to the next sync.
+
+    The cursor, feed position and client ID are kept in a small JSON state
+    file. Without one (first sync, or another server) every local task is
+    sent once.
+
+    Usage:
+        client = SyncClient(db, "http://127.0.0.1:8765", "tasks.json.sync")
+        sent, received = client.sync()
+
+    Attributes:
+        url: Base URL of the sync server.
+        state_path: Path to the JSON state file."""
+
+    def __init__(self, db, url: str, state_path: Path, batch_size: int = 500, timeout: float = 30.0):
+        """It prepares a client (nothing is sent until sync()).
+
+        Args:
+            db: A TaskDatabase or SQLiteTaskDatabase opened with change_feed=True.
+            url: Base URL of the sync server.
+            state_path: Where the cursor and feed position are kept.
+            batch_size: Maximum changes per request, each way.
+            timeout: Seconds to wait for each response."""
+        self.db = db
+        self.url = url.rstrip("/")
+        self.state_path = Path(state_path)
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+    def sync(self) -> Tuple[int, int]:
+        """It sends local changes and applies remote ones until both sides are caught up.
+
+        Returns:
+            Number of local changes the server accepted and of remote changes applied.
+
+        Raises:
+            SyncError: If the server cannot be reached; nothing is lost, the
+                next sync resends the same changes."""
+        self.db.flush()
+        state = self._load_state()
+        if state is None:
+            # First sync with this server: everything local is new to it
+            _, position = self.db.changes_since(None)
+            outbox = [task.id for task in self.db.query()]
+            state = {"url": self.url, "client": uuid.uuid4().hex, "cursor": 0, "carry": []}
+        else:
+            outbox, position = self.db.changes_since(state["position"])
+            outbox = state.get("carry", []) + outbox
+        pending = dict.fromkeys(outbox)
+        cursor = state["cursor"]
+        sent = received = 0
+        applied: Dict[str, Optional[dict]] = {}
+        while True:
+            batch = list(islice(pending, self.batch_size))
+            for task_id in batch:
+                del pending[task_id]
+            changes = [self._change_for(task_id) for task_id in batch]
+            response = self._post({"protocol": PROTOCOL, "client": state["client"], "cursor": cursor,
+                                   "limit": self.batch_size, "changes": changes})
+            rejected = response.get("rejected", [])
+            if rejected:
+                print(f"Conflict: {len(rejected)} task(s) were also changed on another machine; kept that version")
+            remote = response["changes"]
+            for change in remote:
+                if change["id"] in pending:
+                    # Changed remotely after our cursor: the other machine's version wins
+                    del pending[change["id"]]
+            self._apply(remote)
+            applied.update((change["id"], change["task"]) for change in remote)
+            sent += len(changes) - len(rejected)
+            received += len(remote)
+            cursor = response["cursor"]
+            if not pending and not response["more"]:
+                break
+        # The feed now also names the remote changes applied above; carry
+        # over only the tasks that were edited here in the meantime
+        self.db.flush()
+        changed, position = self.db.changes_since(position)
+        carry = [task_id for task_id in changed
+                 if task_id not in applied or not same_content(self._change_for(task_id)["task"], applied[task_id])]
+        state.update(cursor=cursor, position=position, carry=carry)
+        self._save_state(state)
+        state["position"] = self.db.trim_changes(position)
+        self._save_state(state)
+        return sent, received
+
+    def _change_for(self, task_id: str) -> dict:
+        # Archived tasks left the store but still exist: not a deletion
+        task = self.db.get_task(task_id, include_archived=True)
+        return {"id": task_id, "task": task.to_dict() if task is not None else None}
+
+    def _apply(self, changes: List[dict]):
+        """It applies remote changes locally in one transaction."""
+        if not changes:
+            return
+        with self.db.transaction():
+            self.db.add_many(Task.from_dict(change["task"]) for change in changes if change["task"] is not None)
+            self.db.delete_many(change["id"] for change in changes if change["task"] is None)
+
+    def _post(self, payload: dict) -> dict:
+        request = urllib.request.Request(
+            self.url + "/sync",
+            data=encode_body(payload),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip",
+                     "Accept-Encoding": "gzip"},
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return decode_body(response.read(), response.headers.get("Content-Encoding"))
+        except urllib.error.HTTPError as e:
+            raise SyncError(f"Sync server refused the request: {e.code} {e.reason}") from e
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise SyncError(f"Sync server unreachable: {e}") from e
+
+    def _load_state(self) -> Optional[Dict]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return state if state.get("url") == self.url else None
+
+    def _save_state(self, state: Dict):
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        tmp_path.replace(self.state_path)
@@ -0,0 +1,202 @@
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+if __package__ in (None, ""):
+    # Run as a script: make the "src" package importable
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from src.models.task import same_content
+from src.utils.sync import PROTOCOL, BodyTooLarge, decode_body, encode_body
+
+# Largest request body accepted, before and after gzip decompression
+MAX_BODY = 8 * 1024 * 1024
+
+
+@dataclass(slots=True)
+class _Entry:
+    seq: int                 # Server sequence number of the task's latest change
+    task: Optional[dict]     # Stored task dict, None for a tombstone
+    origin: str              # Client that made the change
+
+
+class SyncStore:
+    """It holds the server side of sync: the latest state of every task, numbered by change.
+
+    Every accepted change gets the next sequence number; only the latest
+    change of each task is kept (deletions as tombstones). Changes after a
+    cursor are found through a seq -> ID map, so answering a client costs
+    time proportional to the changes it has not seen, not to the store.
+
+    Accepted changes are appended to an optional JSON Lines log and
+    replayed on start.
+
+    Attributes:
+        head: Sequence number of the latest accepted change."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.head = 0
+        self._entries: Dict[str, _Entry] = {}
+        self._by_seq: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._log = None
+        if self.path is not None:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            self._put(record["id"], record["task"], record["origin"], record["seq"])
+            self._log = open(self.path, 'a', encoding='utf-8')
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def exchange(self, client: str, cursor: int, changes: List[dict], limit: int) -> dict:
+        """It applies a client's changes and returns what the client has not seen.
+
+        A change is rejected if another client changed the task after the
+        cursor (the client has not seen that version); changes that would
+        not alter the stored data are accepted without a new number.
+
+        Args:
+            client: ID of the client (its own changes are not sent back).
+            cursor: Latest sequence number the client has seen.
+            changes: {"id", "task"} dicts, "task" None for a deletion.
+            limit: Maximum number of changes returned.
+
+        Returns:
+            A sync response (see src.utils.sync)."""
+        with self._lock:
+            rejected, logged = [], []
+            for change in changes:
+                task_id, task = change["id"], change.get("task")
+                entry = self._entries.get(task_id)
+                if entry is not None and entry.seq > cursor and entry.origin != client:
+                    rejected.append(task_id)
+                elif same_content(entry.task if entry is not None else None, task):
+                    continue
+                else:
+                    logged.append(self._put(task_id, task, client, self.head + 1))
+            if logged and self._log is not None:
+                self._log.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in logged))
+                self._log.flush()
+                os.fsync(self._log.fileno())
+            return {"rejected": rejected, **self._changes_after(cursor, client, limit)}
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+
+    def _put(self, task_id: str, task: Optional[dict], origin: str, seq: int) -> dict:
+        previous = self._entries.get(task_id)
+        if previous is not None:
+            del self._by_seq[previous.seq]
+        self._entries[task_id] = _Entry(seq, task, origin)
+        self._by_seq[seq] = task_id
+        self.head = max(self.head, seq)
+        return {"seq": seq, "id": task_id, "task": task, "origin": origin}
+
+    def _changes_after(self, cursor: int, client: str, limit: int) -> dict:
+        changes = []
+        seq = cursor
+        while seq < self.head and len(changes) < limit:
+            seq += 1
+            task_id = self._by_seq.get(seq)
+            if task_id is None:
+                continue  # Superseded by a later change of the same task
+            entry = self._entries[task_id]
+            if entry.origin != client:
+                changes.append({"id": task_id, "task": entry.task, "seq": seq})
+        return {"changes": changes, "cursor": seq, "more": seq < self.head}
+
+
+class _SyncHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive between batches
+
+    def do_POST(self):
+        if self.path != "/sync":
+            self._reply(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY:
+            # The body is not read, so the connection cannot carry another request
+            self.close_connection = True
+            self._reply(400 if length < 0 else 413,
+                        {"error": "invalid Content-Length" if length < 0 else "request body too large"})
+            return
+        try:
+            request = decode_body(self.rfile.read(length), self.headers.get("Content-Encoding"), MAX_BODY)
+            if request.get("protocol") != PROTOCOL:
+                self._reply(400, {"error": f"unsupported protocol {request.get('protocol')}"})
+                return
+            response = self.server.store.exchange(str(request["client"]), int(request["cursor"]),
+                                                  request["changes"], max(1, int(request.get("limit", 500))))
+        except BodyTooLarge as e:
+            self._reply(413, {"error": str(e)})
+            return
+        except (KeyError, TypeError, ValueError, OSError) as e:
+            self._reply(400, {"error": str(e)})
+            return
+        self._reply(200, response)
+
+    def do_GET(self):
+        if self.path != "/status":
+            self._reply(404, {"error": "not found"})
+            return
+        self._reply(200, {"head": self.server.store.head, "tasks": len(self.server.store)})
+
+    def _reply(self, status: int, payload: dict):
+        gzip_ok = "gzip" in self.headers.get("Accept-Encoding", "")
+        body = encode_body(payload) if gzip_ok else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if gzip_ok:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Quiet: one line per batch is noise
+
+
+class SyncServer(ThreadingHTTPServer):
+    """Reference sync server (stdlib HTTP), meant for localhost and tests.
+
+    Usage:
+        server = SyncServer(("127.0.0.1", 0), SyncStore())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}"
+
+    Attributes:
+        store: The SyncStore answering requests."""
+    daemon_threads = True
+
+    def __init__(self, address, store: SyncStore):
+        super().__init__(address, _SyncHandler)
+        self.store = store
+
+
+if __name__ == "__main__":
+    # python -m src.utils.sync_server [PORT] [LOG_FILE]
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    store = SyncStore(sys.argv[2] if len(sys.argv) > 2 else "sync_server.jsonl")
+    server = SyncServer(("127.0.0.1", port), store)
+    print(f"Sync server on http://127.0.0.1:{port} ({len(store)} tasks, head {store.head})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        store.close()
@@ -0,0 +1,179 @@
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Optional
+from src.utils.profiling import profiler
+
+
+class WriteAheadLog:
+    """It appends task mutations as records to a log file and replays them.
+
+    Each record is written on its own line as "<crc32> <json>\\n". A record
+    whose checksum does not match, or that is missing its trailing newline,
+    is treated as torn: it and everything after it are dropped on replay.
+
+    Attributes:
+        path: Path to the active log file.
+        fsync: Whether each append is flushed to disk before returning.
+        record_count: Number of records in the active log file."""
+
+    def __init__(self, path: Path, fsync: bool = True):
+        """It opens (or creates) the log at the given path.
+
+        Args:
+            path: Path to the active log file.
+            fsync: Whether each append is flushed to disk before returning."""
+        self.path = Path(path)
+        self.fsync = fsync
+        self.record_count = 0
+        self._file = None
+
+    def append(self, record: dict):
+        """It appends a single record to the active log.
+
+        Args:
+            record: JSON serializable mutation record."""
+        self.append_many([record])
+
+    def append_many(self, records: List[dict]):
+        """It appends several records with a single flush (group commit).
+
+        Args:
+            records: JSON serializable mutation records."""
+        if not records:
+            return
+        lines = []
+        for record in records:
+            payload = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            lines.append(b"%08x %s\n" % (zlib.crc32(payload), payload))
+        data = b"".join(lines)
+        f = self._open()
+        offset = f.tell()
+        try:
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        except OSError:
+            # Don't leave a half-written record in front of later appends
+            self.close()
+            with open(self.path, "r+b") as rollback:
+                rollback.truncate(offset)
+            raise
+        self.record_count += len(records)
+        profiler.count("saves")
+        profiler.count("bytes.written", len(data))
+
+    def replay(self) -> Iterator[dict]:
+        """It yields every intact record, rotated segments first.
+
+        A torn tail on the active log is truncated away so later appends
+        start on a clean record boundary."""
+        for segment in self.rotated_segments():
+            yield from self._read(segment, truncate=False)
+        self.record_count = 0
+        for record in self._read(self.path, truncate=True):
+            self.record_count += 1
+            yield record
+
+    def read_from(self, offset: int) -> Iterator[dict]:
+        """It yields the intact records of the active log past a byte offset.
+
+        Used to pick up records appended by another process. Like replay(),
+        it truncates a torn tail (left by a writer that crashed), so callers
+        must hold the store's file lock.
+
+        Args:
+            offset: Size of the log the caller has already applied."""
+        yield from self._read(self.path, truncate=True, offset=offset)
+
+    def size(self) -> int:
+        """Size of the active log in bytes (0 if it does not exist)."""
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def rotate(self) -> Optional[Path]:
+        """It closes the active log and renames it to a numbered segment.
+
+        Returns:
+            Path of the new rotated segment, or None if the log was empty."""
+        self.close()
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return None
+        segments = self.rotated_segments()
+        number = int(segments[-1].suffix[1:]) + 1 if segments else 1
+        target = self.path.with_name(f"{self.path.name}.{number}")
+        os.replace(self.path, target)
+        self.record_count = 0
+        return target
+
+    def rotated_segments(self) -> List[Path]:
+        """It lists rotated segments that are not yet covered by a snapshot."""
+        prefix = self.path.name + "."
+        segments = [
+            p for p in self.path.parent.glob(prefix + "*")
+            if p.name[len(prefix):].isdigit()
+        ]
+        return sorted(segments, key=lambda p: int(p.name[len(prefix):]))
+
+    def discard_segments(self, up_to: Path):
+        """It deletes rotated segments up to and including the given one.
+
+        Args:
+            up_to: Last segment already folded into the snapshot."""
+        limit = int(up_to.suffix[1:])
+        for segment in self.rotated_segments():
+            if int(segment.suffix[1:]) <= limit:
+                segment.unlink(missing_ok=True)
+
+    def close(self):
+        """It closes the active log file handle."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self):
+        if self._file is not None and not self._is_current(self._file):
+            # Another process rotated the log: append to the new one
+            self.close()
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        return self._file
+
+    def _is_current(self, f) -> bool:
+        try:
+            return os.path.samestat(os.fstat(f.fileno()), os.stat(self.path))
+        except FileNotFoundError:
+            return False
+
+    def _read(self, path: Path, truncate: bool, offset: int = 0) -> Iterator[dict]:
+        if not path.exists():
+            return
+        good_offset = offset
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                record = self._decode(line)
+                if record is None:
+                    break
+                good_offset += len(line)
+                yield record
+        if truncate and path.stat().st_size != good_offset:
+            print(f"Dropping torn record at offset {good_offset} in {path}")
+            with open(path, "r+b") as f:
+                f.truncate(good_offset)
+
+    @staticmethod
+    def _decode(line: bytes) -> Optional[dict]:
+        if not line.endswith(b"\n") or len(line) < 10 or line[8:9] != b" ":
+            return None
+        payload = line[9:-1]
+        try:
+            if int(line[:8], 16) != zlib.crc32(payload):
+                return None
+            return json.loads(payload.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            return None
@@ -0,0 +1,104 @@
+import threading
+import time
+from typing import Callable, Optional
+
+
+class BackgroundWriter:
+    """It runs a persistence callback on a background thread, coalescing bursts.
+
+    Every schedule() marks the store dirty; the thread waits until no new
+    request has arrived for `delay` seconds and then calls `write` once for
+    the whole burst. A burst that never pauses is still written once its
+    first change is `max_delay` seconds old.
+
+    Attributes:
+        delay: Debounce delay in seconds.
+        max_delay: Longest time a change waits to be written, in seconds.
+        on_error: Called with the exception when `write` fails."""
+
+    def __init__(self, write: Callable[[], None], delay: float = 0.25,
+                 on_error: Optional[Callable[[Exception], None]] = None, name: str = "task-writer",
+                 max_delay: float = 2.0):
+        """It starts the writer thread.
+
+        Args:
+            write: Callback that persists the current state.
+            delay: Debounce delay in seconds.
+            on_error: Called with the exception when `write` fails.
+            name: Thread name (shows up in debuggers and profilers).
+            max_delay: Longest time a change waits to be written (at least `delay`)."""
+        self.delay = delay
+        self.max_delay = max(max_delay, delay)
+        self.on_error = on_error
+        self._write = write
+        self._cond = threading.Condition()
+        self._requested = 0      # Number of schedule() calls so far
+        self._written = 0        # Value of _requested covered by the last finished write
+        self._last_request = 0.0
+        self._first_request: Optional[float] = None  # Oldest change not yet being written
+        self._urgent = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def schedule(self):
+        """It marks the store dirty; the write happens after the debounce delay."""
+        with self._cond:
+            self._requested += 1
+            self._last_request = time.monotonic()
+            if self._first_request is None:
+                self._first_request = self._last_request
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """It writes pending changes right away and waits for the write to finish.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            True if every change scheduled before the call is on disk."""
+        with self._cond:
+            target = self._requested
+            if self._written >= target:
+                return True
+            self._urgent = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._written >= target or self._closed, timeout) and self._written >= target
+
+    def close(self):
+        """It flushes pending changes and stops the thread."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._requested > self._written or self._closed)
+                if self._closed:
+                    return
+                # Debounce: wait until the burst is over, a flush is requested
+                # or the oldest change has waited max_delay
+                while not self._urgent and not self._closed:
+                    deadline = min(self._last_request + self.delay, self._first_request + self.max_delay)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                target = self._requested
+                self._first_request = None
+                self._urgent = False
+            try:
+                self._write()
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+                else:
+                    print(f"Error saving tasks: {e}")
+            with self._cond:
+                # Failed writes also count as handled; the next change retries
+                self._written = target
+                self._cond.notify_all()
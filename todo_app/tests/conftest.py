@@ -0,0 +1,27 @@
+import pytest
+from src.utils.database import TaskDatabase
+from src.utils.sqlite_database import SQLiteTaskDatabase
+
+# Every storage format the app can be configured with
+STORES = ("json", "wal", "binary", "sqlite")
+
+
+def open_store(kind: str, directory, **options):
+    """Opens a store of the given kind in directory (the same files every time)."""
+    if kind == "sqlite":
+        return SQLiteTaskDatabase(directory / "tasks.db", **options)
+    options.setdefault("write_delay", 0)
+    if kind == "binary":
+        return TaskDatabase(directory / "tasks.tdb", snapshot_format="binary", **options)
+    return TaskDatabase(directory / "tasks.json", storage_mode=kind, **options)
+
+
+@pytest.fixture(params=STORES)
+def kind(request):
+    return request.param
+
+
+@pytest.fixture(params=[kind for kind in STORES if kind != "sqlite"])
+def file_kind(request):
+    """The formats kept in files by TaskDatabase (not SQLite)."""
+    return request.param
@@ -0,0 +1,161 @@
+import asyncio
+import json
+from urllib.parse import quote
+import pytest
+from src.utils.api_server import ApiError, ApiServer
+from tests.conftest import open_store
+
+
+async def request(port, method, path, body=None, raw_headers=""):
+    """One request on its own connection: (status, decoded JSON body or None)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    headers = raw_headers or f"Content-Length: {len(data)}\r\n"
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n{headers}\r\n".encode() + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    payload = await reader.readexactly(length) if length else b""
+    writer.close()
+    return status, json.loads(payload) if payload else None
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def serve(request, tmp_path):
+    """Runs a scenario (an async function of the server) against a fresh store."""
+    def run(scenario):
+        async def main():
+            server = ApiServer(lambda: open_store(request.param, tmp_path), port=0, watch_interval=0)
+            await server.start()
+            try:
+                return await scenario(server)
+            finally:
+                await server.close()
+        return asyncio.run(main())
+    return run
+
+
+def test_crud(serve):
+    async def scenario(server):
+        port = server.port
+        status, task = await request(port, "POST", "/tasks", {"title": "A", "project": "Work/X",
+                                                              "tags": "a, #B", "priority": "high"})
+        assert status == 201 and task["tags"] == ["a", "b"]
+        status, found = await request(port, "GET", f"/tasks/{task['id']}")
+        assert status == 200 and found["project"] == "Work/X"
+        status, page = await request(port, "GET", "/tasks?project=Work")
+        assert [t["id"] for t in page["tasks"]] == [task["id"]]
+        status, conflict = await request(port, "PATCH", f"/tasks/{task['id']}", {"status": "completed", "version": 999})
+        assert status == 409 and conflict["task"]["id"] == task["id"]
+        status, done = await request(port, "PATCH", f"/tasks/{task['id']}",
+                                     {"status": "completed", "version": found["version"]})
+        assert status == 200 and done["status"] == "Completed"
+        assert (await request(port, "DELETE", f"/tasks/{task['id']}"))[0] == 204
+        assert (await request(port, "GET", f"/tasks/{task['id']}"))[0] == 404
+    serve(scenario)
+
+
+def test_pages_follow_the_cursor(serve):
+    async def scenario(server):
+        port = server.port
+        operations = [{"op": "create", "task": {"title": f"b{i}", "tags": ["x"]}} for i in range(50)]
+        status, batch = await request(port, "POST", "/batch", {"operations": operations})
+        assert status == 200 and len(batch["results"]) == 50
+        seen, cursor = [], ""
+        while True:
+            status, page = await request(port, "GET", f"/tasks?tag=x&limit=20{cursor}")
+            seen += [t["id"] for t in page["tasks"]]
+            if not page["next"]:
+                break
+            cursor = f"&cursor={quote(page['next'])}"
+        assert len(seen) == len(set(seen)) == 50
+    serve(scenario)
+
+
+def test_failed_batch_changes_nothing(serve):
+    async def scenario(server):
+        port = server.port
+        _, task = await request(port, "POST", "/tasks", {"title": "keep"})
+        status, _ = await request(port, "POST", "/batch", {"operations": [
+            {"op": "create", "task": {"title": "new"}},
+            {"op": "update", "id": task["id"], "task": {"title": "changed"}},
+            {"op": "delete", "id": "missing"}]})
+        assert status == 404
+        _, page = await request(port, "GET", "/tasks")
+        assert [t["title"] for t in page["tasks"]] == ["keep"]
+        # Changing one task twice is refused up front
+        status, _ = await request(port, "POST", "/batch", {"operations": [
+            {"op": "update", "id": task["id"], "task": {"title": "changed"}},
+            {"op": "update", "id": task["id"], "task": {"title": "again"}}]})
+        assert status == 400
+        _, found = await request(port, "GET", f"/tasks/{task['id']}")
+        assert found["title"] == "keep"
+    serve(scenario)
+
+
+def test_batch_failing_halfway_is_rolled_back(serve):
+    async def scenario(server):
+        _, task = await request(server.port, "POST", "/tasks", {"title": "keep"})
+
+        def failing():
+            server.db.delete_task(task["id"])
+            raise ApiError(404, "gone")
+        results = await server._in_store(server._commit, [(lambda: server._create({"title": "ok"}), False),
+                                                          (failing, True)])
+        assert isinstance(results[1], ApiError)
+        titles = await server._in_store(lambda: sorted(t.title for t in server.db.tasks))
+        assert titles == ["keep", "ok"]
+    serve(scenario)
+
+
+def test_batch_next_to_other_writes(serve):
+    async def scenario(server):
+        port = server.port
+        writes = [request(port, "POST", "/tasks", {"title": f"c{i}"}) for i in range(20)]
+        writes.append(request(port, "POST", "/batch", {"operations": [{"op": "delete", "id": "missing"}]}))
+        results = await asyncio.gather(*writes)
+        assert [status for status, _ in results] == [201] * 20 + [404]
+        assert (await request(port, "GET", "/status"))[1]["tasks"] == 20
+    serve(scenario)
+
+
+def test_bad_requests(serve):
+    async def scenario(server):
+        port = server.port
+        assert (await request(port, "GET", "/tasks?status=bogus"))[0] == 400
+        assert (await request(port, "POST", "/tasks", {"title": ""}))[0] == 400
+        assert (await request(port, "POST", "/tasks", raw_headers="Content-Length: -5\r\n"))[0] == 400
+        assert (await request(port, "POST", "/tasks", raw_headers="Content-Length: x\r\n"))[0] == 400
+        assert (await request(port, "PUT", "/tasks"))[0] == 405
+        assert (await request(port, "GET", "/nothing"))[0] == 404
+    serve(scenario)
+
+
+def test_only_loopback_hosts_are_served(serve):
+    async def scenario(server):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"GET /status HTTP/1.1\r\nHost: evil.com\r\n\r\n")
+        await writer.drain()
+        assert b" 403 " in await reader.readline()
+        writer.close()
+    serve(scenario)
+
+
+def test_changes_are_pushed_to_listeners(serve):
+    async def scenario(server):
+        port = server.port
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET /events HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n\r\n".encode())
+        await writer.drain()
+        await asyncio.sleep(0.05)
+        _, task = await request(port, "POST", "/tasks", {"title": "pushed"})
+        received = b""
+        while b"pushed" not in received:
+            received += await asyncio.wait_for(reader.read(65536), 2)
+        assert b"event: change" in received and task["id"].encode() in received
+        writer.close()
+    serve(scenario)
@@ -0,0 +1,175 @@
+import dataclasses
+import threading
+from src.models.task import Status, Task
+from src.utils.archive import TaskArchive
+from tests.conftest import open_store
+
+
+def archived_store(kind, directory, n=6, old=3):
+    """A store with n completed tasks, the first `old` of them archived."""
+    db = open_store(kind, directory)
+    db.add_many(Task(id=str(i), title=f"t{i}", created_at=1000 + i) for i in range(n))
+    db.complete_many([str(i) for i in range(n)])
+    for i in range(old):
+        task = db.get_task(str(i))
+        db.update_task(dataclasses.replace(task, completed_at=task.completed_at - 100000))
+    assert db.archive_completed(50000) == old
+    return db
+
+
+def test_archived_tasks_leave_the_store_but_stay_readable(file_kind, tmp_path):
+    db = archived_store(file_kind, tmp_path)
+    assert db.get_task("0") is None and db.get_task("0", include_archived=True).title == "t0"
+    assert len(db.get_tasks(Status.COMPLETED)) == 3
+    ids = [t.id for t in db.query(Status.COMPLETED, include_archived=True)]
+    assert ids == ["5", "4", "3", "2", "1", "0"]
+    db.close()
+    db = open_store(file_kind, tmp_path)
+    assert len(db.get_tasks(include_archived=True)) == 6
+    db.close()
+
+
+def test_updating_an_archived_task_restores_it(file_kind, tmp_path):
+    db = archived_store(file_kind, tmp_path)
+    task = dataclasses.replace(db.get_task("0", include_archived=True))
+    task.mark_pending()
+    db.update_task(task)
+    db.close()
+    db = open_store(file_kind, tmp_path)
+    assert db.get_task("0").status == Status.PENDING
+    db.close()
+
+
+def test_archived_tasks_are_deleted_inside_transactions_too(file_kind, tmp_path):
+    db = archived_store(file_kind, tmp_path)
+    assert db.delete_task("0")
+    with db.transaction():
+        assert db.delete_many(["1", "3"]) == 2
+        assert db.delete_task("2")
+    db.close()
+    db = open_store(file_kind, tmp_path)
+    assert sorted(t.id for t in db.get_tasks(include_archived=True)) == ["4", "5"]
+    db.close()
+
+
+def test_rolled_back_transaction_keeps_archived_tasks(file_kind, tmp_path):
+    db = archived_store(file_kind, tmp_path)
+    try:
+        with db.transaction():
+            db.delete_many(["0", "1"])
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert db.get_task("0", include_archived=True) is not None
+    db.close()
+
+
+def test_line_separators_in_titles_survive(tmp_path):
+    archive = TaskArchive(tmp_path / "a")
+    task = Task(id="1", title="a b c\x85d\re")
+    archive.put_many([task])
+    assert TaskArchive(tmp_path / "a").get("1").title == task.title
+
+
+def test_torn_frame_is_dropped_and_appends_continue(tmp_path):
+    path = tmp_path / "a"
+    archive = TaskArchive(path)
+    archive.put_many([Task(id="1", title="a")])
+    with open(path, "ab") as f:
+        f.write(b"\x50\x00\x00\x00garbage")
+    TaskArchive(path).put_many([Task(id="2", title="b")])
+    assert set(TaskArchive(path).load()) == {"1", "2"}
+
+
+def test_frame_with_a_bad_checksum_is_cut_before_appending(tmp_path):
+    path = tmp_path / "a"
+    TaskArchive(path).put_many([Task(id="1", title="a")])
+    TaskArchive(path).put_many([Task(id="2", title="b")])
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF  # Complete length, corrupt payload
+    path.write_bytes(bytes(data))
+    TaskArchive(path).put_many([Task(id="3", title="c")])
+    assert set(TaskArchive(path).load()) == {"1", "3"}
+
+
+def test_appends_from_another_instance_are_picked_up(tmp_path):
+    path = tmp_path / "a"
+    mine, other = TaskArchive(path), TaskArchive(path)
+    mine.put_many([Task(id="1", title="a")])
+    assert set(mine.load()) == {"1"}
+    other.put_many([Task(id="2", title="b")])
+    mine.put_many([Task(id="3", title="c")])
+    other.delete_many(["1"])
+    assert set(mine.load()) == {"2", "3"}
+    assert set(TaskArchive(path).load()) == {"2", "3"}
+
+
+def test_restored_task_archived_again_stays_archived(tmp_path):
+    db = archived_store("json", tmp_path, n=1, old=1)
+    db.update_task(dataclasses.replace(db.get_task("0", include_archived=True), title="restored"))
+    assert db.archive_completed(10) == 1
+    db.close()
+    db = open_store("json", tmp_path)
+    assert db.get_task("0", include_archived=True).title == "restored"
+    db.close()
+
+
+def test_lookups_of_unarchived_ids_do_not_load_the_archive(file_kind, tmp_path):
+    archived_store(file_kind, tmp_path).close()
+    db = open_store(file_kind, tmp_path)
+    assert not db.delete_task("missing") and db.get_task("4", include_archived=True)
+    db.update_task(Task(id="missing", title="x"))
+    assert db.get_task("missing") is None and not db._archive.loaded
+    assert db.get_task("0", include_archived=True).title == "t0" and db._archive.loaded
+    db.close()
+
+
+def test_id_sidecar_follows_appends_and_is_rebuilt_when_missing(tmp_path):
+    path = tmp_path / "a"
+    mine, other = TaskArchive(path), TaskArchive(path)
+    mine.put_many([Task(id="1", title="a"), Task(id="2", title="b")])
+    assert other.get("1").title == "a"
+    other = TaskArchive(path)
+    mine.delete_many(["1"])
+    assert other.get("1") is None and not other.loaded
+    (tmp_path / "a.ids").unlink()
+    mine = TaskArchive(path)
+    mine.put_many([Task(id="3", title="c")])
+    assert not mine.loaded
+    other = TaskArchive(path)
+    assert other.get("9") is None and not other.loaded
+    assert other.get("2").title == "b" and other.get("3").title == "c"
+
+
+def test_listed_id_missing_from_the_archive_is_not_found(tmp_path):
+    path = tmp_path / "a"
+    TaskArchive(path).put_many([Task(id="1", title="a")])
+    with open(tmp_path / "a.ids", "a") as f:
+        f.write("+2\n")  # A crash between the sidecar and the frame
+    assert TaskArchive(path).get("2") is None
+
+
+def test_archiving_while_a_deleted_restore_is_pending(file_kind, tmp_path):
+    db = archived_store(file_kind, tmp_path)
+    db.update_task(dataclasses.replace(db.get_task("0", include_archived=True), title="restored"))
+    db.update_task(dataclasses.replace(db.get_task("3"), completed_at=1))
+    drop = db._drop_deleted_restores
+    archived = []
+
+    def archive_first(io_locked=False):
+        # Archive in the window between deleting the restored task and
+        # dropping its archive entry
+        db._drop_deleted_restores = drop
+        archived.append(db.archive_completed(50000))
+        drop(io_locked)
+    db._drop_deleted_restores = archive_first
+    thread = threading.Thread(target=db.delete_task, args=("0",), daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive() and archived == [1]
+    assert db.get_task("0", include_archived=True) is None and db.get_task("3", include_archived=True)
+    db.close()
+    db = open_store(file_kind, tmp_path)
+    assert sorted(t.id for t in db.get_tasks(include_archived=True)) == ["1", "2", "3", "4", "5"]
+    db.close()
+
@@ -0,0 +1,53 @@
+from src.models.task import Priority, Status, Task
+from src.utils.binary_snapshot import BinarySnapshot, binary_to_json, is_binary_snapshot, json_to_binary, write_binary
+
+
+def sample():
+    tasks = [Task(id=str(i), title=f"tarefa {i} ç", description=None if i % 2 else "desc",
+                  priority=list(Priority)[i % 3], created_at=1000 + i) for i in range(20)]
+    for task in tasks[::4]:
+        task.mark_completed()
+    return tasks
+
+
+def test_reads_back_what_was_written(tmp_path):
+    tasks = sample()
+    write_binary(tmp_path / "x.tdb", tasks)
+    assert is_binary_snapshot(tmp_path / "x.tdb")
+    with BinarySnapshot(tmp_path / "x.tdb") as snapshot:
+        assert len(snapshot) == 20
+        assert [t.to_dict() for t in snapshot] == [t.to_dict() for t in tasks]
+        assert snapshot.task(3) == tasks[3]
+
+
+
+def test_tags_with_commas_and_brackets_read_back(tmp_path):
+    tasks = [Task(id="t", title="ç", tags=("[wip]", "x,y", '["a"]'), due_at=5)]
+    write_binary(tmp_path / "x.tdb", tasks)
+    with BinarySnapshot(tmp_path / "x.tdb") as snapshot:
+        assert [t.to_dict() for t in snapshot] == [t.to_dict() for t in tasks]
+
+def test_select_filters_without_decoding_tasks(tmp_path):
+    tasks = sample()
+    write_binary(tmp_path / "x.tdb", tasks)
+    with BinarySnapshot(tmp_path / "x.tdb") as snapshot:
+        assert snapshot.select(Status.COMPLETED) == [i for i, t in enumerate(tasks) if t.is_completed]
+        assert snapshot.select(Status.PENDING, Priority.HIGH) == \
+            [i for i, t in enumerate(tasks) if not t.is_completed and t.priority == Priority.HIGH]
+        assert snapshot.status_of(0) == Status.COMPLETED
+
+
+def test_converts_to_and_from_json(tmp_path):
+    tasks = sample()
+    write_binary(tmp_path / "x.tdb", tasks)
+    assert binary_to_json(tmp_path / "x.tdb", tmp_path / "x.json") == 20
+    assert not is_binary_snapshot(tmp_path / "x.json")
+    assert json_to_binary(tmp_path / "x.json", tmp_path / "y.tdb") == 20
+    with BinarySnapshot(tmp_path / "y.tdb") as snapshot:
+        assert list(snapshot) == tasks
+
+
+def test_empty_snapshot(tmp_path):
+    write_binary(tmp_path / "x.tdb", [])
+    with BinarySnapshot(tmp_path / "x.tdb") as snapshot:
+        assert len(snapshot) == 0 and list(snapshot) == []
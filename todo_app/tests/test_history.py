@@ -0,0 +1,114 @@
+import dataclasses
+from src.models.task import Task
+from src.utils.events import BATCH
+from src.utils.history import UndoHistory
+from tests.conftest import open_store
+
+
+def test_undo_and_redo_a_step(kind, tmp_path):
+    db = open_store(kind, tmp_path)
+    db.add_many(Task(id=str(i), title=f"t{i}") for i in range(100))
+    history = UndoHistory(db, tmp_path / "history")
+    ids = [str(i) for i in range(50)]
+    with history.step("Excluir", ids):
+        db.delete_many(ids)
+    events = []
+    db.subscribe(lambda action, task: events.append(action))
+    assert history.undo() == ("Excluir", 0)
+    assert len(db.tasks) == 100 and events == [BATCH]
+    assert history.redo() == ("Excluir", 0)
+    assert len(db.tasks) == 50
+    db.close()
+
+
+def test_history_survives_restarts(kind, tmp_path):
+    db = open_store(kind, tmp_path)
+    history = UndoHistory(db, tmp_path / "history")
+    task = db.add_task("a")
+    history.record("Adicionar", [(None, task)])
+    with history.step("Concluir", [task.id]):
+        db.complete_many([task.id])
+    history.undo()
+    history = UndoHistory(db, tmp_path / "history")
+    assert history.can_undo and history.can_redo
+    history.redo()
+    assert db.get_task(task.id).is_completed
+    db.close()
+
+
+def test_task_changed_since_is_a_conflict(kind, tmp_path):
+    db = open_store(kind, tmp_path)
+    history = UndoHistory(db, tmp_path / "history")
+    task = db.add_task("a")
+    with history.step("Concluir", [task.id]):
+        db.complete_many([task.id])
+    db.update_task(dataclasses.replace(db.get_task(task.id), title="changed"))
+    assert history.undo() == ("Concluir", 1)
+    assert db.get_task(task.id).title == "changed"
+    db.close()
+
+
+def test_rewritten_journal_keeps_the_newest_steps(tmp_path):
+    db = open_store("json", tmp_path)
+    history = UndoHistory(db, tmp_path / "history", limit=5)
+    for i in range(40):
+        history.record(f"s{i}", [(None, db.add_task(f"n{i}"))])
+    for _ in range(3):
+        history.undo()
+    for i in range(40, 60):
+        history.record(f"s{i}", [(None, db.add_task(f"n{i}"))])
+        history.undo()
+    undo, redo = history._stacks()
+    assert len(undo) + len(redo) <= 5
+    lines = sum(1 for _ in open(tmp_path / "history"))
+    assert lines <= 3 * 5 + 1
+    reloaded = UndoHistory(db, tmp_path / "history", limit=5)
+    assert [step[0] for step in reloaded._stacks()[0]] == [step[0] for step in undo]
+    assert [step[0] for step in reloaded._stacks()[1]] == [step[0] for step in redo]
+    db.close()
+
+
+def test_undo_add_of_an_archived_task(file_kind, tmp_path):
+    db = open_store(file_kind, tmp_path)
+    history = UndoHistory(db, tmp_path / "history")
+    task = db.add_task("a")
+    history.record("Adicionar", [(None, task)])
+    db.complete_many([task.id])
+    archived = dataclasses.replace(db.get_task(task.id), completed_at=1)
+    db.update_task(archived)
+    history.record("Concluir", [(task, archived)])
+    assert db.archive_completed(10) == 1
+    history.undo()
+    assert history.undo() == ("Adicionar", 0)
+    assert db.get_task(task.id, include_archived=True) is None
+    db.close()
+    db = open_store(file_kind, tmp_path)
+    assert db.get_task(task.id, include_archived=True) is None
+    db.close()
+
+
+def test_steps_over_live_tasks_leave_the_archive_alone(file_kind, tmp_path):
+    db = open_store(file_kind, tmp_path)
+    old = db.add_task("old")
+    db.complete_many([old.id])
+    db.update_task(dataclasses.replace(db.get_task(old.id), completed_at=1))
+    assert db.archive_completed(10) == 1
+    db.close()
+    db = open_store(file_kind, tmp_path)
+    history = UndoHistory(db, tmp_path / "history")
+    db.add_many(Task(id=str(i), title=f"t{i}") for i in range(20))
+    ids = [str(i) for i in range(20)]
+    with history.step("Concluir", ids):
+        db.complete_many(ids)
+    history.undo()
+    assert not db._archive.loaded
+    # An archived task the block leaves alone is not recorded as deleted
+    with history.step("Excluir", ["0", old.id]):
+        db.delete_task("0")
+    assert history.undo() == ("Excluir", 0) and db.get_task("0")
+    assert db.get_task(old.id, include_archived=True).title == "old"
+    with history.step("Excluir", [old.id]):
+        db.delete_task(old.id)
+    assert db.get_task(old.id, include_archived=True) is None
+    assert history.undo() == ("Excluir", 0) and db.get_task(old.id).title == "old"
+    db.close()
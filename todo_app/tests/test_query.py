@@ -0,0 +1,130 @@
+import dataclasses
+import pytest
+from src.models.task import Priority, Status
+from src.utils.ordering import SORT_KEYS, PagedTasks, cursor_for
+from src.utils.sqlite_database import _SELECT_DUE_BEFORE
+from tests.conftest import open_store
+
+
+@pytest.fixture
+def db(kind, tmp_path):
+    """A store of 30 tasks with distinct creation times, every third one completed."""
+    db = open_store(kind, tmp_path)
+    for i in range(30):
+        task = dataclasses.replace(db.add_task(f"t{i}", priority=list(Priority)[i % 3]), created_at=1000 + i)
+        if i % 3 == 0:
+            task.mark_completed()
+        db.update_task(task)
+    yield db
+    db.close()
+
+
+@pytest.mark.parametrize("order_by", ["created_at", "priority", "completed_at"])
+@pytest.mark.parametrize("status", [None, Status.PENDING, Status.COMPLETED])
+@pytest.mark.parametrize("descending", [True, False])
+def test_query_matches_a_sort(db, order_by, status, descending):
+    expected = sorted((t for t in db.get_tasks() if status is None or t.status == status),
+                      key=SORT_KEYS[order_by], reverse=descending)
+    assert [t.id for t in db.query(status, order_by=order_by, descending=descending)] == [t.id for t in expected]
+
+
+def test_pages_by_offset_and_cursor(db):
+    everything = [t.id for t in db.query()]
+    assert [t.id for t in db.query(offset=5, limit=5)] == everything[5:10]
+    pages, cursor = [], None
+    while True:
+        page = list(db.query(limit=7, cursor=cursor))
+        if not page:
+            break
+        pages += [t.id for t in page]
+        cursor = cursor_for(page[-1])
+    assert pages == everything
+
+
+def test_priority_filter(db):
+    ids = [t.id for t in db.query(Status.PENDING, Priority.HIGH)]
+    assert ids == [t.id for t in sorted(db.get_tasks(Status.PENDING, Priority.HIGH),
+                                        key=SORT_KEYS["created_at"], reverse=True)]
+    assert len(ids) == 10
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_priority_filter_with_priority_cursors(db, descending):
+    tasks = sorted(db.get_tasks(), key=SORT_KEYS["priority"], reverse=descending)
+    for after in (tasks[0], tasks[15], tasks[-1]):
+        key = SORT_KEYS["priority"](after)
+        expected = [t.id for t in tasks if t.priority == Priority.MEDIUM and
+                    (SORT_KEYS["priority"](t) < key if descending else SORT_KEYS["priority"](t) > key)]
+        found = db.query(priority=Priority.MEDIUM, order_by="priority", descending=descending,
+                         cursor=cursor_for(after, "priority"))
+        assert [t.id for t in found] == expected
+
+
+def test_count_matches_the_query(db):
+    for i, task in enumerate(db.query(order_by="created_at", descending=False)):
+        db.update_task(dataclasses.replace(task, project="Work/A" if i % 2 else "Home", tags=("x",) if i % 5 else ()))
+    db.archive_completed(-10)
+    for status in (None, Status.PENDING, Status.COMPLETED):
+        for priority in (None, Priority.HIGH):
+            for project, tag in ((None, None), ("Work", None), (None, "x"), ("Home", "x")):
+                filters = dict(status=status, priority=priority, project=project, tag=tag,
+                               include_archived=status == Status.COMPLETED)
+                assert db.count(**filters) == len(list(db.query(**filters))), filters
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_paged_tasks_fetch_only_what_is_read(db, descending):
+    fetched = []
+
+    def fetch(cursor, limit):
+        fetched.append(limit)
+        return db.query(order_by="priority", descending=descending, cursor=cursor, limit=limit)
+    pages = PagedTasks(fetch, db.count, "priority", page_size=8)
+    everything = [t.id for t in db.query(order_by="priority", descending=descending)]
+    assert len(pages) == 30 and fetched == []
+    assert pages[3].id == everything[3] and len(pages.loaded) == 8
+    assert pages.load(20) == 20 and fetched == [8, 12]
+    assert [t.id for t in pages] == everything and pages.complete
+
+
+def test_paged_tasks_follow_changes(db):
+    pages = PagedTasks(lambda cursor, limit: db.query(cursor=cursor, limit=limit), db.count, "created_at", 10)
+    pages.load(10)
+    # The newest task goes first, among the loaded rows
+    pages.insert(0, db.add_task("new"))
+    pages.recount()
+    assert len(pages) == 31
+    # The oldest one leaves from the rows not loaded yet
+    db.delete_task(next(iter(db.query(order_by="created_at", descending=False))).id)
+    pages.recount()
+    assert len(pages) == 30
+    assert [t.id for t in pages] == [t.id for t in db.query()] and len(pages) == 30
+
+
+def test_paged_tasks_correct_a_stale_count(db):
+    pages = PagedTasks(lambda cursor, limit: db.query(cursor=cursor, limit=limit), lambda: 100, "created_at")
+    assert len(pages) == 100 and pages.load(50) == 30 and len(pages) == 30
+
+
+def plan(db, sql, params):
+    return " | ".join(row["detail"] for row in db.conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+
+# (order_by, status, priority) filters the app pages through
+PAGED = [(order_by, status, None) for order_by in ("created_at", "priority", "completed_at", "due_at")
+         for status in (None, Status.PENDING, Status.COMPLETED)] + \
+        [(order_by, status, Priority.HIGH) for order_by in ("created_at", "priority") for status in (None, Status.PENDING)]
+
+
+@pytest.mark.parametrize("order_by, status, priority", PAGED)
+@pytest.mark.parametrize("descending", [True, False])
+def test_sqlite_pages_are_read_in_index_order(tmp_path, order_by, status, priority, descending):
+    db = open_store("sqlite", tmp_path)
+    task = db.add_task("a", due_at=10)
+    for cursor in (None, cursor_for(task, order_by)):
+        sql, params = db._query_sql(status, priority, order_by, descending, 20, 50, cursor, None, None)
+        detail = plan(db, sql, params)
+        assert "TEMP B-TREE" not in detail and "USING INDEX" in detail
+    assert "TEMP B-TREE" not in plan(db, _SELECT_DUE_BEFORE, (100,))
+    db.close()
+
@@ -0,0 +1,62 @@
+import dataclasses
+from src.models.task import Task, now
+from src.utils.scheduler import DUE, REMIND, DeadlineScheduler
+from tests.conftest import open_store
+
+
+def test_deadlines_fire_once_in_order():
+    scheduler = DeadlineScheduler()
+    scheduler.schedule_many([Task(id="a", title="a", due_at=100, remind_at=50), Task(id="b", title="b", due_at=70)])
+    assert scheduler.next_deadline() == 50
+    assert scheduler.pop_due(80) == [(REMIND, "a"), (DUE, "b")]
+    assert scheduler.pop_due(80) == []
+    assert scheduler.next_deadline() == 100
+
+
+def test_changed_deadline_fires_again():
+    scheduler = DeadlineScheduler()
+    task = Task(id="a", title="a", due_at=10)
+    scheduler.schedule(task)
+    assert scheduler.pop_due(10) == [(DUE, "a")]
+    scheduler.schedule(dataclasses.replace(task, due_at=20))
+    assert scheduler.pop_due(20) == [(DUE, "a")]
+
+
+def test_reschedule_after_unschedule_does_not_fire_twice():
+    scheduler = DeadlineScheduler()
+    task = Task(id="a", title="a", due_at=100, remind_at=50)
+    scheduler.schedule(task)
+    assert scheduler.pop_due(60) == [(REMIND, "a")]
+    scheduler.unschedule("a")
+    scheduler.schedule(task)
+    assert scheduler.pop_due(60) == []
+    assert scheduler.pop_due(100) == [(DUE, "a")]
+    scheduler.unschedule("a")
+    scheduler.schedule(task)
+    assert scheduler.next_deadline() is None
+
+
+def test_rolled_back_transaction_does_not_repeat_a_reminder(kind, tmp_path):
+    at = now()
+    db = open_store(kind, tmp_path)
+    task = db.add_task("a", due_at=at + 1000, remind_at=at - 10)
+    assert [(k, t.id) for k, t in db.pop_due(at)] == [(REMIND, task.id)]
+    try:
+        with db.transaction():
+            db.delete_task(task.id)
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert db.pop_due(at) == [] and db.next_deadline() == at + 1000
+    db.close()
+
+
+def test_missed_deadlines_fire_after_reopening(kind, tmp_path):
+    at = now()
+    db = open_store(kind, tmp_path)
+    db.add_task("a", due_at=at - 5)
+    db.add_task("b")
+    db.close()
+    db = open_store(kind, tmp_path)
+    assert db.next_deadline() == at - 5
+    db.close()
@@ -0,0 +1,42 @@
+import dataclasses
+from src.models.task import Status, Task
+from src.utils.search import SearchIndex, matches
+from tests.conftest import open_store
+
+
+def test_matching_ignores_case_and_accents_and_completes_the_last_word():
+    task = Task(id="1", title="Reunião com a Diretoria", description="Pauta média")
+    assert matches(task, "reuniao dire")
+    assert matches(task, "MEDIA")
+    assert not matches(task, "reun diretoria")  # Only the last word is a prefix
+    assert matches(task, "")
+
+
+def test_index_agrees_with_matches():
+    tasks = [Task(id=str(i), title=title) for i, title in
+             enumerate(["Comprar pão", "Comprar leite", "Pagar conta", "Ligar para a mãe"])]
+    index = SearchIndex()
+    for task in tasks:
+        index.add(task)
+    for query in ("comp", "comprar p", "mae", "a", "xyz", ""):
+        assert index.search(query) == {t.id for t in tasks if matches(t, query)}, query
+    index.remove("0")
+    index.add(dataclasses.replace(tasks[1], title="Vender leite"))
+    assert index.search("comprar") == set() and index.search("vend") == {"1"}
+    assert len(index) == 3
+
+
+def test_store_search_follows_changes(kind, tmp_path):
+    db = open_store(kind, tmp_path)
+    db.search("warm up")  # Builds the index before the changes below
+    task = db.add_task("Relatório mensal", "enviar à gerência")
+    other = db.add_task("Relatório anual")
+    assert {t.id for t in db.search("relatorio")} == {task.id, other.id}
+    assert [t.id for t in db.search("gerencia")] == [task.id]
+    done = dataclasses.replace(db.get_task(other.id))
+    done.mark_completed()
+    db.update_task(done)
+    assert [t.id for t in db.search("relat", Status.COMPLETED)] == [other.id]
+    db.delete_task(task.id)
+    assert db.search("mensal") == []
+    db.close()
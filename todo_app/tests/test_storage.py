@@ -0,0 +1,213 @@
+import dataclasses
+import threading
+import time
+import pytest
+from src.models.task import Priority, Status, Task
+from src.utils.events import BATCH
+from src.utils.filelock import FileLock
+from tests.conftest import open_store
+
+
+def sample(n):
+    return [Task(id=str(i), title=f"t{i}", created_at=1000 + i, priority=list(Priority)[i % 3],
+                 project="Casa" if i % 2 else None, tags=("x",) if i % 3 == 0 else ())
+            for i in range(n)]
+
+
+def completed(task: Task) -> Task:
+    """A completed copy of a stored task (stores hand out their own objects)."""
+    task = dataclasses.replace(task)
+    task.mark_completed()
+    return task
+
+
+def test_tasks_survive_reopening(kind, tmp_path):
+    db = open_store(kind, tmp_path)
+    kept = db.add_task("kept", "desc")
+    gone = db.add_task("gone")
+    done = db.add_task("done")
+    db.delete_task(gone.id)
+    db.update_task(completed(db.get_task(done.id)))
+    db.close()
+    db = open_store(kind, tmp_path)
+    assert sorted(task.title for task in db.get_tasks()) == ["done", "kept"]
+    assert db.get_task(kept.id).description == "desc"
+    assert db.get_task(done.id).is_completed
+    db.close()
+
+
+def test_log_is_compacted_into_the_snapshot(tmp_path):
+    db = open_store("wal", tmp_path, compact_threshold=5)
+    ids = [db.add_task(f"t{i}").id for i in range(12)]
+    db.close()
+    assert (tmp_path / "tasks.json").stat().st_size > 2
+    db = open_store("wal", tmp_path)
+    assert sorted(task.id for task in db.get_tasks()) == sorted(ids)
+    db.close()
+
+
+def test_torn_log_record_is_dropped_on_load(tmp_path):
+    db = open_store("wal", tmp_path)
+    task = db.add_task("a")
+    db.close()
+    with open(tmp_path / "tasks.json.wal", "ab") as f:
+        f.write(b'0000abcd {"op":"put","task":')
+    db = open_store("wal", tmp_path)
+    assert [t.id for t in db.get_tasks()] == [task.id]
+    db.close()
+
+
+def test_tag_edge_cases_round_trip(kind, tmp_path):
+    tags = ("[wip]", "x,y", '["a"]', "ç")
+    db = open_store(kind, tmp_path)
+    task = db.add_task("a", tags=tags)
+    db.close()
+    db = open_store(kind, tmp_path)
+    assert db.get_task(task.id).tags == tags
+    assert [t.id for t in db.query(tag="x,y")] == [task.id]
+    db.close()
+
+
+def test_duplicate_tags_do_not_break_writes(kind, tmp_path):
+    db = open_store(kind, tmp_path)
+    db.add_many([Task(id="1", title="a", tags=("x", "x")), Task.from_dict({"id": "2", "title": "b", "tags": "y,y"})])
+    assert db.get_task("2").tags == ("y",)
+    assert db.tag_counts()["x"] == (1, 0)
+    db.close()
+
+
+def test_status_and_priority_buckets_follow_changes(kind, tmp_path):
+    db = open_store(kind, tmp_path)
+    high = db.add_task("high", priority=Priority.HIGH)
+    low = db.add_task("low", priority=Priority.LOW)
+    db.update_task(completed(db.get_task(high.id)))
+    assert [t.id for t in db.get_tasks(Status.COMPLETED)] == [high.id]
+    assert [t.id for t in db.get_tasks(Status.PENDING, Priority.LOW)] == [low.id]
+    assert db.get_tasks(Status.PENDING, Priority.HIGH) == []
+    db.delete_task(low.id)
+    assert db.get_tasks(priority=Priority.LOW) == []
+    db.close()
+
+
+@pytest.mark.parametrize("file_kind", ["json", "wal"])
+def test_sqlite_imports_a_json_store(file_kind, tmp_path):
+    db = open_store(file_kind, tmp_path)
+    ids = {db.add_task(f"t{i}").id for i in range(5)}
+    db.close()
+    if file_kind == "wal":
+        db = open_store("wal", tmp_path)
+        db.save_tasks()  # Fold the log into tasks.json
+        db.close()
+    sqlite = open_store("sqlite", tmp_path)
+    assert sqlite.is_empty()
+    assert sqlite.import_json(tmp_path / "tasks.json") == 5
+    assert {task.id for task in sqlite.get_tasks()} == ids
+    # Re-running replaces instead of duplicating
+    assert sqlite.import_json(tmp_path / "tasks.json") == 5 and len(sqlite.tasks) == 5
+    sqlite.close()
+
+
+def test_projects_and_tags_are_counted_and_queried(kind, tmp_path):
+    db = open_store(kind, tmp_path)
+    db.add_many(sample(30))
+    db.complete_many(["1", "3"])
+    assert {t.id for t in db.query(project="Casa")} == {str(i) for i in range(1, 30, 2)}
+    assert db.project_counts()["Casa"] == (13, 2)
+    assert db.tag_counts()["x"] == (9, 1)
+    db.close()
+    db = open_store(kind, tmp_path)
+    assert db.project_counts()["Casa"] == (13, 2)
+    db.close()
+
+
+def test_lazy_load_streams_everything(file_kind, tmp_path):
+    db = open_store(file_kind, tmp_path)
+    ids = [db.add_task(f"t{i}").id for i in range(300)]
+    db.close()
+    db = open_store(file_kind, tmp_path, lazy=True)
+    db.poll_loading()  # Merges whatever was read so far
+    db.finish_loading()
+    assert not db.loading
+    assert sorted(t.id for t in db.tasks) == sorted(ids) and db.get_task(ids[-1]).title == "t299"
+    task = db.add_task("after load")
+    db.close()
+    db = open_store(file_kind, tmp_path)
+    assert len(db.tasks) == 301 and db.get_task(task.id)
+    db.close()
+
+
+def test_bulk_changes_notify_once(kind, tmp_path):
+    db = open_store(kind, tmp_path)
+    events = []
+    db.subscribe(lambda action, task: events.append(action))
+    db.add_many(sample(50))
+    assert db.complete_many([str(i) for i in range(10)]) == 10
+    assert db.delete_many(["0", "1", "missing"]) == 2
+    assert events == [BATCH] * 3
+    db.close()
+
+
+def test_transaction_rolls_back(kind, tmp_path):
+    db = open_store(kind, tmp_path)
+    db.add_many(sample(5))
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.delete_task("1")
+            db.add_task("x")
+            db.update_task(dataclasses.replace(db.get_task("2"), title="changed"))
+            raise RuntimeError
+    assert len(db.tasks) == 5 and db.get_task("1") and db.get_task("2").title == "t2"
+    assert len(list(db.query())) == 5
+    db.close()
+
+
+def test_two_instances_merge_their_changes(file_kind, tmp_path):
+    a = open_store(file_kind, tmp_path)
+    a.add_many(sample(10))
+    a.flush()
+    b = open_store(file_kind, tmp_path)
+    a.add_task("from a")
+    b.add_task("from b")
+    b.delete_task("2")
+    a.flush()
+    b.flush()
+    a.poll_changes()
+    b.poll_changes()
+    for db in (a, b):
+        titles = {t.title for t in db.tasks}
+        assert {"from a", "from b"} <= titles and "t2" not in titles
+    # Conflicting edits: the first writer wins
+    a.update_task(dataclasses.replace(a.get_task("3"), title="A"))
+    a.flush()
+    b.update_task(dataclasses.replace(b.get_task("3"), title="B"))
+    b.flush()
+    a.poll_changes()
+    assert a.get_task("3").title == b.get_task("3").title == "A"
+    a.close()
+    b.close()
+    assert open_store(file_kind, tmp_path).get_task("3").title == "A"
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    first, second = FileLock(tmp_path / "lock"), FileLock(tmp_path / "lock")
+    order = []
+    first.acquire()
+    thread = threading.Thread(target=lambda: (second.acquire(), order.append("second"), second.release()))
+    thread.start()
+    time.sleep(0.1)
+    order.append("first")
+    first.release()
+    thread.join(5)
+    assert order == ["first", "second"]
+
+
+def test_unreadable_snapshot_is_set_aside_not_overwritten(file_kind, tmp_path):
+    db = open_store(file_kind, tmp_path)
+    db.add_task("a")
+    db.close()
+    path = tmp_path / ("tasks.tdb" if file_kind == "binary" else "tasks.json")
+    path.write_bytes(b"TDBS garbage" if file_kind == "binary" else b"{not json")
+    db = open_store(file_kind, tmp_path)
+    db.add_task("b")
+    db.close()
+    assert (tmp_path / (path.name + ".corrupt")).read_bytes() in (b"TDBS garbage", b"{not json")
@@ -0,0 +1,46 @@
+import io
+import json
+import pytest
+from src.models.task import Task
+from src.utils.stream import iter_json_array, iter_records, write_records
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_reads_items_across_chunks(tmp_path, chunk_size):
+    items = [{"id": str(i), "title": f'a "quoted" ] [ , {i}', "description": "ç\n\\"} for i in range(20)]
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
+    assert list(iter_json_array(path, chunk_size)) == items
+
+
+def test_empty_inputs(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text("", encoding="utf-8")
+    assert list(iter_json_array(path)) == []
+    path.write_text(" [ ] ", encoding="utf-8")
+    assert list(iter_json_array(path)) == []
+
+
+@pytest.mark.parametrize("text", ['{"id": "1"}', '[{"id": "1"}, {"id": '])
+def test_malformed_files_raise(tmp_path, text):
+    path = tmp_path / "tasks.json"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(path, chunk_size=4))
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+def test_records_round_trip(fmt):
+    tasks = [Task(id="1", title='a, "b"\nc', description="ç", due_at=5, tags=("x,y", "[wip]", "ç")),
+             Task(id="2", title="x", project="Casa/Cozinha", tags=('["a"]',)), Task(id="3", title="y")]
+    out = io.StringIO()
+    assert write_records(out, (task.to_dict() for task in tasks), fmt) == 3
+    read = [Task.from_dict(record) for _, record in iter_records(io.StringIO(out.getvalue()), fmt)]
+    assert [task.to_dict() for task in read] == [task.to_dict() for task in tasks]
+
+
+def test_hand_written_csv_tags_are_split_on_commas():
+    rows = io.StringIO('id,title,tags\n1,a,"casa,urgente"\n2,b,[wip]\n3,c,\n')
+    tasks = [Task.from_dict(record) for _, record in iter_records(rows, "csv")]
+    assert [task.tags for task in tasks] == [("casa", "urgente"), ("[wip]",), ()]
+
@@ -0,0 +1,118 @@
+import dataclasses
+import gzip
+import http.client
+import json
+import threading
+import pytest
+from src.utils import sync_server
+from src.utils.sync import PROTOCOL, SyncClient
+from src.utils.sync_server import SyncServer, SyncStore
+from tests.conftest import open_store
+
+
+@pytest.fixture
+def server(tmp_path):
+    store = SyncStore(tmp_path / "server.jsonl")
+    server = SyncServer(("127.0.0.1", 0), store)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    store.close()
+
+
+def machines(url, tmp_path, first, second):
+    """Two stores of the given kinds, each with its sync client."""
+    a_dir, b_dir = tmp_path / "a", tmp_path / "b"
+    a_dir.mkdir()
+    b_dir.mkdir()
+    a, b = open_store(first, a_dir, change_feed=True), open_store(second, b_dir, change_feed=True)
+    return a, b, SyncClient(a, url, a_dir / "sync", batch_size=7), SyncClient(b, url, b_dir / "sync", batch_size=7)
+
+
+@pytest.mark.parametrize("first, second", [("json", "sqlite"), ("wal", "binary")])
+def test_changes_reach_the_other_machine(server, tmp_path, first, second):
+    a, b, sync_a, sync_b = machines(server, tmp_path, first, second)
+    tasks = [a.add_task(f"t{i}") for i in range(30)]
+    assert sync_a.sync() == (30, 0)
+    assert sync_b.sync() == (0, 30)
+    assert sync_a.sync() == (0, 0) and sync_b.sync() == (0, 0)
+    b.update_task(dataclasses.replace(b.get_task(tasks[0].id), title="edited"))
+    b.delete_task(tasks[1].id)
+    sync_b.sync()
+    sync_a.sync()
+    assert a.get_task(tasks[0].id).title == "edited" and a.get_task(tasks[1].id) is None
+    a.close()
+    b.close()
+
+
+def test_first_machine_to_sync_wins_a_conflict(server, tmp_path):
+    a, b, sync_a, sync_b = machines(server, tmp_path, "json", "sqlite")
+    task = a.add_task("t")
+    sync_a.sync()
+    sync_b.sync()
+    a.update_task(dataclasses.replace(a.get_task(task.id), title="A"))
+    b.update_task(dataclasses.replace(b.get_task(task.id), title="B"))
+    sync_b.sync()
+    sync_a.sync()
+    sync_b.sync()
+    assert a.get_task(task.id).title == b.get_task(task.id).title == "B"
+    a.close()
+    b.close()
+
+
+def test_remote_delete_removes_an_archived_task(server, tmp_path):
+    a, b, sync_a, sync_b = machines(server, tmp_path, "json", "json")
+    task = a.add_task("t")
+    a.complete_many([task.id])
+    a.update_task(dataclasses.replace(a.get_task(task.id), completed_at=1))
+    sync_a.sync()
+    sync_b.sync()
+    assert a.archive_completed(10) == 1
+    b.delete_task(task.id)
+    sync_b.sync()
+    sync_a.sync()
+    assert a.get_task(task.id, include_archived=True) is None
+    a.close()
+    a = open_store("json", tmp_path / "a")
+    assert a.get_task(task.id, include_archived=True) is None
+    a.close()
+    b.close()
+
+
+def test_server_log_is_replayed(server, tmp_path):
+    a, b, sync_a, _ = machines(server, tmp_path, "json", "json")
+    a.add_task("t")
+    sync_a.sync()
+    replayed = SyncStore(tmp_path / "server.jsonl")
+    assert len(replayed) == 1
+    replayed.close()
+    a.close()
+    b.close()
+
+
+def post(url, body, headers):
+    host, port = url.rsplit("/", 1)[1].split(":")
+    connection = http.client.HTTPConnection(host, int(port), timeout=5)
+    connection.putrequest("POST", "/sync")
+    for name, value in headers.items():
+        connection.putheader(name, value)
+    connection.endheaders(body)
+    status = connection.getresponse().status
+    connection.close()
+    return status
+
+
+def test_bad_and_oversized_bodies_are_refused(server, monkeypatch):
+    monkeypatch.setattr(sync_server, "MAX_BODY", 1000)
+    assert post(server, b"", {"Content-Length": "-5"}) == 400
+    assert post(server, b"", {"Content-Length": "x"}) == 400
+    assert post(server, b"", {"Content-Length": "1001"}) == 413
+    request = {"protocol": PROTOCOL, "client": "c", "cursor": 0, "changes": [], "padding": " " * 5000}
+    bomb = gzip.compress(json.dumps(request).encode())
+    assert len(bomb) < 1000
+    assert post(server, bomb, {"Content-Length": str(len(bomb)), "Content-Encoding": "gzip"}) == 413
+    request["padding"] = ""
+    body = gzip.compress(json.dumps(request).encode())
+    assert post(server, body, {"Content-Length": str(len(body)), "Content-Encoding": "gzip"}) == 200
+
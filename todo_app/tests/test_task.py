@@ -0,0 +1,45 @@
+from src.models.task import Priority, Status, Task, to_tags
+from src.utils.projects import normalize_tags
+
+
+def test_task_round_trips_through_dict():
+    task = Task(id="1", title="a", description="b", priority=Priority.HIGH, created_at=10,
+                project="Casa/Cozinha", tags=("x", "y"), due_at=10, remind_at=5)
+    assert Task.from_dict(task.to_dict()) == task
+    assert Task.from_dict({**task.to_dict(), "tags": ["x", "x"]}).tags == ("x",)
+
+
+def test_completing_and_reopening():
+    task = Task(id="1", title="a")
+    task.mark_completed()
+    assert task.is_completed and task.status == Status.COMPLETED and task.completed_at
+    task.mark_pending()
+    assert not task.is_completed and task.completed_at is None
+
+
+def test_old_dicts_are_converted():
+    task = Task.from_dict({"id": "1", "title": "a", "priority": "3", "status": "Completed",
+                           "created_at": "2024-01-01T00:00:00", "completed_at": "2024-01-02T00:00:00"})
+    assert task.priority == Priority.HIGH and task.status == Status.COMPLETED
+    assert task.completed_at - task.created_at == 24 * 3600
+
+
+def test_to_tags_splits_strings_on_commas_only():
+    assert to_tags("a,b") == ("a", "b")
+    assert to_tags('["a"]') == ('["a"]',)
+    assert to_tags("[wip]") == ("[wip]",)
+
+
+def test_to_tags_keeps_lists_as_they_are():
+    assert to_tags(["x,y", "[wip]"]) == ("x,y", "[wip]")
+    assert to_tags(None) == () and to_tags("") == () and to_tags([]) == ()
+
+
+def test_to_tags_drops_repeated_names():
+    assert to_tags("a,b,a") == ("a", "b")
+    assert to_tags(["b", "a", "b"]) == ("b", "a")
+
+
+def test_normalize_tags():
+    assert normalize_tags("Casa, #urgente casa") == ("casa", "urgente")
+    assert normalize_tags(["Casa,#urgente", "x y"]) == ("casa", "urgente", "x y")
@@ -0,0 +1,67 @@
+from src.utils.wal import WriteAheadLog
+
+
+def records(n, start=0):
+    return [{"op": "put", "id": str(i)} for i in range(start, start + n)]
+
+
+def append(wal, items):
+    for record in items:
+        wal.append(record)
+
+
+def test_replays_appended_records(tmp_path):
+    wal = WriteAheadLog(tmp_path / "log", fsync=False)
+    append(wal, records(3))
+    wal.append({"op": "delete", "id": "1"})
+    wal.close()
+    replayed = WriteAheadLog(tmp_path / "log")
+    assert list(replayed.replay()) == records(3) + [{"op": "delete", "id": "1"}]
+    assert replayed.record_count == 4
+
+
+def test_torn_tail_is_truncated_and_appends_continue(tmp_path):
+    path = tmp_path / "log"
+    wal = WriteAheadLog(path, fsync=False)
+    append(wal, records(2))
+    wal.close()
+    size = path.stat().st_size
+    with open(path, "ab") as f:
+        f.write(b'0000abcd {"op":"pu')  # Crashed mid-write: no newline
+    wal = WriteAheadLog(path, fsync=False)
+    assert list(wal.replay()) == records(2)
+    assert path.stat().st_size == size
+    append(wal, records(1, start=2))
+    wal.close()
+    assert list(WriteAheadLog(path).replay()) == records(3)
+
+
+def test_bad_checksum_drops_the_record_and_everything_after(tmp_path):
+    path = tmp_path / "log"
+    wal = WriteAheadLog(path, fsync=False)
+    append(wal, records(3))
+    wal.close()
+    lines = path.read_bytes().splitlines(keepends=True)
+    lines[1] = lines[1].replace(b'"1"', b'"9"')
+    path.write_bytes(b"".join(lines))
+    assert list(WriteAheadLog(path).replay()) == records(1)
+
+
+def test_rotated_segments_replay_first(tmp_path):
+    wal = WriteAheadLog(tmp_path / "log", fsync=False)
+    append(wal, records(2))
+    segment = wal.rotate()
+    append(wal, records(1, start=2))
+    assert list(wal.replay()) == records(3)
+    wal.discard_segments(segment)
+    assert list(wal.replay()) == records(1, start=2)
+    wal.close()
+
+
+def test_read_from_only_returns_new_records(tmp_path):
+    wal = WriteAheadLog(tmp_path / "log", fsync=False)
+    wal.append_many(records(2))
+    offset = wal.size()
+    wal.append_many(records(2, start=2))
+    assert list(wal.read_from(offset)) == records(2, start=2)
+    wal.close()
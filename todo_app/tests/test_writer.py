@@ -0,0 +1,46 @@
+import time
+from src.utils.writer import BackgroundWriter
+from tests.conftest import open_store
+
+
+def test_burst_is_written_once():
+    writes = []
+    writer = BackgroundWriter(lambda: writes.append(time.monotonic()), delay=0.05)
+    for _ in range(20):
+        writer.schedule()
+    time.sleep(0.2)
+    assert len(writes) == 1
+    writer.close()
+
+
+def test_endless_burst_is_written_by_max_delay():
+    writes = []
+    writer = BackgroundWriter(lambda: writes.append(time.monotonic()), delay=0.1, max_delay=0.2)
+    start = time.monotonic()
+    while time.monotonic() - start < 0.7:
+        writer.schedule()
+        time.sleep(0.01)
+    assert writes and writes[0] - start < 0.45
+    writer.close()
+
+
+def test_flush_writes_right_away_and_errors_are_reported():
+    errors = []
+
+    def fail():
+        raise OSError("disk full")
+    writer = BackgroundWriter(fail, delay=10, on_error=errors.append)
+    writer.schedule()
+    writer.flush(timeout=1)
+    assert [str(e) for e in errors] == ["disk full"]
+    writer.close()
+
+
+def test_store_changes_are_written_in_the_background(kind, tmp_path):
+    db = open_store(kind, tmp_path, **({} if kind == "sqlite" else {"write_delay": 10}))
+    task = db.add_task("a")
+    assert db.flush(timeout=5)
+    other = open_store(kind, tmp_path)
+    assert other.get_task(task.id).title == "a"
+    other.close()
+    db.close()